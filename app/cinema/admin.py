@@ -1,8 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin 
 from django.utils.html import format_html
-from django.db.models import Count, Avg
+from django.db.models import Count
 from .models import User, Author, Spectator, Film, FilmRating, AuthorRating
+from .services import search
 
 
 ############################# user ########################
@@ -102,20 +103,22 @@ class FilmAdmin(admin.ModelAdmin):
     inlines = [FilmRatingInline]
     
 
-    def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        return queryset.annotate(
-            avg_rating=Avg('ratings__note'),
-            ratings_count=Count('ratings', distinct=True)
-        ).prefetch_related('authors__user', 'ratings__spectator__user')
-    
+    def get_search_results(self, request, queryset, search_term):
+        # served by the full-text index instead of icontains scans over joined tables
+        if not search_term:
+            return queryset, False
+        return search.filter_films(queryset, search_term), False
+
+    # rating columns are stored on Film, nothing to aggregate per changelist load
     def average_rating(self, obj):
-        if hasattr(obj, 'avg_rating') and obj.avg_rating:
-            return f"{obj.avg_rating:.1f}/5"
+        if obj.rating_avg:
+            return f"{obj.rating_avg:.1f}/5"
         return "No rating"
+    average_rating.admin_order_field = 'rating_avg'
 
     def ratings_count(self, obj):
-        return obj.ratings_count if hasattr(obj, 'ratings_count') else 0
+        return obj.rating_count
+    ratings_count.admin_order_field = 'rating_count'
 
 ##########################################################
 
@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from cinema.models import Spectator, User
+
+CLAIMS = ("role", "spectator_id", "is_staff")
+USER_CACHE_KEY = "jwt_user:{user_id}"
+
+
+def add_user_claims(token, user):
+    """
+    The claims ClaimsUser is built from, set when the tokens are issued and again on every refresh.
+    """
+    token["role"] = user.role
+    token["is_staff"] = user.is_staff
+    token["spectator_id"] = user.pk if hasattr(user, "spectator") else None
+    return token
+
+
+def user_cache_key(user_id) -> str:
+    return USER_CACHE_KEY.format(user_id=user_id)
+
+
+class ClaimsUser(TokenUser):
+    """
+    The requesting user as described by its access token, without any query: id, role, staff flag,
+    and `spectator` as an unsaved-looking Spectator carrying only its primary key (enough for its
+    relations, e.g. `request.user.spectator.favorite_films.all()`).
+    """
+
+    @cached_property
+    def role(self) -> str:
+        return self.token["role"]
+
+    @cached_property
+    def spectator_id(self):
+        return self.token["spectator_id"]
+
+    @cached_property
+    def spectator(self) -> Spectator:
+        if self.spectator_id is None:
+            # as the model's descriptor: a Spectator.DoesNotExist that hasattr() also understands
+            raise User.spectator.RelatedObjectDoesNotExist("User has no spectator.")
+        return Spectator(user_id=self.spectator_id)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the user query on reads: GET, HEAD and OPTIONS requests get a ClaimsUser
+    built from the token. Other methods, and tokens issued before the claims existed, load the full
+    user (with its spectator) as JWTAuthentication does, cached JWT_USER_CACHE_TTL seconds.
+
+    Claims can be one access token lifetime old: /refresh/ reissues them from the user
+    (CustomTokenRefreshSerializer), so a role change or a deactivation reaches reads then.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS and self.has_claims(validated_token):
+            return ClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def has_claims(self, validated_token) -> bool:
+        return all(claim in validated_token for claim in CLAIMS)
+
+    def user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def get_user(self, validated_token):
+        user_id = self.user_id(validated_token)
+        ttl = settings.JWT_USER_CACHE_TTL
+        user = cache.get(user_cache_key(user_id)) if ttl else None
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related("spectator").get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            if ttl:
+                cache.set(user_cache_key(user_id), user, ttl)
+        return self.check_user(user, validated_token)
+
+    def check_user(self, user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+
+class AsyncJWTAuthentication(StatelessJWTAuthentication):
+    """
+    StatelessJWTAuthentication for plain async views (GET only): a ClaimsUser, or the user loaded
+    through the async ORM for tokens without the claims.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if self.has_claims(validated_token):
+            return ClaimsUser(validated_token), validated_token
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.user_id(validated_token)
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        return self.check_user(user, validated_token)
@@ -0,0 +1,193 @@
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+STATS_KEY = "response_cache:{outcome}:{view}"
+CACHED_VIEWS = set()
+
+
+def generation_key(model) -> str:
+    return f"generation:{model._meta.label_lower}"
+
+
+def _increment(key: str):
+    # a missing counter starts from the clock, so an evicted one never goes back to a value already used
+    cache.add(key, time.time_ns(), timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_generation(*models):
+    for model in models:
+        _increment(generation_key(model))
+
+
+def invalidate(*models):
+    """
+    Make every cached response built from `models` unreachable. Bumped right away for reads inside
+    the current transaction, and again on commit for responses cached meanwhile from the old rows.
+    """
+    bump_generation(*models)
+    transaction.on_commit(partial(bump_generation, *models))
+
+
+def generations(models) -> list[int]:
+    keys = [generation_key(model) for model in models]
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, time.time_ns(), timeout=None)
+            values[key] = cache.get(key)
+    return [values[key] for key in keys]
+
+
+def response_cache_key(view: str, models, url: str) -> str:
+    versions = ".".join(str(generation) for generation in generations(models))
+    return f"response:{view}:{versions}:{hashlib.md5(url.encode()).hexdigest()}"
+
+
+def record(view: str, outcome: str):
+    key = STATS_KEY.format(outcome=outcome, view=view)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def cache_stats() -> dict:
+    """
+    Hit and miss counters of the cached views, since the cache was last cleared.
+    """
+    views = sorted(CACHED_VIEWS)
+    keys = [STATS_KEY.format(outcome=outcome, view=view) for view in views for outcome in ("hits", "misses")]
+    counters = cache.get_many(keys)
+    stats = {}
+    for view in views:
+        hits = counters.get(STATS_KEY.format(outcome="hits", view=view), 0)
+        misses = counters.get(STATS_KEY.format(outcome="misses", view=view), 0)
+        stats[view] = {"hits": hits, "misses": misses, "hit_ratio": hits / (hits + misses) if hits + misses else None}
+    hits = sum(view["hits"] for view in stats.values())
+    misses = sum(view["misses"] for view in stats.values())
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / (hits + misses) if hits + misses else None,
+        "views": stats,
+    }
+
+
+class CachedResponseMixin:
+    """
+    Serve GET responses from the Django cache, after authentication and permission checks.
+
+    Keys embed the generation counters of `cache_models`: any write to one of those models
+    (see cinema.signals) moves every key forward at once, the old entries simply expire.
+    Responses carry an `X-Cache: HIT|MISS` header. Views returning per-user data override
+    `is_personalized` and are never cached.
+    """
+
+    cache_models = ()
+    cache_timeout = None
+
+    def is_personalized(self) -> bool:
+        return False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        CACHED_VIEWS.add(cls.__name__)
+
+    def get(self, request, *args, **kwargs):
+        if self.is_personalized():
+            return super().get(request, *args, **kwargs)
+        view = type(self).__name__
+        key = response_cache_key(view, self.cache_models, request.build_absolute_uri())
+        data = cache.get(key)
+        if data is not None:
+            record(view, "hits")
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        record(view, "misses")
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = self.cache_timeout if self.cache_timeout is not None else settings.RESPONSE_CACHE_TIMEOUT
+            cache.set(key, response.data, timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETag on GET, computed before anything is loaded: a matching If-None-Match (or
+    If-Modified-Since on single objects) is answered 304 without fetching or serializing the rows.
+
+    List ETags hash the URL and the cache generations of `cache_models`, which every write moves
+    forward (see CachedResponseMixin), so they cost no query whatever the size of the table.
+    Single objects (and lists without `cache_models`) get their ETag from one aggregate query over
+    their rows (count and latest of `last_modified_fields`), single objects a Last-Modified too. Personalized responses (`is_personalized`)
+    get no validators.
+    """
+
+    cache_models = ()
+    last_modified_fields = ("updated_at",)
+
+    def is_personalized(self) -> bool:
+        return False
+
+    def is_single_object(self) -> bool:
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def get_validator_queryset(self):
+        queryset = self.get_queryset()
+        if self.is_single_object():
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[self.lookup_url_kwarg or self.lookup_field]})
+        return queryset
+
+    def get_validators(self):
+        joins = any("__" in field for field in self.last_modified_fields)
+        values = self.get_validator_queryset().order_by().aggregate(
+            count=Count("pk", distinct=joins),
+            **{f"modified_{i}": Max(field) for i, field in enumerate(self.last_modified_fields)},
+        )
+        count = values.pop("count")
+        modified = [value for value in values.values() if value is not None]
+        return count, max(modified) if modified else None
+
+    def get(self, request, *args, **kwargs):
+        if self.is_personalized():
+            return super().get(request, *args, **kwargs)
+        format = request.accepted_renderer.format if getattr(request, "accepted_renderer", None) else ""
+        if self.is_single_object() or not self.cache_models:
+            count, last_modified = self.get_validators()
+            if not count:
+                return super().get(request, *args, **kwargs)
+            version = f"{count}|{last_modified.isoformat() if last_modified else ''}"
+            timestamp = int(last_modified.timestamp()) if last_modified and self.is_single_object() else None
+        else:
+            # a deletion moves the generations too, but not any Last-Modified: lists get none
+            version = ".".join(str(generation) for generation in generations(self.cache_models))
+            timestamp = None
+        version = f"{request.build_absolute_uri()}|{format}|{version}"
+        etag = f'"{hashlib.sha1(version.encode()).hexdigest()}"'
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
@@ -1,89 +1,79 @@
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 
-from cinema.models import Film, Author, User
-from cinema.services.tmdb import TmdbAPI 
+from cinema.services.checkpoint import ImportJournal
+from cinema.services import box_office
+from cinema.services.importer import FilmImporter
+from cinema.services.tmdb import TmdbAPI
+from cinema.services.tmdb_cache import TmdbCache
+from cinema.services.tmdb_fetcher import FilmBundleFetcher
 
 
 class Command(BaseCommand):
-    help = 'add a movie and it director to the DB (from imdb id)'
+    help = 'add movies and their director to the DB (from tmdb ids)'
 
     def add_arguments(self, parser):
-        parser.add_argument('tmdb_id', type=int, help='The TMDB id of the movie to be added')
+        parser.add_argument('tmdb_ids', type=int, nargs='*', help='The TMDB ids of the movies to be added')
+        parser.add_argument('--batch-size', type=int, default=100, help='Number of films committed per transaction')
+        parser.add_argument('--resume', action='store_true', help='Continue the last interrupted run from its checkpoint')
+        parser.add_argument('--cache-only', action='store_true', help='Replay TMDB responses from the local cache, without network')
+        parser.add_argument('--no-cache', action='store_true', help='Do not read or write the local TMDB cache')
 
-    @transaction.atomic
     def handle(self, *args, **options):
-        tmdb_id = options['tmdb_id']
-        
-        if not settings.TMDB_API_KEY:
+        if not settings.TMDB_API_KEY and not options["cache_only"]:
             self.stderr.write(self.style.ERROR("tmdb api not found"))
             return
 
-        api = TmdbAPI(api_key=settings.TMDB_API_KEY)
+        journal = ImportJournal.for_command("add_movie")
+        if options["resume"]:
+            state = journal.resume()
+            if state is None:
+                raise CommandError("No interrupted add_movie run to resume")
+            tmdb_ids = state["params"]["tmdb_ids"]
+            done = journal.position or 0
+            self.stdout.write(f"Resuming after {done} of {len(tmdb_ids)} movies")
+        elif options["tmdb_ids"]:
+            tmdb_ids, done = options["tmdb_ids"], 0
+            journal.start({"tmdb_ids": tmdb_ids})
+        else:
+            raise CommandError("Give at least one TMDB id, or --resume")
 
-        try:
-            self.stdout.write(f"Getting details for movie with TMDB ID: {tmdb_id}...")
-            film_data = api.get_film_details(film_id=str(tmdb_id))
-            credits_data = api.get_movie_credits(film_id=str(tmdb_id))
-            director_info = next((member for member in credits_data.get('crew', []) if member.get('job') == 'Director'), None)
-
-            if not director_info:
-                return
-
-            director_tmdb_id = director_info.get('id')
-            if not director_tmdb_id:
-                return
-                
-            director_details = api.get_people_detail(person_id=str(director_tmdb_id))
-            user, user_created = User.objects.get_or_create(
-                username=f"author_{director_tmdb_id}",
-                defaults={
-                    'first_name': director_details.get('name', '').split(' ')[0],
-                    'last_name': director_details.get('name', '').split(' ')[1],
-                    'email': f"author_{director_tmdb_id}@example.com", #Random email for the moment because authors is abstractUser that need an email
-                    'role': 'AUTHOR',
-                }
-            )
+        cache = None if options["no_cache"] else TmdbCache.from_settings(offline=options["cache_only"])
+        api = TmdbAPI(api_key=settings.TMDB_API_KEY, cache=cache)
+        fetcher = FilmBundleFetcher(api, workers=1)
+        self.position = done
 
-            if user_created:
-                self.stdout.write(self.style.SUCCESS(f"Created new User for author: {user}"))
-            author, author_created = Author.objects.update_or_create(
-                tmdb_id=director_tmdb_id,
-                defaults={
-                    'user': user,
-                    'popularity': director_details.get('popularity', 0.0),
-                    'website': director_details.get('homepage'),
-                    'death_date': director_details.get('deathday'), 
-                    'gender': director_details.get('gender', 0),
-                    'department': director_details.get('known_for_department'),
-                }
-            )
-            
-            if author_created:
-                self.stdout.write(self.style.SUCCESS(f"Successfully created new author: {author}"))
-            else:
-                self.stdout.write(f"Successfully updated existing author: {author}")
+        def importable():
+            for position, tmdb_id in enumerate(tmdb_ids[done:], start=done + 1):
+                self.position = position
+                self.stdout.write(f"Getting details for movie with TMDB ID: {tmdb_id}...")
+                bundle = fetcher.fetch_bundle(tmdb_id)
+                if bundle.error is not None:
+                    journal.fail(tmdb_id, bundle.error)
+                    self.stderr.write(self.style.ERROR(f"An error occurred: {bundle.error}"))
+                elif bundle.director is None:
+                    self.stdout.write(self.style.WARNING("No director (author)"))
+                else:
+                    self.stdout.write(f"Associating director '{bundle.director.get('name')}' with film '{bundle.details.get('title')}'")
+                    yield bundle.details, bundle.director
 
-            film, film_created = Film.objects.update_or_create(
-                tmdb_id=tmdb_id,
-                defaults={
-                    'title': film_data.get('title'),
-                    'description': film_data.get('overview', ''),
-                    'release_date': film_data.get('release_date'),
-                    'budget': film_data.get('budget'),
-                    'revenue': film_data.get('revenue'),
-                }
-            )
+        def on_batch(batch, total):
+            journal.checkpoint(self.position, committed=batch.films_created + batch.films_updated)
 
-            if film_created:
-                self.stdout.write(self.style.SUCCESS(f"Successfully added new film: '{film.title}'"))
-            else:
-                self.stdout.write(f"Successfully updated existing film: '{film.title}'")
-            film.authors.add(author)
-            self.stdout.write(f"Successfully associated director '{author}' with film '{film.title}'")
+        def on_failure(item, error):
+            journal.fail(item[0].get("id"), error)
+            self.stderr.write(self.style.ERROR(f"Rejected movie ID {item[0].get('id')}: {error}"))
 
-            self.stdout.write(self.style.SUCCESS("\nCommand completed successfully!"))
+        try:
+            stats = FilmImporter(batch_size=options["batch_size"]).import_films(importable(), on_batch=on_batch, on_failure=on_failure)
+            journal.finish()
+            self.stdout.write(self.style.SUCCESS(f"\nCommand completed successfully! ({stats})"))
+            self.stdout.write(f"Refreshed {box_office.refresh_stale()} box office groups")
 
         except Exception as e:
-            self.stderr.write(self.style.ERROR(f"An error occurred: {e}"))
\ No newline at end of file
+            self.stderr.write(self.style.ERROR(f"An error occurred: {e}"))
+            self.stderr.write(f"Committed batches are kept, run again with --resume to continue after movie {journal.position}")
+
+        if cache is not None:
+            self.stdout.write(cache.summary())
+            cache.close()
@@ -0,0 +1,113 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from cinema.models import Author, Film
+
+ENDPOINTS = {
+    "films": ("/api/films/", "/api/async/films/"),
+    "authors": ("/api/authors/", "/api/async/authors/"),
+}
+
+
+def wsgi_get(handler, path, query):
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query, "SCRIPT_NAME": "",
+        "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1", "HTTP_HOST": "localhost",
+        "wsgi.input": BytesIO(), "wsgi.url_scheme": "http", "wsgi.errors": BytesIO(),
+    }
+    statuses = []
+    response = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        b"".join(response)
+    finally:
+        response.close()
+        connections.close_all()
+    return int(statuses[0].split()[0])
+
+
+async def asgi_get(handler, path, query):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "root_path": "", "query_string": query.encode(), "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80), "client": ("127.0.0.1", 0),
+    }
+    messages = iter([{"type": "http.request", "body": b"", "more_body": False}])
+    statuses = []
+
+    async def receive():
+        return next(messages, {"type": "http.disconnect"})
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await handler(scope, receive, send)
+    return statuses[0]
+
+
+class Command(BaseCommand):
+    help = 'compare throughput and latency of the read endpoints under WSGI, ASGI and their async versions (in process)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and stack')
+        parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight at once')
+
+    def handle(self, *args, **options):
+        if not Film.objects.exists() or not Author.objects.exists():
+            raise CommandError("No films or authors to read, run populate_db first")
+        requests, concurrency = options["requests"], options["concurrency"]
+        self.stdout.write(f"{requests} requests per run, {concurrency} concurrent")
+        self.stdout.write(f"{'':>24} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, (sync_path, async_path) in ENDPOINTS.items():
+            runs = {
+                "WSGI": self.run_wsgi(sync_path, requests, concurrency),
+                "ASGI, sync view": asyncio.run(self.run_asgi(sync_path, requests, concurrency)),
+                "ASGI, async view": asyncio.run(self.run_asgi(async_path, requests, concurrency)),
+            }
+            for stack, (elapsed, latencies) in runs.items():
+                latencies.sort()
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                self.stdout.write(
+                    f"{name + ' ' + stack:>24} {len(latencies) / elapsed:8.0f} "
+                    f"{statistics.median(latencies) * 1000:8.1f} {p99 * 1000:8.1f}"
+                )
+
+    def run_wsgi(self, path, requests, concurrency):
+        handler = WSGIHandler()
+
+        def timed(i):
+            # a distinct query string per request, so the sync views' response cache never answers
+            started = time.perf_counter()
+            self.expect_ok(wsgi_get(handler, path, f"_={i}"), path)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = list(pool.map(timed, range(requests)))
+        return time.perf_counter() - started, latencies
+
+    async def run_asgi(self, path, requests, concurrency):
+        handler = ASGIHandler()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def timed(i):
+            async with slots:
+                started = time.perf_counter()
+                self.expect_ok(await asgi_get(handler, path, f"_={i}"), path)
+                return time.perf_counter() - started
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(timed(i) for i in range(requests)))
+        return time.perf_counter() - started, list(latencies)
+
+    def expect_ok(self, status, path):
+        if status != 200:
+            raise CommandError(f"GET {path} answered {status}")
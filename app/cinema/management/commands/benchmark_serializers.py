@@ -0,0 +1,82 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from cinema.models import Film
+from cinema.serializers.film_serializer import FilmSerializer
+from cinema.serializers.values_serializer import ValuesSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'compare FilmSerializer with the .values() fast list path on generated films (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Number of films to render')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per path, the best one is reported')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.benchmark(options["rows"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def benchmark(self, rows, repeat):
+        Film.objects.bulk_create(
+            Film(
+                title=f"Film {i}",
+                description="A generated film " * 10,
+                release_date=datetime.date(1950 + i % 70, 1 + i % 12, 1 + i % 28),
+                tmdb_id=10_000_000 + i,
+                budget=i * 1000 if i % 3 else None,
+                revenue=i * 5000,
+                rating_count=i % 50,
+                rating_sum=(i % 50) * 3,
+                rating_avg=3.0 if i % 50 else None,
+            )
+            for i in range(rows)
+        )
+        queryset = Film.objects.order_by("-created_at", "-id")
+        fast = ValuesSerializer(FilmSerializer)
+        renderer = JSONRenderer()
+
+        paths = {
+            "FilmSerializer": (lambda: list(queryset.all()), lambda films: FilmSerializer(films, many=True).data),
+            "values() fast path": (lambda: list(fast.values(queryset)), fast.serialize),
+        }
+        outputs = {name: renderer.render(serialize(fetch())) for name, (fetch, serialize) in paths.items()}
+        if len(set(outputs.values())) != 1:
+            self.stderr.write(self.style.ERROR("Outputs differ"))
+            return
+
+        self.stdout.write(f"{rows} rows, best of {repeat} runs (ms)")
+        self.stdout.write(f"{'':>20} {'query':>8} {'serialize':>10} {'render':>8} {'total':>8}")
+        timings = {}
+        for name, (fetch, serialize) in paths.items():
+            best = [float("inf")] * 3
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fetched = fetch()
+                queried = time.perf_counter()
+                data = serialize(fetched)
+                serialized = time.perf_counter()
+                renderer.render(data)
+                rendered = time.perf_counter()
+                for i, elapsed in enumerate((queried - started, serialized - queried, rendered - serialized)):
+                    best[i] = min(best[i], elapsed)
+            timings[name] = best
+            self.stdout.write(f"{name:>20} {best[0] * 1000:8.1f} {best[1] * 1000:10.1f} {best[2] * 1000:8.1f} {sum(best) * 1000:8.1f}")
+
+        slow, quick = timings["FilmSerializer"], timings["values() fast path"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Identical output. Serialization {slow[1] / quick[1]:.1f}x faster, "
+            f"whole response {sum(slow) / sum(quick):.1f}x faster"
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from cinema.models import SimilarityKind
+
+
+class Command(BaseCommand):
+    help = (
+        'precompute the most similar films of every film, from ratings (item-item cosine similarity) '
+        'or from titles and descriptions (TF-IDF, incremental)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--by', choices=SimilarityKind.values, default=SimilarityKind.RATINGS, help='Similarity source')
+        parser.add_argument('--top-k', type=int, default=20, help='Neighbours stored per film')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Films compared at a time, bounds memory')
+        parser.add_argument('--full', action='store_true', help='content: recompute every film, not only the changed ones')
+
+    def handle(self, *args, **options):
+        try:
+            from cinema.services.content_similarity import compute_content_similarities
+            from cinema.services.similarity import compute_similar_films
+        except ImportError as e:
+            raise CommandError(f"{e.name} is required to compute similarities: install the recommender extra (uv sync --extra recommender)")
+
+        sizing = {"top_k": options["top_k"]}
+        if options["chunk_size"]:
+            sizing["chunk_size"] = options["chunk_size"]
+        if options["by"] == SimilarityKind.CONTENT:
+            run = compute_content_similarities(full=options["full"], **sizing)
+            source = "titles and descriptions"
+        else:
+            run = compute_similar_films(**sizing)
+            source = f"{run.ratings} ratings"
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {run.rows} neighbours for {run.films} films from {source} "
+            f"in {run.duration:.1f}s, peak memory {run.peak_memory / 2**20:.0f} MiB"
+        ))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cinema.services.export import WRITERS, export_catalog
+
+
+class Command(BaseCommand):
+    help = 'export every film with its authors as JSON, NDJSON or CSV, streamed with constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(WRITERS), default='ndjson', help='Output format')
+        parser.add_argument('--output', '-o', help='File to write (default: standard output)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Films read from the database cursor at a time')
+
+    def handle(self, *args, **options):
+        chunks = export_catalog(options["format"], options["chunk_size"])
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
+            return
+
+        started = time.monotonic()
+        written = 0
+        try:
+            with open(options["output"], "wb") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+                    written += len(chunk)
+        except OSError as e:
+            raise CommandError(f"Cannot write {options['output']}: {e}")
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written / 1e6:.1f} MB to {options['output']} in {elapsed:.1f}s"))
@@ -0,0 +1,89 @@
+import os
+import time
+from itertools import chain
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cinema.services.checkpoint import ImportJournal
+from cinema.services.dump_reader import director_of, iter_records, open_dump, record_kind
+from cinema.services.batching import chunked
+from cinema.services import box_office
+from cinema.services.importer import FilmImporter
+
+
+class Command(BaseCommand):
+    help = 'import films or people from TMDB daily export files (newline-delimited JSON, optionally gzipped)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Dump files, e.g. movie_ids_05_15_2025.json.gz')
+        parser.add_argument('--kind', choices=['auto', 'movie', 'person'], default='auto', help='Record kind (auto: guessed from the first record)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of records written per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Parse and count the records without writing anything')
+        parser.add_argument('--resume', action='store_true', help='Skip the records already committed by an interrupted run of the same file')
+
+    def handle(self, *args, **options):
+        importer = FilmImporter(batch_size=options["batch_size"])
+        for path in options["paths"]:
+            try:
+                self.import_file(path, importer, options)
+            except OSError as e:
+                raise CommandError(f"Cannot read {path}: {e}")
+
+    def import_file(self, path, importer, options):
+        errors = []
+        started = time.monotonic()
+        self.read = 0
+        self.skip = 0
+        journal = ImportJournal.for_command("import_dump", key=os.path.abspath(path))
+        if options["resume"] and journal.resume() is not None:
+            self.skip = journal.position or 0
+            self.stdout.write(f"{path}: resuming after {self.skip} committed records")
+        elif not options["dry_run"]:
+            journal.start({"path": os.path.abspath(path)})
+
+        with open_dump(path) as lines:
+            records = iter_records(lines, errors)
+            first = next(records, None)
+            if first is None:
+                self.stdout.write(self.style.WARNING(f"{path}: no records"))
+                return
+
+            kind = options["kind"] if options["kind"] != "auto" else record_kind(first)
+            if kind not in ("movie", "person"):
+                raise CommandError(f"{path}: cannot guess the record kind, use --kind")
+            records = self.counted(record for record in chain([first], records) if record_kind(record) == kind)
+
+            def progress(batch, total):
+                committed = batch.films_created + batch.films_updated if kind == "movie" else batch.authors_created + batch.authors_updated
+                journal.checkpoint(self.read, committed=committed)
+                rate = self.read / max(time.monotonic() - started, 1e-6)
+                self.stdout.write(f"{path}: {self.read} {kind} records, {total} ({rate:.0f} records/s)")
+
+            def rejected(item, error):
+                record = item[0] if kind == "movie" else item
+                journal.fail(record.get("id"), error)
+                self.stderr.write(self.style.WARNING(f"{path}: rejected {kind} {record.get('id')}: {error}"))
+
+            if options["dry_run"]:
+                for batch_number, _ in enumerate(chunked(records, options["batch_size"]), start=1):
+                    rate = self.read / max(time.monotonic() - started, 1e-6)
+                    self.stdout.write(f"{path}: {self.read} {kind} records read, {batch_number} batches ({rate:.0f} records/s)")
+                stats = "dry run, nothing written"
+            elif kind == "movie":
+                stats = importer.import_films(((record, director_of(record)) for record in records), on_batch=progress, on_failure=rejected)
+                self.stdout.write(f"{path}: refreshed {box_office.refresh_stale()} box office groups")
+            else:
+                stats = importer.import_people(records, on_batch=progress, on_failure=rejected)
+            if not options["dry_run"]:
+                journal.finish()
+
+        if errors:
+            self.stderr.write(self.style.WARNING(f"{path}: skipped {len(errors)} malformed lines (first at line {errors[0][0]})"))
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"{path}: {self.read} {kind} records in {elapsed:.1f}s ({stats})"))
+
+    def counted(self, records):
+        for record in records:
+            self.read += 1
+            if self.read > self.skip:
+                yield record
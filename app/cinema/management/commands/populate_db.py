@@ -1,105 +1,115 @@
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from collections import deque
+
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 
-from cinema.models import Film, Author, User
+from cinema.services.checkpoint import ImportJournal
+from cinema.services import box_office
+from cinema.services.importer import FilmImporter
 from cinema.services.tmdb import TmdbAPI
+from cinema.services.tmdb_cache import TmdbCache
+from cinema.services.tmdb_fetcher import FilmBundleFetcher
 
 
 class Command(BaseCommand):
-    help = 'add all popular movies of tmdb (first page) and it directors to the db'
+    help = 'add popular movies of tmdb (first page by default) and it directors to the db'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=1, help='Number of TMDB popular pages to import (20 films per page)')
+        parser.add_argument('--start-page', type=int, default=1, help='First TMDB popular page to import')
+        parser.add_argument('--workers', type=int, default=8, help='Number of parallel TMDB fetch workers')
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of films written per bulk upsert (and per transaction)')
+        parser.add_argument('--resume', action='store_true', help='Continue the last interrupted run from its checkpoint')
+        parser.add_argument('--cache-only', action='store_true', help='Replay TMDB responses from the local cache, without network')
+        parser.add_argument('--no-cache', action='store_true', help='Do not read or write the local TMDB cache')
+
+    def iter_popular_ids(self, api, start_page, end_page, after=None):
+        """
+        Yield (page, index in page, tmdb id), skipping everything up to the `after` checkpoint.
+        """
+        seen = set()
+        for page in range(start_page, end_page):
+            self.stdout.write(f"Getting popular movies data from tmdb (page {page})")
+            results = api.get_popular_films(page=page).get("results", [])
+            if not results:
+                self.stdout.write(self.style.WARNING(f"No popular movies found on TMDB page {page}"))
+                break
+            for index, film_data in enumerate(results):
+                if after is not None and [page, index] <= after:
+                    continue
+                tmdb_id = film_data.get("id")
+                if tmdb_id and tmdb_id not in seen:
+                    seen.add(tmdb_id)
+                    yield page, index, tmdb_id
+
+    def iter_importable(self, bundles, positions):
+        for bundle in bundles:
+            # Bundles come back in submission order, so they line up with their positions.
+            self.position = positions.popleft()
+            if bundle.error is not None:
+                self.failed += 1
+                self.journal.fail(bundle.tmdb_id, bundle.error)
+                self.stderr.write(self.style.ERROR(f"Failed to process movie ID {bundle.tmdb_id}: {bundle.error}"))
+                continue
+
+            self.stdout.write(f"FILm :  '{bundle.details.get('title')}' (TMDB ID: {bundle.tmdb_id})...")
+            if bundle.director is None:
+                self.stdout.write(self.style.WARNING("No director (author)"))
+                continue
+            yield bundle.details, bundle.director
 
-    @transaction.atomic
     def handle(self, *args, **options):
-        if not settings.TMDB_API_KEY:
+        if not settings.TMDB_API_KEY and not options["cache_only"]:
             self.stderr.write(self.style.ERROR("api key not found"))
             return
 
-        api = TmdbAPI(api_key=settings.TMDB_API_KEY)
+        self.journal = ImportJournal.for_command("populate_db")
+        if options["resume"]:
+            state = self.journal.resume()
+            if state is None:
+                raise CommandError("No interrupted populate_db run to resume")
+            start_page, end_page = state["params"]["start_page"], state["params"]["end_page"]
+            self.stdout.write(f"Resuming after page/index {self.journal.position} ({state['committed']} films already committed)")
+        else:
+            start_page = options["start_page"]
+            end_page = start_page + options["pages"]
+            self.journal.start({"start_page": start_page, "end_page": end_page})
+
+        cache = None if options["no_cache"] else TmdbCache.from_settings(offline=options["cache_only"])
+        api = TmdbAPI(api_key=settings.TMDB_API_KEY, cache=cache)
+        fetcher = FilmBundleFetcher(api, workers=options["workers"])
+        importer = FilmImporter(batch_size=options["batch_size"])
+        self.failed = 0
+        self.position = self.journal.position
+        positions = deque()
+
+        def tmdb_ids():
+            for page, index, tmdb_id in self.iter_popular_ids(api, start_page, end_page, after=self.journal.position):
+                positions.append([page, index])
+                yield tmdb_id
+
+        def on_batch(batch, total):
+            # Each batch is its own transaction: once it is committed, move the checkpoint past it.
+            self.journal.checkpoint(self.position, committed=batch.films_created + batch.films_updated)
+            self.stdout.write(f"Imported batch: {batch}")
+
+        def on_failure(item, error):
+            # journaled with the batch checkpoint, the rest of the batch is committed without it
+            self.failed += 1
+            self.journal.fail(item[0].get("id"), error)
+            self.stderr.write(self.style.ERROR(f"Rejected movie ID {item[0].get('id')}: {error}"))
 
         try:
-            self.stdout.write("Getting popular movies data from tmdb")
-            popular_movies = api.get_popular_films(page=1)
-            results = popular_movies.get("results", [])
-
-            if not results:
-                self.stdout.write(self.style.WARNING("No popular movies found on TMDB"))
-                return
-
-            for film_data in results:
-                tmdb_id = film_data.get("id")
-                if not tmdb_id:
-                    continue
-
-                self.stdout.write(f"FILm :  '{film_data.get('title')}' (TMDB ID: {tmdb_id})...")
-
-                try:
-                    details = api.get_film_details(film_id=str(tmdb_id))
-                    credits = api.get_movie_credits(film_id=str(tmdb_id))
-
-                    director_info = next(
-                        (member for member in credits.get("crew", []) if member.get("job") == "Director"), 
-                        None
-                    )
-                    if not director_info:
-                        self.stdout.write(self.style.WARNING("No director (author)"))
-                        continue
-
-                    director_tmdb_id = director_info.get("id")
-                    if not director_tmdb_id:
-                        continue
-
-                    director_details = api.get_people_detail(person_id=str(director_tmdb_id))
-                    user, user_created = User.objects.get_or_create(
-                        username=f"author_{director_tmdb_id}",
-                        defaults={
-                            "first_name": director_details.get('name', '').split(' ')[0],
-                            "last_name": director_details.get('name', '').split(' ')[1],
-                            "email": f"author_{director_tmdb_id}@example.com",
-                            "role": "AUTHOR",
-                        },
-                    )
-                    if user_created:
-                        self.stdout.write(self.style.SUCCESS(f"Created User for director {director_details.get('name')}"))
-
-                    author, author_created = Author.objects.update_or_create(
-                        tmdb_id=director_tmdb_id,
-                        defaults={
-                            "user": user,
-                            "popularity": director_details.get("popularity", 0.0),
-                            "website": director_details.get("homepage"),
-                            "death_date": director_details.get("deathday"),
-                            "gender": director_details.get("gender", 0),
-                            "department": director_details.get("known_for_department"),
-                        },
-                    )
-                    if author_created:
-                        self.stdout.write(self.style.SUCCESS(f"Created new author(director ): {author}"))
-                    else:
-                        self.stdout.write(f"Updated author: {author}")
-
-                    film, film_created = Film.objects.update_or_create(
-                        tmdb_id=tmdb_id,
-                        defaults={
-                            "title": details.get("title"),
-                            "description": details.get("overview", ""),
-                            "release_date": details.get("release_date"),
-                            "budget": details.get("budget"),
-                            "revenue": details.get("revenue"),
-                        },
-                    )
-                    if film_created:
-                        self.stdout.write(self.style.SUCCESS(f"Added film: {film.title}"))
-                    else:
-                        self.stdout.write(f"Updated film: {film.title}")
-
-                    film.authors.add(author)
-                    self.stdout.write(f"Associated director '{author}' with film '{film.title}'")
-
-                except Exception as movie_error:
-                    self.stderr.write(self.style.ERROR(f"Failed to process movie ID {tmdb_id}: {movie_error}"))
-
-            self.stdout.write(self.style.SUCCESS("Finished importing popular movies!"))
+            # Fetches run in the worker pool, every DB write happens here, in this thread, one batch at a time.
+            stats = importer.import_films(self.iter_importable(fetcher.iter_bundles(tmdb_ids()), positions), on_batch=on_batch, on_failure=on_failure)
+            self.journal.finish()
+            self.stdout.write(self.style.SUCCESS(f"Finished importing popular movies! ({stats}, {self.failed} failed)"))
+            self.stdout.write(f"Refreshed {box_office.refresh_stale()} box office groups")
 
         except Exception as e:
-            self.stderr.write(self.style.ERROR(f"Error fetching popular movies: {e}"))
\ No newline at end of file
+            self.stderr.write(self.style.ERROR(f"Error fetching popular movies: {e}"))
+            self.stderr.write(f"Committed batches are kept, run again with --resume to continue from page/index {self.journal.position}")
+
+        if cache is not None:
+            self.stdout.write(cache.summary())
+            cache.close()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from cinema.services.leaderboard import get_prior_mean, rebuild_rankings
+
+
+class Command(BaseCommand):
+    help = 'recompute the top films leaderboard (bayesian weighted ratings) with a fresh global mean'
+
+    def handle(self, *args, **options):
+        ranked = rebuild_rankings()
+        self.stdout.write(self.style.SUCCESS(f"Ranked {ranked} films (global mean {get_prior_mean():.2f})"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cinema.services.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'rebuild the full-text search index of every film'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} films"))
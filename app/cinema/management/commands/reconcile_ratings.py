@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cinema.services.leaderboard import rebuild_rankings
+from cinema.services.ratings import drifted_films, reconcile_film_ratings
+
+
+class Command(BaseCommand):
+    help = 'rebuild the stored film rating aggregates (count, sum, average) from the ratings table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only report the films whose aggregates drifted')
+
+    def handle(self, *args, **options):
+        drifted = drifted_films().count()
+        self.stdout.write(f"{drifted} films with drifted rating aggregates")
+        if options["check"]:
+            return
+
+        with transaction.atomic():
+            updated = reconcile_film_ratings()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating aggregates of {updated} films"))
+        ranked = rebuild_rankings()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the leaderboard ({ranked} ranked films)"))
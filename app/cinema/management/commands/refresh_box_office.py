@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from cinema.services import box_office
+
+
+class Command(BaseCommand):
+    help = 'recompute the box office rollups flagged by imports, or all of them with --full'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every group from all films')
+
+    def handle(self, *args, **options):
+        if options["full"]:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {box_office.rebuild()} box office groups"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Refreshed {box_office.refresh_stale()} box office groups"))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['-popularity', '-user'], name='author_popularity_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='film',
+            index=models.Index(fields=['-created_at', '-id'], name='film_created_keyset_idx'),
+        ),
+    ]
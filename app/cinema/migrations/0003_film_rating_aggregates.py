@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-18 18:08
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    Film = apps.get_model("cinema", "Film")
+    FilmRating = apps.get_model("cinema", "FilmRating")
+    ratings = FilmRating.objects.filter(film=OuterRef("pk")).order_by().values("film")
+    Film.objects.update(
+        rating_count=Coalesce(Subquery(ratings.annotate(c=Count("id")).values("c")), Value(0)),
+        rating_sum=Coalesce(Subquery(ratings.annotate(s=Sum("note")).values("s")), Value(0)),
+        rating_avg=Subquery(ratings.annotate(a=Avg("note")).values("a")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='film',
+            name='rating_avg',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='rating_sum',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
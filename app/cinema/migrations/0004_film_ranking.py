@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 18:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0003_film_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmRanking',
+            fields=[
+                ('film', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='cinema.film')),
+                ('score', models.FloatField()),
+                ('rating_count', models.PositiveIntegerField()),
+                ('rating_avg', models.FloatField()),
+                ('release_year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('statut', models.CharField(choices=[('DRAFT', 'Draft'), ('RELEASED', 'Released'), ('ARCHIVED', 'Archived')], max_length=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='filmranking',
+            index=models.Index(fields=['-score', 'film'], name='ranking_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filmranking',
+            index=models.Index(fields=['statut', '-score'], name='ranking_statut_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filmranking',
+            index=models.Index(fields=['release_year', '-score'], name='ranking_year_score_idx'),
+        ),
+    ]
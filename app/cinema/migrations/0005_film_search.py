@@ -0,0 +1,73 @@
+# Generated by Django 4.2 on 2026-10-18 18:11
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_search_index(apps, schema_editor):
+    """
+    PostgreSQL: GIN index on the weighted tsvector documents.
+    SQLite: FTS5 table (title, description, authors) keyed by film id.
+    Both are filled from the existing films.
+    """
+    config = getattr(settings, "SEARCH_CONFIG", "english")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX film_search_vector_gin ON cinema_filmsearchdocument USING gin (vector)"
+        )
+        schema_editor.execute(
+            """
+            INSERT INTO cinema_filmsearchdocument (film_id, vector)
+            SELECT f.id,
+                setweight(to_tsvector(%s, coalesce(f.title, '')), 'A')
+                || setweight(to_tsvector(%s, coalesce(f.description, '')), 'B')
+                || setweight(to_tsvector(%s, coalesce(string_agg(u.first_name || ' ' || u.last_name, ' '), '')), 'C')
+            FROM cinema_film f
+            LEFT JOIN cinema_film_authors fa ON fa.film_id = f.id
+            LEFT JOIN cinema_user u ON u.id = fa.author_id
+            GROUP BY f.id
+            """,
+            [config, config, config],
+        )
+    elif schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE cinema_film_fts USING fts5("
+            "title, description, authors, tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            """
+            INSERT INTO cinema_film_fts (rowid, title, description, authors)
+            SELECT f.id, f.title, f.description, coalesce(group_concat(u.first_name || ' ' || u.last_name, ' '), '')
+            FROM cinema_film f
+            LEFT JOIN cinema_film_authors fa ON fa.film_id = f.id
+            LEFT JOIN cinema_user u ON u.id = fa.author_id
+            GROUP BY f.id
+            """
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS film_search_vector_gin")
+    elif schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS cinema_film_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0004_film_ranking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmSearchDocument',
+            fields=[
+                ('film', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='cinema.film')),
+                ('vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
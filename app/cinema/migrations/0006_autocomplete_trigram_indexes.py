@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    PostgreSQL: trigram GIN indexes serving the istartswith / icontains queries of the autocomplete cold start.
+    The expressions match what Django generates for those lookups: UPPER(column::text).
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS film_title_trgm ON cinema_film USING gin (UPPER(title::text) gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS user_first_name_trgm ON cinema_user USING gin (UPPER(first_name::text) gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS user_last_name_trgm ON cinema_user USING gin (UPPER(last_name::text) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in ("film_title_trgm", "user_first_name_trgm", "user_last_name_trgm"):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0005_film_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
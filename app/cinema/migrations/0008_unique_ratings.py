@@ -0,0 +1,83 @@
+# Generated by Django 4.2 on 2026-10-18 18:31
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_ratings(apps, schema_editor):
+    """
+    Keep the latest rating (highest id) of every (spectator, film) and (spectator, author) pair,
+    then rebuild the stored aggregates of the films that had duplicates, and the leaderboard.
+    """
+    Film = apps.get_model("cinema", "Film")
+    FilmRating = apps.get_model("cinema", "FilmRating")
+    AuthorRating = apps.get_model("cinema", "AuthorRating")
+
+    for Rating, target in ((FilmRating, "film"), (AuthorRating, "author")):
+        duplicated = (
+            Rating.objects.order_by().values("spectator", target)
+            .annotate(rows=Count("id"), latest=Max("id"))
+            .filter(rows__gt=1)
+        )
+        touched = set()
+        for pair in duplicated.iterator():
+            Rating.objects.filter(spectator=pair["spectator"], **{target: pair[target]}).exclude(id=pair["latest"]).delete()
+            touched.add(pair[target])
+        if Rating is FilmRating and touched:
+            ratings = FilmRating.objects.filter(film=OuterRef("pk")).order_by().values("film")
+            Film.objects.filter(pk__in=touched).update(
+                rating_count=Coalesce(Subquery(ratings.annotate(c=Count("id")).values("c")), Value(0)),
+                rating_sum=Coalesce(Subquery(ratings.annotate(s=Sum("note")).values("s")), Value(0)),
+                rating_avg=Subquery(ratings.annotate(a=Avg("note")).values("a")),
+            )
+            rebuild_rankings(apps)
+
+
+def rebuild_rankings(apps):
+    """
+    leaderboard.rebuild_rankings on the historical models: the global mean moved with the aggregates,
+    so every score is recomputed.
+    """
+    Film = apps.get_model("cinema", "Film")
+    FilmRanking = apps.get_model("cinema", "FilmRanking")
+
+    totals = Film.objects.aggregate(total=Sum("rating_sum"), count=Sum("rating_count"))
+    prior_mean = totals["total"] / totals["count"] if totals["count"] else 3.0
+    min_votes = settings.LEADERBOARD_MIN_VOTES
+    FilmRanking.objects.all().delete()
+    films = Film.objects.filter(rating_count__gt=0).values("id", "rating_count", "rating_sum", "release_date", "statut")
+    FilmRanking.objects.bulk_create(
+        (
+            FilmRanking(
+                film_id=film["id"],
+                score=(film["rating_sum"] + min_votes * prior_mean) / (film["rating_count"] + min_votes),
+                rating_count=film["rating_count"],
+                rating_avg=film["rating_sum"] / film["rating_count"],
+                release_year=film["release_date"].year if film["release_date"] else None,
+                statut=film["statut"],
+            )
+            for film in films.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0007_author_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_ratings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='authorrating',
+            constraint=models.UniqueConstraint(fields=('spectator', 'author'), name='unique_author_rating_per_spectator'),
+        ),
+        migrations.AddConstraint(
+            model_name='filmrating',
+            constraint=models.UniqueConstraint(fields=('spectator', 'film'), name='unique_film_rating_per_spectator'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-18 18:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0008_unique_ratings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommenderRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30)),
+                ('started_at', models.DateTimeField()),
+                ('duration', models.FloatField(help_text='seconds')),
+                ('peak_memory', models.PositiveBigIntegerField(help_text='bytes, peak resident size of the process')),
+                ('films', models.PositiveIntegerField()),
+                ('ratings', models.PositiveIntegerField()),
+                ('rows', models.PositiveIntegerField(help_text='rows written')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SimilarFilm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_films', to='cinema.film')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cinema.film')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='recommenderrun',
+            index=models.Index(fields=['kind', '-started_at'], name='recommender_run_kind_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='similarfilm',
+            constraint=models.UniqueConstraint(fields=('film', 'rank'), name='unique_similar_film_rank'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 18:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0009_similar_films'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cinema.film')),
+                ('spectator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='cinema.spectator')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='filmrecommendation',
+            constraint=models.UniqueConstraint(fields=('spectator', 'rank'), name='unique_recommendation_rank'),
+        ),
+    ]
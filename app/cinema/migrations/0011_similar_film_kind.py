@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-18 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0010_film_recommendations'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='similarfilm',
+            name='unique_similar_film_rank',
+        ),
+        migrations.AddField(
+            model_name='similarfilm',
+            name='kind',
+            field=models.CharField(choices=[('ratings', 'Ratings'), ('content', 'Content')], default='ratings', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='recommenderrun',
+            name='films',
+            field=models.PositiveIntegerField(help_text='films computed'),
+        ),
+        migrations.AlterField(
+            model_name='recommenderrun',
+            name='ratings',
+            field=models.PositiveIntegerField(help_text='ratings and favorites read, 0 for content runs'),
+        ),
+        migrations.AddIndex(
+            model_name='similarfilm',
+            index=models.Index(fields=['similar', 'kind'], name='similar_film_reverse_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='similarfilm',
+            constraint=models.UniqueConstraint(fields=('film', 'kind', 'rank'), name='unique_similar_film_kind_rank'),
+        ),
+    ]
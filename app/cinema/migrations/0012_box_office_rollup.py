@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0011_similar_film_kind'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoxOfficeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('year', 'Year'), ('status', 'Status'), ('director', 'Director')], max_length=10)),
+                ('key', models.CharField(max_length=64)),
+                ('label', models.CharField(blank=True, max_length=300)),
+                ('films', models.PositiveIntegerField(default=0)),
+                ('budget_count', models.PositiveIntegerField(default=0)),
+                ('budget_sum', models.BigIntegerField(default=0)),
+                ('budget_avg', models.FloatField(blank=True, null=True)),
+                ('revenue_count', models.PositiveIntegerField(default=0)),
+                ('revenue_sum', models.BigIntegerField(default=0)),
+                ('revenue_avg', models.FloatField(blank=True, null=True)),
+                ('roi_count', models.PositiveIntegerField(default=0)),
+                ('roi_p25', models.FloatField(blank=True, null=True)),
+                ('roi_median', models.FloatField(blank=True, null=True)),
+                ('roi_p75', models.FloatField(blank=True, null=True)),
+                ('roi_p90', models.FloatField(blank=True, null=True)),
+                ('stale', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='boxofficerollup',
+            index=models.Index(condition=models.Q(('stale', True)), fields=['dimension'], name='box_office_stale_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='boxofficerollup',
+            constraint=models.UniqueConstraint(fields=('dimension', 'key'), name='unique_box_office_group'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 19:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0012_box_office_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmContentDigest',
+            fields=[
+                ('film', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='cinema.film')),
+                ('digest', models.BigIntegerField()),
+            ],
+        ),
+    ]
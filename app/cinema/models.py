@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
 from django.conf import settings
@@ -62,6 +63,13 @@ class Author(models.Model):
         default=Gender.NOT_SPECIFIED,
     )
     department = models.CharField(max_length=200,blank=True,null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the author list
+            models.Index(fields=["-popularity", "-user"], name="author_popularity_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name}"
@@ -116,14 +124,178 @@ class Film(models.Model):
         null=True, 
         blank=True,
     )
+
+    # Denormalized from FilmRating, kept up to date by cinema.services.ratings
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveBigIntegerField(default=0, editable=False)
+    rating_avg = models.FloatField(null=True, blank=True, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the film lists
+            models.Index(fields=["-created_at", "-id"], name="film_created_keyset_idx"),
+        ]
 
     def __str__(self):
         return self.title
     
+class FilmSearchDocument(models.Model):
+    """
+    Weighted full-text vector of a film (title > description > author names), GIN indexed.
+    PostgreSQL only: the SQLite configuration uses an FTS5 table instead, see cinema.services.search.
+    """
+    film = models.OneToOneField(Film, on_delete=models.CASCADE, related_name="search_document", primary_key=True)
+    vector = SearchVectorField(null=True)
+
+
+class FilmRanking(models.Model):
+    """
+    Precomputed Bayesian weighted rating of a rated film, served by the top films leaderboard.
+    Maintained by cinema.services.leaderboard.
+    """
+    film = models.OneToOneField(Film, on_delete=models.CASCADE, related_name="ranking", primary_key=True)
+    score = models.FloatField()
+    rating_count = models.PositiveIntegerField()
+    rating_avg = models.FloatField()
+    release_year = models.PositiveSmallIntegerField(null=True, blank=True)
+    statut = models.CharField(max_length=20, choices=FilmStatus.choices)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-score", "film"], name="ranking_score_idx"),
+            models.Index(fields=["statut", "-score"], name="ranking_statut_score_idx"),
+            models.Index(fields=["release_year", "-score"], name="ranking_year_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.film} ({self.score:.2f})"
+
+
+class SimilarityKind(models.TextChoices):
+    RATINGS = "ratings"
+    CONTENT = "content"
+
+
+class SimilarFilm(models.Model):
+    """
+    Precomputed nearest neighbours of a film (`rank` 1 is the closest), served by the
+    similar films endpoint. Rebuilt offline by the compute_similar_films command, from
+    ratings or from titles and descriptions depending on `kind`.
+    """
+    film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name="similar_films")
+    similar = models.ForeignKey(Film, on_delete=models.CASCADE, related_name="+")
+    kind = models.CharField(max_length=10, choices=SimilarityKind.choices, default=SimilarityKind.RATINGS)
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["film", "kind", "rank"], name="unique_similar_film_kind_rank"),
+        ]
+        indexes = [models.Index(fields=["similar", "kind"], name="similar_film_reverse_idx")]
+
+    def __str__(self):
+        return f"{self.film_id} -> {self.similar_id} ({self.score:.3f})"
+
+
+class FilmContentDigest(models.Model):
+    """
+    Digest of a film's title and description as of its last content similarity run. Films whose
+    digest changed are the ones recomputed, Film.updated_at also moves with every rating.
+    Maintained by cinema.services.content_similarity.
+    """
+    film = models.OneToOneField(Film, on_delete=models.CASCADE, related_name="+", primary_key=True)
+    digest = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.film_id}: {self.digest:x}"
+
+
+class FilmRecommendation(models.Model):
+    """
+    Precomputed top-N films for a spectator (`rank` 1 first), films they already rated excluded.
+    Rebuilt offline by the train_recommendations command.
+    """
+    spectator = models.ForeignKey(Spectator, on_delete=models.CASCADE, related_name="recommendations")
+    film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["spectator", "rank"], name="unique_recommendation_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.spectator_id} -> {self.film_id} ({self.score:.3f})"
+
+
+class RecommenderRun(models.Model):
+    """
+    One offline recommender computation, with what it cost, to schedule the next ones.
+    """
+    kind = models.CharField(max_length=30)
+    started_at = models.DateTimeField()
+    duration = models.FloatField(help_text="seconds")
+    peak_memory = models.PositiveBigIntegerField(help_text="bytes, peak resident size of the process")
+    films = models.PositiveIntegerField(help_text="films computed")
+    ratings = models.PositiveIntegerField(help_text="ratings and favorites read, 0 for content runs")
+    rows = models.PositiveIntegerField(help_text="rows written")
+
+    class Meta:
+        indexes = [models.Index(fields=["kind", "-started_at"], name="recommender_run_kind_idx")]
+
+    def __str__(self):
+        return f"{self.kind} {self.started_at:%Y-%m-%d %H:%M} ({self.duration:.1f}s)"
+
+
+class RollupDimension(models.TextChoices):
+    YEAR = "year"
+    STATUS = "status"
+    DIRECTOR = "director"
+
+
+class BoxOfficeRollup(models.Model):
+    """
+    Budget and revenue aggregates of the films of one release year, status or director,
+    maintained by cinema.services.box_office and served by the box office analytics endpoint.
+    Unknown amounts (null or 0 in TMDb data) are left out, ROI is (revenue - budget) / budget
+    over the films with both. `stale` groups are recomputed by the next refresh.
+    """
+    dimension = models.CharField(max_length=10, choices=RollupDimension.choices)
+    key = models.CharField(max_length=64)
+    label = models.CharField(max_length=300, blank=True)
+    films = models.PositiveIntegerField(default=0)
+    budget_count = models.PositiveIntegerField(default=0)
+    budget_sum = models.BigIntegerField(default=0)
+    budget_avg = models.FloatField(null=True, blank=True)
+    revenue_count = models.PositiveIntegerField(default=0)
+    revenue_sum = models.BigIntegerField(default=0)
+    revenue_avg = models.FloatField(null=True, blank=True)
+    roi_count = models.PositiveIntegerField(default=0)
+    roi_p25 = models.FloatField(null=True, blank=True)
+    roi_median = models.FloatField(null=True, blank=True)
+    roi_p75 = models.FloatField(null=True, blank=True)
+    roi_p90 = models.FloatField(null=True, blank=True)
+    stale = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "key"], name="unique_box_office_group"),
+        ]
+        indexes = [
+            models.Index(fields=["dimension"], condition=models.Q(stale=True), name="box_office_stale_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} {self.label or self.key}"
+
+
 class FilmRating(models.Model):
     spectator = models.ForeignKey(
         Spectator,
@@ -139,6 +311,12 @@ class FilmRating(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(5)],
     )
 
+    class Meta:
+        constraints = [
+            # one rating per spectator and film, the target of the rating upserts
+            models.UniqueConstraint(fields=["spectator", "film"], name="unique_film_rating_per_spectator"),
+        ]
+
     def __str__(self):
         return f"{self.spectator} - {self.film} ({self.note})"
 
@@ -156,5 +334,11 @@ class AuthorRating(models.Model):
     note = models.IntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(10)],
     )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["spectator", "author"], name="unique_author_rating_per_spectator"),
+        ]
+
     def __str__(self):
         return f"{self.spectator} - {self.author} ({self.note})"
\ No newline at end of file
@@ -0,0 +1,162 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _field_value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a stable, indexed, unique-together ordering key.
+
+    Pages are fetched with `WHERE (key) < (last key of previous page) ORDER BY key LIMIT n`,
+    so page N costs the same as page 1. The ordering fields must be non-null and the
+    last one unique (usually the primary key). Works on model instances and `.values()` rows.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = data["p"], bool(data["r"])
+            if len(position) != len(self.ordering):
+                raise ValueError
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse=False):
+        values = [value.isoformat() if hasattr(value, "isoformat") else value for value in position]
+        data = json.dumps({"p": values, "r": int(reverse)}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def position_of(self, row):
+        return [_field_value(row, field.lstrip("-")) for field in self.ordering]
+
+    def filter_after(self, queryset, position, ordering):
+        """
+        Rows strictly after `position` in `ordering`: (a, b) > (x, y) <=> a > x OR (a = x AND b > y).
+        """
+        model = queryset.model
+        condition = Q()
+        equal = Q()
+        for field, raw in zip(ordering, position):
+            name = field.lstrip("-")
+            value = model._meta.get_field(name).to_python(raw)
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return queryset.filter(condition)
+
+    def page_queryset(self, queryset, request):
+        """
+        The query of the requested page, one extra row included to tell whether another page follows.
+        """
+        self.request = request
+        self.requested_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            try:
+                queryset = self.filter_after(queryset, self.position, ordering)
+            except Exception:
+                raise NotFound(self.invalid_cursor_message)
+        return queryset[:self.requested_size + 1]
+
+    def set_page(self, rows):
+        position, reverse = self.position, self.reverse
+        has_more = len(rows) > self.requested_size
+        rows = rows[:self.requested_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = has_more if reverse else position is not None
+        self.next_position = self.position_of(rows[-1]) if rows else position
+        self.previous_position = self.position_of(rows[0]) if rows else position
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        paginate_queryset for async views, the page is read with the async ORM.
+        """
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.previous_position is None:
+            return remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.previous_position, reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class FilmPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class AuthorPagination(KeysetPagination):
+    ordering = ("-popularity", "-user_id")
+
+
+class SearchPagination(PageNumberPagination):
+    """
+    Ranked results have no stable key to seek on, they are paged by page number.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
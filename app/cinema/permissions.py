@@ -5,7 +5,9 @@ from cinema.models import Roles
 
 class IsSpectator(BasePermission):
     """
-    Permission to allow only Spectator users.
+    Permission to allow only Spectator users, with their spectator profile
+    (superusers get the SPECTATOR role by default but no profile).
     """
     def has_permission(self, request, view):
-        return request.user and request.user.role == Roles.SPECTATOR
+        user = request.user
+        return bool(user and user.role == Roles.SPECTATOR and hasattr(user, "spectator"))
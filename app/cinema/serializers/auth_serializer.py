@@ -1,7 +1,10 @@
 
 import logging
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from cinema.authentication import add_user_claims
 from cinema.models import Spectator, User, Roles
 
 
@@ -53,9 +56,7 @@ class CustomTokenSerializer(TokenObtainPairSerializer):
     
     @classmethod
     def get_token(cls, user):
-        token = super().get_token(user)
-        token['role'] = user.role
-        return token
+        return add_user_claims(super().get_token(user), user)
 
     def validate(self, attrs):
         attrs["email"] = attrs["email"].lower()
@@ -70,4 +71,30 @@ class CustomTokenSerializer(TokenObtainPairSerializer):
             "email": self.user.email,
             "role": self.user.role,
         }
-        return data
\ No newline at end of file
+        return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Access tokens refreshed with the user's current claims: simplejwt copies those of the refresh
+    token, which would keep the role, spectator and staff flag of the login until it expires.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.select_related("spectator").filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        add_user_claims(refresh, user)
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from cinema.models import BoxOfficeRollup
+
+
+class BoxOfficeRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BoxOfficeRollup
+        fields = [
+            'key', 'label', 'films',
+            'budget_count', 'budget_sum', 'budget_avg',
+            'revenue_count', 'revenue_sum', 'revenue_avg',
+            'roi_count', 'roi_p25', 'roi_median', 'roi_p75', 'roi_p90',
+            'updated_at',
+        ]
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+MAX_IDS = 1000
+
+
+def id_list():
+    return serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list, max_length=MAX_IDS
+    )
+
+
+class BulkFavoritesSerializer(serializers.Serializer):
+    add_films = id_list()
+    remove_films = id_list()
+    add_authors = id_list()
+    remove_authors = id_list()
+
+    def validate(self, attrs):
+        if not any(attrs.values()):
+            raise serializers.ValidationError("Nothing to add or remove.")
+        for kind in ("films", "authors"):
+            both = set(attrs[f"add_{kind}"]) & set(attrs[f"remove_{kind}"])
+            if both:
+                raise serializers.ValidationError({f"remove_{kind}": f"Ids both added and removed: {sorted(both)}"})
+        return attrs
@@ -1,6 +1,6 @@
 
 from rest_framework import serializers
-from cinema.models import Film
+from cinema.models import Film, FilmRanking, SimilarFilm
 from cinema.serializers.author_serializer import AuthorSerializer
 
 class FilmSerializer(serializers.ModelSerializer):
@@ -8,8 +8,28 @@ class FilmSerializer(serializers.ModelSerializer):
         model = Film
         fields = [
             'id', 'title', 'description', 'release_date', 
-            'statut', 'tmdb_id', 'budget', 'revenue'
+            'statut', 'tmdb_id', 'budget', 'revenue', 'rating_avg', 'rating_count'
         ]
+        read_only_fields = ('rating_avg', 'rating_count')
+
+
+class FilmSearchResultSerializer(FilmSerializer):
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+
+    class Meta(FilmSerializer.Meta):
+        fields = FilmSerializer.Meta.fields + ['rank']
+
+
+class SpectatorFilmSerializer(FilmSerializer):
+    """
+    FilmSerializer plus the requesting spectator's `is_favorite` and `my_rating`,
+    read from queryset annotations (see SpectatorFieldsMixin).
+    """
+    is_favorite = serializers.BooleanField(read_only=True)
+    my_rating = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta(FilmSerializer.Meta):
+        fields = FilmSerializer.Meta.fields + ['is_favorite', 'my_rating']
 
 
 class FilmDetailSerializer(serializers.ModelSerializer):
@@ -19,7 +39,30 @@ class FilmDetailSerializer(serializers.ModelSerializer):
         model= Film
         fields = [
             'id', 'title', 'description', 'release_date', 
-            'statut', 'tmdb_id', 'budget', 'revenue', "authors"
+            'statut', 'tmdb_id', 'budget', 'revenue', 'rating_avg', 'rating_count', "authors"
         ]
-        read_only_fields = ('id',)
+        read_only_fields = ('id', 'rating_avg', 'rating_count')
+
+
+class TopFilmSerializer(serializers.ModelSerializer):
+    film = FilmSerializer(read_only=True)
+
+    class Meta:
+        model = FilmRanking
+        fields = ['score', 'film']
+
+
+class SimilarFilmSerializer(serializers.ModelSerializer):
+    film = FilmSerializer(source='similar', read_only=True)
+
+    class Meta:
+        model = SimilarFilm
+        fields = ['score', 'film']
+
 
+class RecommendationSerializer(serializers.Serializer):
+    """
+    A FilmRecommendation, or a FilmRanking when falling back to the most popular films.
+    """
+    score = serializers.FloatField(read_only=True)
+    film = FilmSerializer(read_only=True)
@@ -4,6 +4,10 @@ from cinema.models import FilmRating, AuthorRating
 class RatingSerializer(serializers.Serializer):
     note = serializers.IntegerField(min_value=1, max_value=5, help_text ="Note from 1 to 5")
     
+class FilmRatingBatchItemSerializer(RatingSerializer):
+    film_id = serializers.IntegerField(min_value=1)
+
+
 class FilmRatingSerializer(serializers.ModelSerializer):
     class Meta:
         model = FilmRating
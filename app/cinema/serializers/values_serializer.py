@@ -0,0 +1,134 @@
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _identity(value):
+    return value
+
+
+def converter_for(field):
+    """
+    A plain function producing the same output as `field.to_representation` for non-null database values.
+    Fields without a known shortcut keep their own `to_representation`.
+    """
+    if isinstance(field, (serializers.ReadOnlyField, serializers.ChoiceField, serializers.BooleanField)):
+        return _identity
+    if isinstance(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.FloatField):
+        return float
+    if isinstance(field, serializers.CharField):
+        return str
+    if isinstance(field, serializers.DateField) and not isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if output_format is None:
+            return _identity
+        if output_format.lower() == "iso-8601":
+            return datetime.date.isoformat
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Serializer-free rendering of a ModelSerializer from `.values()` rows.
+
+    The serializer's fields are compiled once into (output key, values() key, converter)
+    triples, nested serializers included, so a row costs a dict build and a few builtin calls
+    instead of a model instance plus one field object call per column. The output is the
+    same as `serializer_class(queryset, many=True).data`, see test_values_serializer.py.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def plan(self):
+        return self.compile(self.serializer_class())
+
+    def compile(self, serializer, prefix=""):
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == "*" or isinstance(field, (serializers.SerializerMethodField, serializers.ListSerializer)):
+                raise ImproperlyConfigured(f"{type(serializer).__name__}.{name} cannot be read from .values() rows")
+            lookup = prefix + "__".join(field.source_attrs)
+            if isinstance(field, serializers.BaseSerializer):
+                plan.append((name, None, self.compile(field, prefix=lookup + "__")))
+            else:
+                plan.append((name, lookup, converter_for(field)))
+        return tuple(plan)
+
+    @cached_property
+    def value_fields(self) -> list[str]:
+        def lookups(plan):
+            for _, lookup, converter in plan:
+                if lookup is None:
+                    yield from lookups(converter)
+                else:
+                    yield lookup
+        return list(lookups(self.plan))
+
+    def values(self, queryset, *extra):
+        """
+        The queryset as `.values()` rows carrying every serialized field (plus `extra`, e.g. ordering keys).
+        """
+        return queryset.values(*dict.fromkeys(self.value_fields + list(extra)))
+
+    @cached_property
+    def to_representation(self):
+        """
+        One function per serializer, generated from the plan: a single dict display per row,
+        values that need no conversion are copied as they are.
+        """
+        namespace = {}
+
+        def expression(plan):
+            items = []
+            for name, lookup, converter in plan:
+                if lookup is None:
+                    value = expression(converter)
+                elif converter is _identity:
+                    value = f"row[{lookup!r}]"
+                else:
+                    namespace[f"c{len(namespace)}"] = converter
+                    value = f"(None if row[{lookup!r}] is None else c{len(namespace) - 1}(row[{lookup!r}]))"
+                items.append(f"{name!r}: {value}")
+            return "{" + ", ".join(items) + "}"
+
+        source = f"def to_representation(row):\n    return {expression(self.plan)}\n"
+        exec(compile(source, f"<{self.serializer_class.__name__} values serializer>", "exec"), namespace)
+        return namespace["to_representation"]
+
+    def serialize(self, rows) -> list[dict]:
+        return list(map(self.to_representation, rows))
+
+
+class ValuesListMixin:
+    """
+    Opt-in fast list path (FAST_LIST_SERIALIZATION setting): the page is fetched with `.values()`
+    and rendered by the view's `values_serializer` instead of its serializer_class.
+    """
+
+    values_serializer = None
+
+    def get_values_serializer(self):
+        return self.values_serializer
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if not settings.FAST_LIST_SERIALIZATION or values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        ordering = [field.lstrip("-") for field in getattr(self.paginator, "ordering", ())]
+        rows = values_serializer.values(self.filter_queryset(self.get_queryset()), *ordering)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(rows))
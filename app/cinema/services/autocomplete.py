@@ -0,0 +1,290 @@
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from functools import partial
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from cinema.models import Author, Film
+
+FILM = "film"
+AUTHOR = "author"
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    kind: str
+    id: int
+    label: str
+    weight: float
+
+
+def normalize(text: str) -> str:
+    """
+    Case and accent insensitive form of a label or query, used as the index key.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+
+def prefix_keys(label: str) -> set[str]:
+    """
+    Index keys of a label: the label from each word on, so "The Matrix" is found by "the m" and "matr".
+    """
+    words = normalize(label).split(" ")
+    return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+class PrefixIndex:
+    """
+    Sorted array of (key, id) searched with bisect: all keys starting with a prefix form one contiguous slice.
+
+    Scanning that slice costs one step per match, too much for short or common prefixes on every
+    keystroke, so the `top_size` heaviest ids of each prefix searched are kept, heaviest first, and
+    patched by `add` and `remove`. A prefix is scanned again only when one of its kept ids leaves a
+    full list. A list shorter than `top_size` holds every match, the next keystroke filters it.
+    """
+
+    top_size = 25  # the largest limit the autocomplete endpoint accepts
+    max_prefixes = 20_000
+
+    def __init__(self):
+        self._keys = []
+        self._entries = {}
+        self._top = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, suggestions):
+        entries = {suggestion.id: suggestion for suggestion in suggestions}
+        keys = sorted((key, pk) for pk, suggestion in entries.items() for key in prefix_keys(suggestion.label))
+        with self._lock:
+            self._entries, self._keys, self._top = entries, keys, {}
+
+    def add(self, suggestion: Suggestion):
+        with self._lock:
+            self._discard(suggestion.id)
+            self._entries[suggestion.id] = suggestion
+            for key in prefix_keys(suggestion.label):
+                insort(self._keys, (key, suggestion.id))
+            for prefix in self._cached_prefixes(suggestion):
+                top = self._top[prefix]
+                insort(top, self._rank(suggestion.id))
+                del top[self.top_size:]
+
+    def remove(self, pk: int):
+        with self._lock:
+            self._discard(pk)
+
+    def _rank(self, pk):
+        return -self._entries[pk].weight, pk
+
+    def _cached_prefixes(self, suggestion):
+        return {
+            key[:length] for key in prefix_keys(suggestion.label) for length in range(1, len(key) + 1)
+            if key[:length] in self._top
+        }
+
+    def _discard(self, pk):
+        previous = self._entries.get(pk)
+        if previous is None:
+            return
+        for prefix in self._cached_prefixes(previous):
+            top = self._top[prefix]
+            rank = (-previous.weight, pk)
+            position = bisect_left(top, rank)
+            if position < len(top) and top[position] == rank:
+                if len(top) == self.top_size:
+                    # the next heaviest match is unknown, scan again on the next search
+                    del self._top[prefix]
+                else:
+                    del top[position]
+        del self._entries[pk]
+        for key in prefix_keys(previous.label):
+            position = bisect_left(self._keys, (key, pk))
+            if position < len(self._keys) and self._keys[position] == (key, pk):
+                del self._keys[position]
+
+    def _matching(self, prefix):
+        parent = self._top.get(prefix[:-1])
+        if parent is not None and len(parent) < self.top_size:
+            # every match of the shorter prefix is there
+            candidates = (self._entries[pk] for _, pk in parent)
+            return [
+                suggestion for suggestion in candidates
+                if any(key.startswith(prefix) for key in prefix_keys(suggestion.label))
+            ]
+        matches = {}
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            pk = self._keys[position][1]
+            matches[pk] = self._entries[pk]
+            position += 1
+        return matches.values()
+
+    def search(self, query: str, limit: int) -> list[Suggestion]:
+        """
+        The `limit` heaviest entries having a key that starts with `query` (at most `top_size`),
+        heaviest first, ties by id.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        with self._lock:
+            top = self._top.get(prefix)
+            if top is None:
+                top = heapq.nsmallest(self.top_size, (self._rank(suggestion.id) for suggestion in self._matching(prefix)))
+                if len(self._top) >= self.max_prefixes:
+                    self._top.clear()
+                self._top[prefix] = top
+            return [self._entries[pk] for _, pk in top[:limit]]
+
+
+def film_suggestions(ids=None):
+    films = Film.objects.order_by()
+    if ids is not None:
+        films = films.filter(pk__in=ids)
+    # rating count: how much the film is actually looked at here
+    for pk, title, rating_count in films.values_list("pk", "title", "rating_count").iterator(chunk_size=5000):
+        yield Suggestion(FILM, pk, title, float(rating_count))
+
+
+def author_suggestions(ids=None):
+    authors = Author.objects.order_by()
+    if ids is not None:
+        authors = authors.filter(pk__in=ids)
+    rows = authors.values_list("pk", "user__first_name", "user__last_name", "user__username", "popularity")
+    for pk, first_name, last_name, username, popularity in rows.iterator(chunk_size=5000):
+        # same label as User.__str__
+        yield Suggestion(AUTHOR, pk, f"{first_name} {last_name}".strip() or username, popularity)
+
+
+LOADERS = {FILM: film_suggestions, AUTHOR: author_suggestions}
+
+
+def database_suggestions(query: str, limit: int) -> dict[str, list[Suggestion]]:
+    """
+    Cold start path, answered by the trigram indexes of migration 0006 on PostgreSQL.
+    """
+    query = " ".join(query.split())
+    if not query:
+        return {FILM: [], AUTHOR: []}
+    films = (
+        Film.objects.filter(Q(title__istartswith=query) | Q(title__icontains=f" {query}"))
+        .order_by("-rating_count", "pk")
+        .values_list("pk", "title", "rating_count")[:limit]
+    )
+    authors = (
+        Author.objects.filter(Q(user__first_name__istartswith=query) | Q(user__last_name__istartswith=query))
+        .order_by("-popularity", "pk")
+        .values_list("pk", "user__first_name", "user__last_name", "user__username", "popularity")[:limit]
+    )
+    return {
+        FILM: [Suggestion(FILM, pk, title, float(count)) for pk, title, count in films],
+        AUTHOR: [
+            Suggestion(AUTHOR, pk, f"{first_name} {last_name}".strip() or username, popularity)
+            for pk, first_name, last_name, username, popularity in authors
+        ],
+    }
+
+
+class Autocomplete:
+    """
+    Per-process typeahead over film titles and author names.
+
+    The index is built on first use (in a background thread, queries go to the database meanwhile),
+    patched on commit by the model signals and the importer, and rebuilt when older than
+    AUTOCOMPLETE_MAX_AGE so changes made by other processes show up.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.indexes = {FILM: PrefixIndex(), AUTHOR: PrefixIndex()}
+        self.built_at = None
+        self.building = False
+        self._changed = set()
+        self._lock = threading.Lock()
+
+    @property
+    def tracking(self) -> bool:
+        return self.built_at is not None or self.building
+
+    def suggest(self, query: str, limit: int = 10) -> dict[str, list[Suggestion]]:
+        if self.built_at is None:
+            self.schedule_build()
+            if self.built_at is None:
+                return database_suggestions(query, limit)
+        elif time.monotonic() - self.built_at > settings.AUTOCOMPLETE_MAX_AGE:
+            self.schedule_build()
+        return {kind: index.search(query, limit) for kind, index in self.indexes.items()}
+
+    def schedule_build(self):
+        with self._lock:
+            if self.building:
+                return
+            self.building = True
+        if settings.AUTOCOMPLETE_BUILD_IN_BACKGROUND:
+            threading.Thread(target=self._build_in_thread, name="autocomplete-build", daemon=True).start()
+        else:
+            self.build()
+
+    def _build_in_thread(self):
+        try:
+            self.build()
+        finally:
+            connection.close()
+
+    def build(self):
+        """
+        Load every film and author, then replay the changes committed while loading.
+        """
+        try:
+            with self._lock:
+                self.building = True
+                self._changed = set()
+            for kind, index in self.indexes.items():
+                index.load(LOADERS[kind]())
+            with self._lock:
+                changed, self._changed = self._changed, set()
+            for kind, pk in changed:
+                self.refresh(kind, [pk])
+            self.built_at = time.monotonic()
+        finally:
+            self.building = False
+
+    def refresh(self, kind: str, ids):
+        """
+        Reload the given entries from the database, dropping the ones that no longer exist.
+        """
+        ids = set(ids)
+        if self.building:
+            with self._lock:
+                self._changed.update((kind, pk) for pk in ids)
+        if not ids or self.built_at is None:
+            return
+        found = {suggestion.id: suggestion for suggestion in LOADERS[kind](ids)}
+        index = self.indexes[kind]
+        for pk in ids:
+            if pk in found:
+                index.add(found[pk])
+            else:
+                index.remove(pk)
+
+    def schedule_refresh(self, kind: str, ids):
+        """
+        Refresh the entries once the current transaction commits. Free while the index is not built.
+        """
+        if self.tracking:
+            transaction.on_commit(partial(self.refresh, kind, list(ids)))
+
+
+autocomplete = Autocomplete()
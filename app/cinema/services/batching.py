@@ -0,0 +1,10 @@
+from itertools import islice
+
+
+def chunked(iterable, size):
+    """
+    Split any iterable into lists of at most `size` items, without materializing it.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,157 @@
+from django.db import transaction
+
+from cinema.models import Author, BoxOfficeRollup, Film, FilmStatus, RollupDimension
+from cinema.services.batching import chunked
+
+PERCENTILES = {"roi_p25": 25, "roi_median": 50, "roi_p75": 75, "roi_p90": 90}
+SUMMARY_FIELDS = [
+    "label", "films", "budget_count", "budget_sum", "budget_avg", "revenue_count", "revenue_sum", "revenue_avg",
+    "roi_count", *PERCENTILES, "stale", "updated_at",
+]
+
+
+def percentile(ordered: list[float], p: float) -> float | None:
+    """
+    Linear interpolation between closest ranks, as numpy.percentile's default.
+    """
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(amounts: list[tuple]) -> dict:
+    """
+    Rollup fields of a group from the (budget, revenue) of its films.
+    """
+    budgets = [budget for budget, _ in amounts if budget and budget > 0]
+    revenues = [revenue for _, revenue in amounts if revenue and revenue > 0]
+    rois = sorted(
+        (revenue - budget) / budget for budget, revenue in amounts
+        if budget and budget > 0 and revenue and revenue > 0
+    )
+    return {
+        "films": len(amounts),
+        "budget_count": len(budgets),
+        "budget_sum": sum(budgets),
+        "budget_avg": sum(budgets) / len(budgets) if budgets else None,
+        "revenue_count": len(revenues),
+        "revenue_sum": sum(revenues),
+        "revenue_avg": sum(revenues) / len(revenues) if revenues else None,
+        "roi_count": len(rois),
+        **{field: percentile(rois, p) for field, p in PERCENTILES.items()},
+    }
+
+
+def group_rows(dimension: str, keys=None):
+    """
+    (key, budget, revenue) of every film of the `dimension` groups in `keys` (all groups by default),
+    films with several directors once per director.
+    """
+    if dimension == RollupDimension.DIRECTOR:
+        rows = Film.authors.through.objects.values_list("author_id", "film__budget", "film__revenue")
+        if keys is not None:
+            rows = rows.filter(author_id__in=[int(key) for key in keys])
+    elif dimension == RollupDimension.YEAR:
+        rows = Film.objects.filter(release_date__isnull=False).values_list("release_date__year", "budget", "revenue")
+        if keys is not None:
+            rows = rows.filter(release_date__year__in=[int(key) for key in keys])
+    else:
+        rows = Film.objects.values_list("statut", "budget", "revenue")
+        if keys is not None:
+            rows = rows.filter(statut__in=keys)
+    return rows.order_by().iterator(chunk_size=5000)
+
+
+def labels(dimension: str, keys) -> dict[str, str]:
+    if dimension == RollupDimension.DIRECTOR:
+        names = Author.objects.filter(pk__in=[int(key) for key in keys]).values_list(
+            "pk", "user__first_name", "user__last_name", "user__username"
+        )
+        return {str(pk): f"{first_name} {last_name}".strip() or username for pk, first_name, last_name, username in names}
+    if dimension == RollupDimension.STATUS:
+        return {key: FilmStatus(key).label for key in keys if key in FilmStatus.values}
+    return {key: key for key in keys}
+
+
+def compute(dimension: str, keys=None) -> list[BoxOfficeRollup]:
+    amounts = {}
+    for chunk in [None] if keys is None else chunked(sorted(keys), 5000):
+        for key, budget, revenue in group_rows(dimension, chunk):
+            amounts.setdefault(str(key), []).append((budget, revenue))
+    names = labels(dimension, amounts)
+    return [
+        BoxOfficeRollup(dimension=dimension, key=key, label=names.get(key, ""), stale=False, **summarize(films))
+        for key, films in amounts.items()
+    ]
+
+
+def save(rollups: list[BoxOfficeRollup]):
+    for batch in chunked(rollups, 1000):
+        BoxOfficeRollup.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=["dimension", "key"], update_fields=SUMMARY_FIELDS,
+        )
+
+
+def film_groups(films) -> set[tuple[str, str]]:
+    """
+    The (dimension, key) groups a queryset of films currently counts in.
+    """
+    groups = set()
+    for year, statut in films.values_list("release_date__year", "statut"):
+        groups.add((RollupDimension.STATUS, statut))
+        if year is not None:
+            groups.add((RollupDimension.YEAR, str(year)))
+    directors = Film.authors.through.objects.filter(film__in=films.values("pk")).values_list("author_id", flat=True)
+    groups.update((RollupDimension.DIRECTOR, str(author_id)) for author_id in directors.distinct())
+    return groups
+
+
+def mark_stale(groups):
+    """
+    Flag groups for the next refresh_stale, creating the rows of new groups. One upsert, for use in write paths.
+    """
+    if groups:
+        BoxOfficeRollup.objects.bulk_create(
+            [BoxOfficeRollup(dimension=dimension, key=key, stale=True) for dimension, key in groups],
+            update_conflicts=True, unique_fields=["dimension", "key"], update_fields=["stale"],
+        )
+
+
+def refresh_stale() -> int:
+    """
+    Recompute the stale groups only, reading just their films. Groups left without films are removed.
+    Returns the number of groups refreshed.
+    """
+    refreshed = 0
+    for dimension in RollupDimension.values:
+        with transaction.atomic():
+            stale = set(
+                BoxOfficeRollup.objects.select_for_update()
+                .filter(dimension=dimension, stale=True)
+                .values_list("key", flat=True)
+            )
+            if not stale:
+                continue
+            rollups = compute(dimension, stale)
+            save(rollups)
+            empty = stale - {rollup.key for rollup in rollups}
+            BoxOfficeRollup.objects.filter(dimension=dimension, key__in=empty).delete()
+            refreshed += len(stale)
+    return refreshed
+
+
+def rebuild() -> int:
+    """
+    Recompute every group from a full pass over the films, e.g. after edits made outside the importers.
+    """
+    created = 0
+    with transaction.atomic():
+        BoxOfficeRollup.objects.all().delete()
+        for dimension in RollupDimension.values:
+            rollups = compute(dimension)
+            save(rollups)
+            created += len(rollups)
+    return created
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+
+class ImportJournal:
+    """
+    Checkpoint file of a long import: run parameters, position of the last committed batch and failures.
+
+    It is rewritten atomically after every committed batch, so an interrupted import
+    can be restarted with `--resume` from the last checkpoint instead of from scratch.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.state = {}
+
+    @classmethod
+    def for_command(cls, command: str, key: str | None = None):
+        name = command if key is None else f"{command}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
+        return cls(Path(settings.IMPORT_JOURNAL_DIR) / f"{name}.json")
+
+    def load(self) -> dict:
+        try:
+            self.state = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.state = {}
+        return self.state
+
+    def start(self, params: dict):
+        self.state = {
+            "params": params,
+            "position": None,
+            "committed": 0,
+            "failures": [],
+            "finished": False,
+            "started_at": self._now(),
+        }
+        self.save()
+
+    def resume(self) -> dict | None:
+        """
+        Return the last checkpoint of an unfinished run, None when there is nothing to resume.
+        """
+        state = self.load()
+        if not state or state.get("finished"):
+            return None
+        return state
+
+    @property
+    def position(self):
+        return self.state.get("position")
+
+    def checkpoint(self, position, committed: int = 0):
+        self.state["position"] = position
+        self.state["committed"] = self.state.get("committed", 0) + committed
+        self.save()
+
+    def fail(self, item, error):
+        self.state.setdefault("failures", []).append({"item": item, "error": str(error)})
+
+    def finish(self):
+        self.state["finished"] = True
+        self.save()
+
+    def save(self):
+        self.state["updated_at"] = self._now()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2))
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,198 @@
+import hashlib
+import re
+import time
+import zlib
+from array import array
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from cinema.models import Film, FilmContentDigest, RecommenderRun, SimilarFilm, SimilarityKind
+from cinema.services.autocomplete import normalize
+from cinema.services.batching import chunked
+from cinema.services.similarity import peak_memory, top_neighbours
+
+CONTENT_TFIDF = "content_tfidf"
+FEATURES = 2 ** 20
+TITLE_WEIGHT = 2  # title words count as if they appeared twice
+WORD = re.compile(r"\w\w+")
+
+
+def terms(text: str) -> list[str]:
+    """
+    Words of two letters or more and their bigrams, case and accent insensitive.
+    """
+    words = WORD.findall(normalize(text))
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def feature(term: str) -> int:
+    # crc32 rather than hash(): stable between processes, so runs are reproducible
+    return zlib.crc32(term.encode()) % FEATURES
+
+
+def content_digest(title: str, description: str) -> int:
+    # signed 64 bits, as a BigIntegerField
+    digest = hashlib.blake2b(f"{title}\0{description}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def load_documents(chunk_size: int = 10_000):
+    """
+    Film ids and the hashed term counts of their title and description, as a sparse film x feature matrix
+    (films without any word are left out), plus the ids and content digests of every film, by id.
+    """
+    films = Film.objects.order_by("pk").values_list("pk", "title", "description")
+    # typed arrays keep one machine word per entry instead of a Python int
+    film_ids, indptr, indices, counts = array("q"), array("q", [0]), array("i"), array("f")
+    all_ids, digests = array("q"), array("q")
+    for chunk in chunked(films.iterator(chunk_size=chunk_size), chunk_size):
+        for film_id, title, description in chunk:
+            all_ids.append(film_id)
+            digests.append(content_digest(title, description or ""))
+            document = {}
+            for text, weight in ((title, TITLE_WEIGHT), (description or "", 1)):
+                for term in terms(text):
+                    key = feature(term)
+                    document[key] = document.get(key, 0) + weight
+            if not document:
+                continue
+            film_ids.append(film_id)
+            indices.extend(document)
+            counts.extend(document.values())
+            indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.frombuffer(counts, dtype=np.float32), np.frombuffer(indices, dtype=np.int32), np.frombuffer(indptr, dtype=np.int64)),
+        shape=(len(film_ids), FEATURES),
+    )
+    return (
+        np.frombuffer(film_ids, dtype=np.int64), matrix,
+        np.frombuffer(all_ids, dtype=np.int64), np.frombuffer(digests, dtype=np.int64),
+    )
+
+
+def tfidf(counts, max_document_frequency: float = 0.2):
+    """
+    Sublinear term frequency times smoothed inverse document frequency, rows L2 normalized.
+    Terms found in more than `max_document_frequency` of the films ("the", "his", ...) are dropped:
+    they say little about a film and would make every pair of films overlap.
+    """
+    weights = counts.copy()
+    weights.data = 1 + np.log(weights.data)
+    documents = np.bincount(weights.indices, minlength=weights.shape[1])
+    idf = (np.log((1 + weights.shape[0]) / (1 + documents)) + 1).astype(np.float32)
+    idf[documents > max_document_frequency * weights.shape[0]] = 0
+    weights.data *= idf[weights.indices]
+    weights.eliminate_zeros()
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms).dot(weights).tocsr()
+
+
+def changed_films(all_ids, digests):
+    """
+    Ids of the films whose title or description changed since their digest was stored, new films included.
+    None when no digest is stored yet (first run).
+    """
+    stored = FilmContentDigest.objects.order_by("film_id").values_list("film_id", "digest")
+    stored_ids, stored_digests = array("q"), array("q")
+    for film_id, digest in stored.iterator(chunk_size=10_000):
+        stored_ids.append(film_id)
+        stored_digests.append(digest)
+    if not stored_ids:
+        return None
+    stored_ids = np.frombuffer(stored_ids, dtype=np.int64)
+    positions = np.minimum(np.searchsorted(stored_ids, all_ids), len(stored_ids) - 1)
+    same = (stored_ids[positions] == all_ids) & (np.frombuffer(stored_digests, dtype=np.int64)[positions] == digests)
+    return all_ids[~same]
+
+
+def stale_films(film_ids, changed):
+    """
+    Films to recompute: the `changed` ones plus the films whose stored neighbours include one of
+    them, since those scores moved too. Returns their rows in the term matrix and all their ids
+    (films left without any word have no row).
+    """
+    changed = changed.tolist()
+    stale = set(changed)
+    for ids in chunked(changed, 5000):
+        stale.update(
+            SimilarFilm.objects.filter(kind=SimilarityKind.CONTENT, similar_id__in=ids).values_list("film_id", flat=True)
+        )
+    stale = np.array(sorted(stale), dtype=np.int64)
+    rows = np.searchsorted(film_ids, stale)
+    present = rows < len(film_ids)
+    present[present] = film_ids[rows[present]] == stale[present]
+    return rows[present], stale
+
+
+def save_digests(all_ids, digests, changed, batch_size: int = 5000):
+    if changed is None:
+        FilmContentDigest.objects.all().delete()
+        ids, values = all_ids, digests
+    else:
+        keep = np.isin(all_ids, changed)
+        ids, values = all_ids[keep], digests[keep]
+    rows = (FilmContentDigest(film_id=int(film_id), digest=int(digest)) for film_id, digest in zip(ids, values))
+    for batch in chunked(rows, batch_size):
+        FilmContentDigest.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=["film"], update_fields=["digest"],
+        )
+
+
+def compute_content_similarities(
+    top_k: int = 20, chunk_size: int = 500, full: bool = False, max_document_frequency: float = 0.2,
+    batch_size: int = 5000,
+) -> RecommenderRun:
+    """
+    Store the `top_k` nearest films of each film by TF-IDF cosine similarity of titles and descriptions
+    (hashed word unigrams and bigrams), for films without ratings as well.
+
+    The term matrix is rebuilt from every film (one pass, cheap next to the similarities), but only the
+    films whose title or description digest changed since the previous run, and those listing them as
+    neighbours, are recomputed, unless `full` or on the first run. Their new neighbours are not pushed
+    back into unchanged films' lists, which are refreshed by the next full run.
+    """
+    started_at, clock = timezone.now(), time.perf_counter()
+    film_ids, counts, all_ids, digests = load_documents()
+    weights = tfidf(counts, max_document_frequency)
+    del counts
+
+    changed = None if full else changed_films(all_ids, digests)
+    if changed is None:
+        rows, recomputed = None, None
+    else:
+        rows, recomputed = stale_films(film_ids, changed)
+
+    def neighbour_rows():
+        for row, neighbours, scores in top_neighbours(weights, top_k, chunk_size, rows=rows):
+            film_id = int(film_ids[row])
+            for rank, (neighbour, score) in enumerate(zip(neighbours, scores), start=1):
+                yield SimilarFilm(
+                    film_id=film_id, similar_id=int(film_ids[neighbour]),
+                    kind=SimilarityKind.CONTENT, rank=rank, score=float(score),
+                )
+
+    written = 0
+    with transaction.atomic():
+        stored = SimilarFilm.objects.filter(kind=SimilarityKind.CONTENT)
+        if recomputed is None:
+            stored.delete()
+        else:
+            for ids in chunked(recomputed.tolist(), batch_size):
+                stored.filter(film_id__in=ids).delete()
+        for batch in chunked(neighbour_rows(), batch_size):
+            SimilarFilm.objects.bulk_create(batch)
+            written += len(batch)
+        save_digests(all_ids, digests, changed, batch_size)
+        return RecommenderRun.objects.create(
+            kind=CONTENT_TFIDF,
+            started_at=started_at,
+            duration=time.perf_counter() - clock,
+            peak_memory=peak_memory(),
+            films=len(film_ids) if rows is None else len(rows),
+            ratings=0,
+            rows=written,
+        )
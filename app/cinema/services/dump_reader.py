@@ -0,0 +1,52 @@
+import gzip
+import json
+
+
+def open_dump(path):
+    """
+    Open a dump file as text, transparently decompressing `.gz` files.
+    """
+    with open(path, "rb") as probe:
+        gzipped = probe.read(2) == b"\x1f\x8b"
+    if gzipped:
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "rt", encoding="utf-8")
+
+
+def iter_records(lines, errors: list | None = None):
+    """
+    Parse newline-delimited JSON, skipping blank and malformed lines (recorded in `errors`).
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            if errors is not None:
+                errors.append((line_number, str(e)))
+            continue
+        if isinstance(record, dict) and record.get("id"):
+            yield record
+
+
+def record_kind(record: dict) -> str:
+    """
+    TMDb exports movies with a title and people with a name.
+    """
+    if "title" in record or "original_title" in record:
+        return "movie"
+    if "name" in record:
+        return "person"
+    return "unknown"
+
+
+def director_of(record: dict):
+    """
+    Director payload of an enriched movie record: a `director` object, or the Director in `credits.crew`.
+    """
+    if record.get("director"):
+        return record["director"]
+    crew = (record.get("credits") or {}).get("crew", [])
+    return next((member for member in crew if member.get("job") == "Director" and member.get("id")), None)
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+
+from cinema.models import Film
+from cinema.serializers.film_serializer import FilmSerializer
+from cinema.serializers.values_serializer import ValuesSerializer
+from cinema.services.batching import chunked
+
+try:
+    import orjson
+except ImportError:  # the `export` extra, about 5x faster than the standard library encoder
+    orjson = None
+
+CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+film_values = ValuesSerializer(FilmSerializer)
+
+
+if orjson is not None:
+    def dumps(value) -> bytes:
+        return orjson.dumps(value)
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(value) -> bytes:
+        return _encoder.encode(value).encode()
+
+
+def iter_catalog(chunk_size: int = 2000):
+    """
+    Every film as its API representation plus its authors, read with a server-side cursor
+    `chunk_size` films at a time (one extra query per chunk for the authors). Yields lists of rows.
+    """
+    films = film_values.values(Film.objects.order_by("pk"))
+    for chunk in chunked(films.iterator(chunk_size=chunk_size), chunk_size):
+        authors = {}
+        links = (
+            Film.authors.through.objects.filter(film_id__in=[film["id"] for film in chunk])
+            .order_by("film_id", "author_id")
+            .values_list(
+                "film_id", "author_id", "author__tmdb_id",
+                "author__user__first_name", "author__user__last_name", "author__user__username",
+            )
+        )
+        for film_id, author_id, tmdb_id, first_name, last_name, username in links:
+            name = f"{first_name} {last_name}".strip() or username
+            authors.setdefault(film_id, []).append({"id": author_id, "name": name, "tmdb_id": tmdb_id})
+        rows = []
+        for film in chunk:
+            row = film_values.to_representation(film)
+            row["authors"] = authors.get(film["id"], [])
+            rows.append(row)
+        yield rows
+
+
+def iter_json(chunks):
+    yield b"["
+    separator = b""
+    for rows in chunks:
+        yield separator + b",".join(dumps(row) for row in rows)
+        separator = b","
+    yield b"]"
+
+
+def iter_ndjson(chunks):
+    for rows in chunks:
+        yield b"".join(dumps(row) + b"\n" for row in rows)
+
+
+def iter_csv(chunks):
+    """
+    One line per film, author names joined with "; ".
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[name for name, _, _ in film_values.plan] + ["authors"])
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    for rows in chunks:
+        for row in rows:
+            writer.writerow({**row, "authors": "; ".join(author["name"] for author in row["authors"])})
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+WRITERS = {"json": iter_json, "ndjson": iter_ndjson, "csv": iter_csv}
+
+
+def export_catalog(format: str, chunk_size: int = 2000):
+    """
+    The whole catalog as a stream of encoded byte chunks, memory bounded by `chunk_size`.
+    """
+    return WRITERS[format](iter_catalog(chunk_size))
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from cinema.models import Spectator
+
+# outcome of each requested id
+ADDED = "added"
+ALREADY_FAVORITE = "already_favorite"
+REMOVED = "removed"
+NOT_FAVORITE = "not_favorite"
+NOT_FOUND = "not_found"
+
+
+def update_favorites(spectator: Spectator, relation: str, add=(), remove=()) -> list[dict]:
+    """
+    Add and remove many favorites of one kind (`favorite_films` or `favorite_authors`) at once:
+    one IN query checks which ids exist and are already favorites, then one bulk insert and one
+    delete on the through table apply the change. Returns the outcome of every requested id.
+    """
+    field = Spectator._meta.get_field(relation)
+    Through = field.remote_field.through
+    owner, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+    add, remove = list(dict.fromkeys(add)), list(dict.fromkeys(remove))
+
+    favorite = Through.objects.filter(**{owner: spectator, target: OuterRef("pk")})
+    state = dict(
+        field.related_model.objects.filter(pk__in=add + remove)
+        .annotate(is_favorite=Exists(favorite))
+        .values_list("pk", "is_favorite")
+    )
+
+    outcomes = []
+    to_add, to_remove = [], []
+    for pk in add:
+        if pk not in state:
+            outcome = NOT_FOUND
+        elif state[pk]:
+            outcome = ALREADY_FAVORITE
+        else:
+            outcome = ADDED
+            to_add.append(pk)
+        outcomes.append({"id": pk, "action": "add", "result": outcome})
+    for pk in remove:
+        if pk not in state:
+            outcome = NOT_FOUND
+        elif not state[pk]:
+            outcome = NOT_FAVORITE
+        else:
+            outcome = REMOVED
+            to_remove.append(pk)
+        outcomes.append({"id": pk, "action": "remove", "result": outcome})
+
+    with transaction.atomic():
+        if to_add:
+            Through.objects.bulk_create(
+                [Through(**{f"{owner}_id": spectator.pk, f"{target}_id": pk}) for pk in to_add],
+                ignore_conflicts=True,
+            )
+        if to_remove:
+            Through.objects.filter(**{owner: spectator, f"{target}__in": to_remove}).delete()
+    return outcomes
@@ -0,0 +1,238 @@
+from dataclasses import dataclass, fields
+
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, transaction
+
+from cinema.caching import invalidate
+from cinema.models import Author, Film, Roles, User
+from cinema.services import box_office, leaderboard, search
+from cinema.services.autocomplete import AUTHOR, FILM, autocomplete
+from cinema.services.batching import chunked
+
+# Model field -> TMDb payload keys it is read from. On conflict a field is only
+# overwritten when every payload of the batch carries it, so sparse records
+# (e.g. daily export dumps) never blank out data imported from the API.
+FILM_SOURCES = {
+    "title": ("title", "original_title"),
+    "description": ("overview",),
+    "release_date": ("release_date",),
+    "budget": ("budget",),
+    "revenue": ("revenue",),
+}
+AUTHOR_SOURCES = {
+    "popularity": ("popularity",),
+    "website": ("homepage",),
+    "death_date": ("deathday",),
+    "gender": ("gender",),
+    "department": ("known_for_department",),
+}
+# What a malformed payload fails with (bad date, string too long for the column, missing id...),
+# as opposed to the database itself going away, which still aborts the import.
+REJECTED_ROW_ERRORS = (DataError, IntegrityError, ValidationError, LookupError, TypeError, ValueError)
+
+
+@dataclass
+class ImportStats:
+    films_created: int = 0
+    films_updated: int = 0
+    authors_created: int = 0
+    authors_updated: int = 0
+    links: int = 0
+    batches: int = 0
+    rejected: int = 0
+
+    def __add__(self, other):
+        return ImportStats(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+    def __str__(self):
+        return (
+            f"{self.films_created} films created, {self.films_updated} updated, "
+            f"{self.authors_created} authors created, {self.authors_updated} updated "
+            f"({self.batches} batches, {self.rejected} rejected)"
+        )
+
+
+def present_fields(payloads, sources: dict) -> list[str]:
+    return [
+        field for field, keys in sources.items()
+        if all(any(key in payload for key in keys) for payload in payloads)
+    ]
+
+
+def clip(model, field: str, value):
+    """
+    Cut a string to the max_length of the model field it is stored in.
+    """
+    max_length = model._meta.get_field(field).max_length
+    return value[:max_length] if value and max_length else value
+
+
+def author_username(tmdb_id) -> str:
+    return f"author_{tmdb_id}"
+
+
+def film_from_tmdb(data: dict) -> Film:
+    return Film(
+        tmdb_id=data["id"],
+        title=clip(Film, "title", data.get("title") or data.get("original_title") or ""),
+        description=clip(Film, "description", data.get("overview") or ""),
+        release_date=data.get("release_date") or None,
+        budget=data.get("budget"),
+        revenue=data.get("revenue"),
+    )
+
+
+def user_from_tmdb(data: dict) -> User:
+    first_name, _, last_name = (data.get("name") or "").partition(" ")
+    return User(
+        username=author_username(data["id"]),
+        first_name=clip(User, "first_name", first_name),
+        last_name=clip(User, "last_name", last_name),
+        email=f"author_{data['id']}@example.com",  # authors are users, they need a (fake) unique email
+        role=Roles.Author,
+    )
+
+
+def author_from_tmdb(data: dict, user_id: int) -> Author:
+    return Author(
+        user_id=user_id,
+        tmdb_id=data["id"],
+        popularity=data.get("popularity") or 0.0,
+        website=clip(Author, "website", data.get("homepage") or None),
+        death_date=data.get("deathday") or None,
+        gender=data.get("gender") or 0,
+        department=clip(Author, "department", data.get("known_for_department")),
+    )
+
+
+class FilmImporter:
+    """
+    Set-based upsert of TMDb films and their directors.
+
+    Each batch costs a fixed number of queries whatever its size: existing ids are
+    loaded with one `IN` query per table, users, authors and films are upserted with
+    `bulk_create(update_conflicts=True)` and film/author links are inserted in bulk.
+    """
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+
+    def import_films(self, items, on_batch=None, on_failure=None) -> ImportStats:
+        """
+        Import an iterable of (film payload, director payload or None) pairs, one transaction per batch.
+
+        Items rejected by the database are skipped and passed to `on_failure(item, error)`.
+        """
+        total = ImportStats()
+        for batch in chunked(items, self.batch_size):
+            stats = self.import_or_split(self.import_batch, batch, on_failure)
+            total += stats
+            if on_batch is not None:
+                on_batch(stats, total)
+        return total
+
+    def import_or_split(self, import_batch, batch, on_failure=None) -> ImportStats:
+        """
+        Run `import_batch` in a transaction. When the batch is rejected, import its halves on their own,
+        down to the single items that fail: those are reported and skipped, the rest is committed.
+        """
+        try:
+            with transaction.atomic():
+                return import_batch(batch)
+        except REJECTED_ROW_ERRORS as e:
+            if len(batch) == 1:
+                if on_failure is not None:
+                    on_failure(batch[0], e)
+                return ImportStats(batches=1, rejected=1)
+        middle = len(batch) // 2
+        return self.import_or_split(import_batch, batch[:middle], on_failure) + self.import_or_split(
+            import_batch, batch[middle:], on_failure
+        )
+
+    def import_batch(self, batch) -> ImportStats:
+        stats = ImportStats(batches=1)
+        films = {data["id"]: data for data, _ in batch}
+        directors = {director["id"]: director for _, director in batch if director}
+
+        author_ids = self.upsert_authors(directors.values(), stats)
+
+        existing_films = set(Film.objects.filter(tmdb_id__in=films).values_list("tmdb_id", flat=True))
+        # box office groups the films leave, if their year changes
+        previous_groups = box_office.film_groups(Film.objects.filter(tmdb_id__in=existing_films)) if existing_films else set()
+        Film.objects.bulk_create(
+            [film_from_tmdb(data) for data in films.values()],
+            update_conflicts=True,
+            unique_fields=["tmdb_id"],
+            update_fields=present_fields(films.values(), FILM_SOURCES) + ["updated_at"],
+        )
+        stats.films_created = len(films) - len(existing_films)
+        stats.films_updated = len(existing_films)
+
+        film_ids = dict(Film.objects.filter(tmdb_id__in=films).values_list("tmdb_id", "id"))
+        if author_ids:
+            Through = Film.authors.through
+            links = {
+                (film_ids[data["id"]], author_ids[director["id"]])
+                for data, director in batch
+                if director
+            }
+            Through.objects.bulk_create(
+                [Through(film_id=film_id, author_id=author_id) for film_id, author_id in links],
+                ignore_conflicts=True,
+            )
+            stats.links = len(links)
+        # bulk_create sends no signals, keep the search indexes and cached responses in line here
+        search.index_films(sorted(film_ids.values()))
+        box_office.mark_stale(previous_groups | box_office.film_groups(Film.objects.filter(pk__in=film_ids.values())))
+        leaderboard.refresh_film_rankings(film_ids.values())
+        invalidate(Film, Author)
+        autocomplete.schedule_refresh(FILM, film_ids.values())
+        return stats
+
+    def upsert_authors(self, people, stats: ImportStats | None = None) -> dict[int, int]:
+        """
+        Upsert authors (and their users) from TMDb person payloads, return {person tmdb id: author pk}.
+        """
+        people = {person["id"]: person for person in people}
+        if not people:
+            return {}
+
+        existing = set(Author.objects.filter(tmdb_id__in=people).values_list("tmdb_id", flat=True))
+        # Like get_or_create: users that already exist are left untouched.
+        User.objects.bulk_create([user_from_tmdb(person) for person in people.values()], ignore_conflicts=True)
+        user_ids = dict(
+            User.objects.filter(username__in=[author_username(tmdb_id) for tmdb_id in people]).values_list("username", "id")
+        )
+        authors = [author_from_tmdb(person, user_ids[author_username(tmdb_id)]) for tmdb_id, person in people.items()]
+        update_fields = present_fields(people.values(), AUTHOR_SOURCES)
+        if update_fields:
+            Author.objects.bulk_create(
+                authors, update_conflicts=True, unique_fields=["tmdb_id"], update_fields=update_fields + ["updated_at"]
+            )
+        else:
+            Author.objects.bulk_create(authors, ignore_conflicts=True)
+        autocomplete.schedule_refresh(AUTHOR, user_ids.values())
+        invalidate(Author, User)
+        if stats is not None:
+            stats.authors_created += len(people) - len(existing)
+            stats.authors_updated += len(existing)
+        return {tmdb_id: user_ids[author_username(tmdb_id)] for tmdb_id in people}
+
+    def import_people(self, people, on_batch=None, on_failure=None) -> ImportStats:
+        """
+        Import an iterable of TMDb person payloads as authors, one transaction per batch.
+
+        Payloads rejected by the database are skipped and passed to `on_failure(payload, error)`.
+        """
+        total = ImportStats()
+        for batch in chunked(people, self.batch_size):
+            stats = self.import_or_split(self.import_people_batch, batch, on_failure)
+            total += stats
+            if on_batch is not None:
+                on_batch(stats, total)
+        return total
+
+    def import_people_batch(self, people) -> ImportStats:
+        stats = ImportStats(batches=1)
+        self.upsert_authors(people, stats)
+        return stats
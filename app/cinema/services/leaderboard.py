@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+
+from cinema.models import Film, FilmRanking
+from cinema.services.batching import chunked
+
+PRIOR_MEAN_CACHE_KEY = "leaderboard:prior_mean"
+DEFAULT_PRIOR_MEAN = 3.0  # middle of the 1-5 scale, used before any rating exists
+
+
+def weighted_rating(avg: float, count: int, prior_mean: float, min_votes: int) -> float:
+    """
+    IMDb-style Bayesian average: films with few votes are pulled towards the global mean.
+    """
+    return (count * avg + min_votes * prior_mean) / (count + min_votes)
+
+
+def compute_prior_mean() -> float:
+    totals = Film.objects.aggregate(total=Sum("rating_sum"), count=Sum("rating_count"))
+    if not totals["count"]:
+        return DEFAULT_PRIOR_MEAN
+    return totals["total"] / totals["count"]
+
+
+def get_prior_mean() -> float:
+    """
+    Global mean rating C. It moves slowly, so it is cached instead of aggregated on every rating.
+    """
+    return cache.get_or_set(PRIOR_MEAN_CACHE_KEY, compute_prior_mean, settings.LEADERBOARD_PRIOR_TTL)
+
+
+def ranking_for(film: dict, prior_mean: float, min_votes: int) -> FilmRanking:
+    avg = film["rating_sum"] / film["rating_count"]
+    return FilmRanking(
+        film_id=film["id"],
+        score=weighted_rating(avg, film["rating_count"], prior_mean, min_votes),
+        rating_count=film["rating_count"],
+        rating_avg=avg,
+        release_year=film["release_date"].year if film["release_date"] else None,
+        statut=film["statut"],
+    )
+
+
+RANKING_SOURCE_FIELDS = ("id", "rating_count", "rating_sum", "release_date", "statut")
+
+
+def refresh_film_ranking(film_id: int):
+    """
+    Recompute the leaderboard row of one film after its ratings changed.
+    """
+    refresh_film_rankings([film_id])
+
+
+def refresh_film_rankings(film_ids):
+    """
+    Recompute the leaderboard rows of many films in one read and one upsert (plus one delete for unrated films).
+    """
+    film_ids = set(film_ids)
+    films = Film.objects.filter(pk__in=film_ids, rating_count__gt=0).values(*RANKING_SOURCE_FIELDS)
+    prior_mean, min_votes = None, settings.LEADERBOARD_MIN_VOTES
+    rankings = []
+    for film in films:
+        prior_mean = get_prior_mean() if prior_mean is None else prior_mean
+        rankings.append(ranking_for(film, prior_mean, min_votes))
+    unrated = film_ids - {ranking.film_id for ranking in rankings}
+    if unrated:
+        FilmRanking.objects.filter(film_id__in=unrated).delete()
+    if rankings:
+        FilmRanking.objects.bulk_create(
+            rankings,
+            update_conflicts=True,
+            unique_fields=["film"],
+            update_fields=["score", "rating_count", "rating_avg", "release_year", "statut", "updated_at"],
+        )
+
+
+def sync_film_ranking_attributes(film: Film):
+    """
+    Keep the denormalized filter columns in line when a film is edited.
+    """
+    FilmRanking.objects.filter(film_id=film.pk).update(
+        release_year=film.release_date.year if film.release_date else None,
+        statut=film.statut,
+    )
+
+
+def rebuild_rankings(chunk_size: int = 2000) -> int:
+    """
+    Recompute the whole leaderboard with a fresh global mean.
+    """
+    prior_mean = compute_prior_mean()
+    min_votes = settings.LEADERBOARD_MIN_VOTES
+    films = Film.objects.filter(rating_count__gt=0).values(*RANKING_SOURCE_FIELDS).order_by("pk")
+    created = 0
+    with transaction.atomic():
+        FilmRanking.objects.all().delete()
+        for chunk in chunked(films.iterator(chunk_size=chunk_size), chunk_size):
+            FilmRanking.objects.bulk_create([ranking_for(film, prior_mean, min_votes) for film in chunk])
+            created += len(chunk)
+    cache.set(PRIOR_MEAN_CACHE_KEY, prior_mean, settings.LEADERBOARD_PRIOR_TTL)
+    return created
@@ -0,0 +1,167 @@
+from django.db import transaction
+from django.db.models import Avg, Case, Count, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Now, NullIf
+
+from cinema.caching import invalidate
+from cinema.models import AuthorRating, Film, FilmRating, Spectator
+from cinema.services.batching import chunked
+from cinema.services.leaderboard import refresh_film_ranking, refresh_film_rankings
+
+
+def apply_rating_delta(film_id: int, count_delta: int, sum_delta: int) -> int:
+    """
+    Shift the stored rating aggregates of a film in one UPDATE with F-expressions.
+    Returns the number of updated films (0 when the film does not exist).
+    """
+    count = F("rating_count") + count_delta
+    total = F("rating_sum") + sum_delta
+    invalidate(Film)
+    return Film.objects.filter(pk=film_id).update(
+        rating_count=count,
+        rating_sum=total,
+        rating_avg=Cast(total, FloatField()) / NullIf(count, 0),
+        updated_at=Now(),
+    )
+
+
+def _per_film(deltas, position):
+    whens = [When(pk=film_id, then=Value(values[position])) for film_id, values in deltas]
+    return Case(*whens, default=Value(0), output_field=IntegerField())
+
+
+def apply_rating_deltas(deltas: dict[int, tuple[int, int]], chunk_size: int = 500) -> int:
+    """
+    Like apply_rating_delta for many films ({film id: (count delta, sum delta)}), one UPDATE per chunk of films.
+    """
+    updated = 0
+    for chunk in chunked(deltas.items(), chunk_size):
+        count = F("rating_count") + _per_film(chunk, 0)
+        total = F("rating_sum") + _per_film(chunk, 1)
+        updated += Film.objects.filter(pk__in=[film_id for film_id, _ in chunk]).update(
+            rating_count=count,
+            rating_sum=total,
+            rating_avg=Cast(total, FloatField()) / NullIf(count, 0),
+            updated_at=Now(),
+        )
+    if deltas:
+        invalidate(Film)
+    return updated
+
+
+RATING_TARGETS = {FilmRating: "film", AuthorRating: "author"}
+
+
+def upsert_ratings(ratings):
+    """
+    Write ratings of one model in a single INSERT ... ON CONFLICT (spectator, target) DO UPDATE SET note.
+    """
+    if not ratings:
+        return
+    Rating = type(ratings[0])
+    Rating.objects.bulk_create(
+        ratings,
+        update_conflicts=True,
+        unique_fields=["spectator", RATING_TARGETS[Rating]],
+        update_fields=["note"],
+    )
+
+
+def lock_previous_rating(spectator, film) -> tuple[int | None, int | None]:
+    """
+    Lock the spectator row and read the id and note of its current rating of `film` in one statement.
+    Concurrent ratings by the same spectator are serialized, so a double click cannot count as two
+    new ratings.
+    """
+    previous = FilmRating.objects.filter(spectator=OuterRef("pk"), film=film)
+    return (
+        Spectator.objects.select_for_update(of=("self",))
+        .filter(pk=spectator.pk)
+        .annotate(previous_id=Subquery(previous.values("id")[:1]), previous=Subquery(previous.values("note")[:1]))
+        .values_list("previous_id", "previous")
+        .first()
+    ) or (None, None)
+
+
+def rate_film(spectator, film, note: int) -> FilmRating:
+    """
+    Create or change the spectator's rating of a film and update the film aggregates atomically.
+    """
+    with transaction.atomic():
+        rating_id, previous = lock_previous_rating(spectator, film)
+        rating = FilmRating(pk=rating_id, spectator=spectator, film=film, note=note)
+        # the spectator lock keeps the pair unwritten by anyone else: a plain INSERT (RETURNING id)
+        # or UPDATE is enough, without signals (the deltas are applied here)
+        if rating_id is None:
+            FilmRating.objects.bulk_create([rating])
+        else:
+            FilmRating.objects.filter(pk=rating_id).update(note=note)
+        apply_rating_delta(film.pk, 1 if previous is None else 0, note - (previous or 0))
+        refresh_film_ranking(film.pk)
+    return rating
+
+
+def rate_author(spectator, author, note: int) -> AuthorRating:
+    upsert_ratings([AuthorRating(spectator=spectator, author=author, note=note)])
+    return AuthorRating.objects.get(spectator=spectator, author=author)
+
+
+def rate_films(spectator, notes: dict[int, int], chunk_size: int = 500) -> dict[str, int]:
+    """
+    Create or change many ratings of one spectator ({film id: note}) in one transaction.
+    Per chunk: one read of the existing notes and one upsert; the film aggregates and the
+    leaderboard are then updated once for the whole batch.
+    """
+    stats = {"created": 0, "updated": 0, "unchanged": 0}
+    deltas = {}
+    with transaction.atomic():
+        Spectator.objects.select_for_update().filter(pk=spectator.pk).exists()
+        for chunk in chunked(notes.items(), chunk_size):
+            notes_chunk = dict(chunk)
+            existing = dict(
+                FilmRating.objects.filter(spectator=spectator, film_id__in=notes_chunk).values_list("film_id", "note")
+            )
+            written = []
+            for film_id, note in notes_chunk.items():
+                previous = existing.get(film_id)
+                if previous == note:
+                    stats["unchanged"] += 1
+                    continue
+                stats["created" if previous is None else "updated"] += 1
+                deltas[film_id] = (1, note) if previous is None else (0, note - previous)
+                written.append(FilmRating(spectator=spectator, film_id=film_id, note=note))
+            upsert_ratings(written)
+        apply_rating_deltas(deltas)
+        refresh_film_rankings(deltas)
+    return stats
+
+
+def _rating_subqueries():
+    ratings = FilmRating.objects.filter(film=OuterRef("pk")).order_by().values("film")
+    return {
+        "count": Coalesce(Subquery(ratings.annotate(c=Count("id")).values("c")), Value(0)),
+        "total": Coalesce(Subquery(ratings.annotate(s=Sum("note")).values("s")), Value(0)),
+        "avg": Subquery(ratings.annotate(a=Avg("note")).values("a")),
+    }
+
+
+def drifted_films(queryset=None):
+    """
+    Films whose stored aggregates disagree with their FilmRating rows.
+    """
+    queryset = Film.objects.all() if queryset is None else queryset
+    actual = _rating_subqueries()
+    return queryset.annotate(actual_count=actual["count"], actual_sum=actual["total"]).filter(
+        ~Q(rating_count=F("actual_count")) | ~Q(rating_sum=F("actual_sum"))
+    )
+
+
+def reconcile_film_ratings(queryset=None) -> int:
+    """
+    Rebuild the stored aggregates from the FilmRating table, in one set-based UPDATE.
+    """
+    queryset = Film.objects.all() if queryset is None else queryset
+    actual = _rating_subqueries()
+    invalidate(Film)
+    return queryset.update(
+        rating_count=actual["count"], rating_sum=actual["total"], rating_avg=actual["avg"], updated_at=Now()
+    )
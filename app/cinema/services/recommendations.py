@@ -0,0 +1,176 @@
+import time
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from cinema.models import FilmRecommendation, RecommenderRun, Spectator
+from cinema.services.batching import chunked
+from cinema.services.similarity import load_ratings, peak_memory
+
+IMPLICIT_ALS = "implicit_als"
+FAVORITE_WEIGHT = 5  # a favorite counts as much as a top note
+
+
+def load_favorites(chunk_size: int = 100_000):
+    """
+    Every favorite film as two aligned arrays (spectator ids, film ids).
+    """
+    rows = Spectator.favorite_films.through.objects.order_by().values_list("spectator_id", "film_id")
+    spectators, films = [], []
+    for chunk in chunked(rows.iterator(chunk_size=chunk_size), chunk_size):
+        columns = np.array(chunk, dtype=np.int64)
+        spectators.append(columns[:, 0])
+        films.append(columns[:, 1])
+    if not films:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(spectators), np.concatenate(films)
+
+
+def interaction_matrix(spectators, films, strengths):
+    """
+    Sparse spectator x film matrix of the summed interaction strengths, with the ids of its rows and columns.
+    """
+    spectator_ids, rows = np.unique(spectators, return_inverse=True)
+    film_ids, columns = np.unique(films, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (strengths, (rows, columns)), shape=(len(spectator_ids), len(film_ids)), dtype=np.float32,
+    )
+    matrix.sum_duplicates()
+    return spectator_ids, film_ids, matrix
+
+
+def row_blocks(indptr, block_entries: int):
+    """
+    Consecutive (start, stop) row ranges of a CSR matrix holding about `block_entries` entries each.
+    """
+    start, count = 0, len(indptr) - 1
+    while start < count:
+        stop = int(np.searchsorted(indptr, indptr[start] + block_entries, side="right")) - 1
+        stop = min(max(stop, start + 1), count)
+        yield start, stop
+        start = stop
+
+
+def least_squares(confidence, fixed, current, regularization: float, cg_steps: int = 3, block_entries: int = 1_000_000):
+    """
+    One half ALS step (Hu, Koren & Volinsky 2008): the factors of every row of `confidence`
+    (holding c - 1 for the observed entries) given the `fixed` factors of its columns.
+
+    Each row solves (YᵀY + λI + Yᵀ(Cᵤ - I)Y) xᵤ = YᵀCᵤpᵤ approximately with a few conjugate gradient
+    steps warm started from `current` (Takács et al. 2011). A step costs O(entries x factors) and is
+    vectorized over a block of rows as sparse products, instead of one factors x factors system per row.
+    """
+    gram = fixed.T @ fixed + regularization * np.eye(fixed.shape[1], dtype=fixed.dtype)
+    solution = current.copy()
+    for start, stop in row_blocks(confidence.indptr, block_entries):
+        block = confidence[start:stop]
+        rows = np.repeat(np.arange(stop - start), np.diff(block.indptr))
+        vectors = fixed[block.indices]
+
+        def product(factors):
+            dots = np.einsum("ij,ij->i", vectors, factors[rows])
+            weighted = sparse.csr_matrix((block.data * dots, block.indices, block.indptr), shape=block.shape)
+            return factors @ gram + weighted @ fixed
+
+        preference = sparse.csr_matrix((1 + block.data, block.indices, block.indptr), shape=block.shape)
+        x = solution[start:stop]
+        residual = preference @ fixed - product(x)
+        direction = residual.copy()
+        norm = np.einsum("ij,ij->i", residual, residual)
+        for _ in range(cg_steps):
+            moved = product(direction)
+            curvature = np.einsum("ij,ij->i", direction, moved)
+            step = np.divide(norm, curvature, out=np.zeros_like(norm), where=curvature > 0)
+            x += step[:, None] * direction
+            residual -= step[:, None] * moved
+            new_norm = np.einsum("ij,ij->i", residual, residual)
+            direction = residual + np.divide(new_norm, norm, out=np.zeros_like(norm), where=norm > 0)[:, None] * direction
+            norm = new_norm
+        solution[start:stop] = x
+    return solution
+
+
+def train(
+    matrix, factors: int = 32, iterations: int = 15, regularization: float = 0.1, alpha: float = 5.0,
+    cg_steps: int = 3, seed: int = 0,
+):
+    """
+    Implicit feedback ALS on a spectator x film strength matrix, confidence 1 + alpha * strength.
+    Returns the spectator and film factors.
+    """
+    confidence = matrix.astype(np.float32) * alpha
+    confidence_t = confidence.T.tocsr()
+    random = np.random.default_rng(seed)
+    spectators = (random.standard_normal((matrix.shape[0], factors)) * 0.01).astype(np.float32)
+    films = (random.standard_normal((matrix.shape[1], factors)) * 0.01).astype(np.float32)
+    for _ in range(iterations):
+        spectators = least_squares(confidence, films, spectators, regularization, cg_steps)
+        films = least_squares(confidence_t, spectators, films, regularization, cg_steps)
+    return spectators, films
+
+
+def top_films(spectator_factors, film_factors, seen, top_n: int, block_cells: int = 20_000_000):
+    """
+    For every spectator, the `top_n` best scored films they have not interacted with yet,
+    as (row, films, scores), best first. Scores are computed a block of spectators at a time.
+    """
+    block = max(1, block_cells // max(film_factors.shape[0], 1))
+    for start in range(0, spectator_factors.shape[0], block):
+        scores = spectator_factors[start:start + block] @ film_factors.T
+        rows = seen[start:start + block].tocoo()
+        scores[rows.row, rows.col] = -np.inf
+        count = min(top_n, scores.shape[1])
+        best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+        for offset, columns in enumerate(best):
+            values = scores[offset, columns]
+            order = np.lexsort((columns, -values))
+            columns, values = columns[order], values[order]
+            keep = np.isfinite(values)
+            yield start + offset, columns[keep], values[keep]
+
+
+def train_recommendations(
+    top_n: int = 50, factors: int = 32, iterations: int = 15, regularization: float = 0.1, alpha: float = 5.0,
+    batch_size: int = 5000,
+) -> RecommenderRun:
+    """
+    Replace every FilmRecommendation row with the `top_n` films of each spectator who rated or
+    favorited something, from an implicit ALS factorization where a rating weighs its note and
+    a favorite FAVORITE_WEIGHT more. Returns the recorded run.
+    """
+    started_at, clock = timezone.now(), time.perf_counter()
+    rating_spectators, rating_films, notes = load_ratings()
+    favorite_spectators, favorite_films = load_favorites()
+    spectator_ids, film_ids, matrix = interaction_matrix(
+        np.concatenate([rating_spectators, favorite_spectators]),
+        np.concatenate([rating_films, favorite_films]),
+        np.concatenate([notes, np.full(len(favorite_films), FAVORITE_WEIGHT, dtype=np.float32)]),
+    )
+    interactions = len(notes) + len(favorite_films)
+    del rating_spectators, rating_films, notes, favorite_spectators, favorite_films
+
+    spectator_factors, film_factors = train(matrix, factors, iterations, regularization, alpha)
+
+    def recommendation_rows():
+        for row, columns, scores in top_films(spectator_factors, film_factors, matrix, top_n):
+            spectator_id = int(spectator_ids[row])
+            for rank, (column, score) in enumerate(zip(columns, scores), start=1):
+                yield FilmRecommendation(spectator_id=spectator_id, film_id=int(film_ids[column]), rank=rank, score=float(score))
+
+    written = 0
+    with transaction.atomic():
+        FilmRecommendation.objects.all().delete()
+        for batch in chunked(recommendation_rows(), batch_size):
+            FilmRecommendation.objects.bulk_create(batch)
+            written += len(batch)
+        return RecommenderRun.objects.create(
+            kind=IMPLICIT_ALS,
+            started_at=started_at,
+            duration=time.perf_counter() - clock,
+            peak_memory=peak_memory(),
+            films=len(film_ids),
+            ratings=interactions,
+            rows=written,
+        )
@@ -0,0 +1,176 @@
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+
+from cinema.models import Film, FilmSearchDocument, User
+from cinema.services.batching import chunked
+
+SQLITE_FTS_TABLE = "cinema_film_fts"
+# bm25 column weights of the FTS5 table: title, description, author names
+SQLITE_WEIGHTS = (10.0, 4.0, 1.0)
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _tables():
+    return {
+        "film": Film._meta.db_table,
+        "through": Film.authors.through._meta.db_table,
+        "user": User._meta.db_table,
+        "document": FilmSearchDocument._meta.db_table,
+        "fts": SQLITE_FTS_TABLE,
+    }
+
+
+POSTGRES_INDEX_SQL = """
+    INSERT INTO {document} (film_id, vector)
+    SELECT f.id,
+        setweight(to_tsvector(%s, coalesce(f.title, '')), 'A')
+        || setweight(to_tsvector(%s, coalesce(f.description, '')), 'B')
+        || setweight(to_tsvector(%s, coalesce(string_agg(u.first_name || ' ' || u.last_name, ' '), '')), 'C')
+    FROM {film} f
+    LEFT JOIN {through} fa ON fa.film_id = f.id
+    LEFT JOIN {user} u ON u.id = fa.author_id
+    WHERE f.id = ANY(%s)
+    GROUP BY f.id
+    ON CONFLICT (film_id) DO UPDATE SET vector = EXCLUDED.vector
+"""
+
+SQLITE_INDEX_SQL = """
+    INSERT INTO {fts} (rowid, title, description, authors)
+    SELECT f.id, f.title, f.description, coalesce(group_concat(u.first_name || ' ' || u.last_name, ' '), '')
+    FROM {film} f
+    LEFT JOIN {through} fa ON fa.film_id = f.id
+    LEFT JOIN {user} u ON u.id = fa.author_id
+    WHERE f.id IN ({placeholders})
+    GROUP BY f.id
+"""
+
+
+def index_films(film_ids, chunk_size: int = 500):
+    """
+    (Re)build the search entries of the given films from their title, description and author names.
+    """
+    tables = _tables()
+    config = settings.SEARCH_CONFIG
+    with connection.cursor() as cursor:
+        for chunk in chunked(film_ids, chunk_size):
+            if connection.vendor == "postgresql":
+                cursor.execute(POSTGRES_INDEX_SQL.format(**tables), [config, config, config, chunk])
+            else:
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+                cursor.execute(SQLITE_INDEX_SQL.format(placeholders=placeholders, **tables), chunk)
+
+
+def remove_films(film_ids):
+    """
+    Drop deleted films from the SQLite index (PostgreSQL documents cascade with the film).
+    """
+    if connection.vendor == "postgresql" or not film_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(film_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN ({placeholders})", list(film_ids))
+
+
+def rebuild_index() -> int:
+    film_ids = list(Film.objects.order_by("pk").values_list("pk", flat=True))
+    if connection.vendor != "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SQLITE_FTS_TABLE}")
+    index_films(film_ids)
+    return len(film_ids)
+
+
+def author_film_ids(user: User) -> list[int]:
+    return list(Film.objects.filter(authors__user=user).values_list("pk", flat=True))
+
+
+def fts_match_expression(query: str) -> str:
+    """
+    FTS5 MATCH expression: every word must match, the last one as a prefix of what the user is still typing.
+    """
+    tokens = TOKEN_RE.findall(query)
+    words = [f'"{token}"' for token in tokens[:-1]]
+    if tokens:
+        words.append(f'"{tokens[-1]}"*')
+    return " ".join(words)
+
+
+class SqliteSearchResults:
+    """
+    Lazy, sliceable ranked FTS5 results, usable by Django's Paginator like a queryset.
+    """
+
+    def __init__(self, query: str):
+        self.match = fts_match_expression(query)
+        self._count = None
+
+    def count(self) -> int:
+        if not self.match:
+            return 0
+        if self._count is None:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT count(*) FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s", [self.match])
+                self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        if not self.match:
+            return []
+        start = item.start or 0
+        limit = -1 if item.stop is None else max(item.stop - start, 0)
+        weights = ", ".join(str(weight) for weight in SQLITE_WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, bm25({SQLITE_FTS_TABLE}, {weights}) AS score FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s ORDER BY score, rowid LIMIT %s OFFSET %s",
+                [self.match, limit, start],
+            )
+            ranked = cursor.fetchall()
+        films = Film.objects.in_bulk([film_id for film_id, _ in ranked])
+        results = []
+        for film_id, score in ranked:
+            if film_id in films:
+                film = films[film_id]
+                film.search_rank = -score  # bm25 is lower for better matches
+                results.append(film)
+        return results
+
+
+def search_films(query: str):
+    """
+    Films matching `query`, best first, each with a `search_rank` attribute.
+    """
+    if connection.vendor == "postgresql":
+        search_query = SearchQuery(query, config=settings.SEARCH_CONFIG, search_type="websearch")
+        return (
+            Film.objects.filter(search_document__vector=search_query)
+            .annotate(search_rank=SearchRank(F("search_document__vector"), search_query))
+            .order_by("-search_rank", "pk")
+        )
+    return SqliteSearchResults(query)
+
+
+def filter_films(queryset, query: str):
+    """
+    Restrict a film queryset to the full-text matches of `query` (unranked, e.g. for the admin).
+    """
+    if connection.vendor == "postgresql":
+        search_query = SearchQuery(query, config=settings.SEARCH_CONFIG, search_type="websearch")
+        return queryset.filter(search_document__vector=search_query)
+    match = fts_match_expression(query)
+    if not match:
+        return queryset.none()
+    return queryset.filter(
+        pk__in=RawSQL(f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s", [match])
+    )
@@ -0,0 +1,116 @@
+import resource
+import sys
+import time
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from cinema.models import FilmRating, RecommenderRun, SimilarFilm, SimilarityKind
+from cinema.services.batching import chunked
+
+ITEM_COSINE = "item_cosine"
+
+
+def peak_memory() -> int:
+    """
+    Peak resident size of this process, in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load_ratings(chunk_size: int = 100_000):
+    """
+    Every rating as three aligned arrays (spectator ids, film ids, notes), read with a server-side cursor
+    `chunk_size` rows at a time so only the compact arrays stay in memory.
+    """
+    rows = FilmRating.objects.order_by().values_list("spectator_id", "film_id", "note")
+    spectators, films, notes = [], [], []
+    for chunk in chunked(rows.iterator(chunk_size=chunk_size), chunk_size):
+        columns = np.array(chunk, dtype=np.int64)
+        spectators.append(columns[:, 0])
+        films.append(columns[:, 1])
+        notes.append(columns[:, 2].astype(np.float32))
+    if not notes:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    return np.concatenate(spectators), np.concatenate(films), np.concatenate(notes)
+
+
+def rating_matrix(spectators, films, notes):
+    """
+    Sparse film x spectator matrix of the notes, with the film id of every row.
+    """
+    film_ids, rows = np.unique(films, return_inverse=True)
+    spectator_ids, columns = np.unique(spectators, return_inverse=True)
+    matrix = sparse.csr_matrix((notes, (rows, columns)), shape=(len(film_ids), len(spectator_ids)), dtype=np.float32)
+    return film_ids, matrix
+
+
+def normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms).dot(matrix).tocsr()
+
+
+def top_neighbours(matrix, top_k: int, chunk_size: int = 1000, rows=None):
+    """
+    For every row of `matrix` (or only `rows`), the `top_k` most cosine-similar other rows as
+    (row, neighbours, scores), best first. Similarities are computed `chunk_size` rows at a time
+    as a sparse product, so memory follows the number of overlapping pairs of a block, never the
+    full films x films matrix.
+    """
+    normalized = normalize_rows(matrix)
+    transposed = normalized.T.tocsr()
+    rows = np.arange(normalized.shape[0]) if rows is None else np.asarray(rows)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        block = normalized[chunk].dot(transposed).tocsr()
+        for offset, row in enumerate(chunk):
+            begin, end = block.indptr[offset], block.indptr[offset + 1]
+            neighbours, scores = block.indices[begin:end], block.data[begin:end]
+            keep = (neighbours != row) & (scores > 0)
+            neighbours, scores = neighbours[keep], scores[keep]
+            if len(scores) > top_k:
+                best = np.argpartition(-scores, top_k - 1)[:top_k]
+                neighbours, scores = neighbours[best], scores[best]
+            order = np.lexsort((neighbours, -scores))
+            yield row, neighbours[order], scores[order]
+
+
+def compute_similar_films(top_k: int = 20, chunk_size: int = 1000, batch_size: int = 5000) -> RecommenderRun:
+    """
+    Replace every ratings SimilarFilm row with the `top_k` nearest neighbours of each rated film,
+    by item-item cosine similarity over the film x spectator rating matrix.
+    The old rows stay readable until the new ones are committed. Returns the recorded run.
+    """
+    started_at, clock = timezone.now(), time.perf_counter()
+    spectators, films, notes = load_ratings()
+    film_ids, matrix = rating_matrix(spectators, films, notes)
+    del spectators, films
+
+    def neighbour_rows():
+        for row, neighbours, scores in top_neighbours(matrix, top_k, chunk_size):
+            film_id = int(film_ids[row])
+            for rank, (neighbour, score) in enumerate(zip(neighbours, scores), start=1):
+                yield SimilarFilm(
+                    film_id=film_id, similar_id=int(film_ids[neighbour]),
+                    kind=SimilarityKind.RATINGS, rank=rank, score=float(score),
+                )
+
+    written = 0
+    with transaction.atomic():
+        SimilarFilm.objects.filter(kind=SimilarityKind.RATINGS).delete()
+        for batch in chunked(neighbour_rows(), batch_size):
+            SimilarFilm.objects.bulk_create(batch)
+            written += len(batch)
+        return RecommenderRun.objects.create(
+            kind=ITEM_COSINE,
+            started_at=started_at,
+            duration=time.perf_counter() - clock,
+            peak_memory=peak_memory(),
+            films=len(film_ids),
+            ratings=len(notes),
+            rows=written,
+        )
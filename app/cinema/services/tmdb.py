@@ -1,54 +1,73 @@
 import json
-import requests
+
+from cinema.services.tmdb_cache import CacheMiss, TmdbCache, cache_key
+from cinema.services.transport import TmdbTransport
 
 BASE_URL = "https://api.themoviedb.org/3"
 
 
 class TmdbAPI:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        transport: TmdbTransport | None = None,
+        base_url: str = BASE_URL,
+        cache: TmdbCache | None = None,
+    ):
         self.api_key = api_key
+        self.base_url = base_url
+        self.transport = transport or TmdbTransport.from_settings()
+        self.cache = cache
         self.headers = {
             "Authorization": f"Bearer {self.api_key}"
         }
 
-    def get_popular_films(self, page: int = 1):
-        url = f"{BASE_URL}/movie/popular"
-        response = requests.get(url=url, headers=self.headers, params={"page": page})
+    def _fetch(self, path: str, params: dict | None = None, headers: dict | None = None):
+        response = self.transport.get(
+            f"{self.base_url}{path}", headers={**self.headers, **(headers or {})}, params=params
+        )
         response.raise_for_status()
+        return response
+
+    def _decode(self, response):
         try:
             data = response.json()
         except json.JSONDecodeError:
             raise Exception("Internal server error")
         return data
 
-    def get_film_details(self, film_id: str):
-        url = f"{BASE_URL}/movie/{film_id}"
-        response = requests.get(url=url, headers=self.headers)
-        response.raise_for_status()
-        try:
-            data = response.json()
-        except json.JSONDecodeError:
-            raise Exception("Internal server error")
+    def _get(self, path: str, params: dict | None = None):
+        if self.cache is None:
+            return self._decode(self._fetch(path, params))
+
+        key = cache_key(path, params)
+        cached, fresh = self.cache.get(key)
+        if cached is not None and (fresh or self.cache.offline):
+            self.cache.record("hit")
+            return cached.data
+        if self.cache.offline:
+            self.cache.record("miss")
+            raise CacheMiss(f"{key} is not in the TMDB cache")
+
+        response = self._fetch(path, params, headers=cached.validators if cached else None)
+        if cached is not None and response.status_code == 304:
+            self.cache.record("revalidated")
+            self.cache.touch(key)
+            return cached.data
+
+        self.cache.record("stale" if cached else "miss")
+        data = self._decode(response)
+        self.cache.put(key, data, etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
         return data
 
+    def get_popular_films(self, page: int = 1):
+        return self._get("/movie/popular", params={"page": page})
+
+    def get_film_details(self, film_id: str):
+        return self._get(f"/movie/{film_id}")
+
     def get_people_detail(self, person_id: str):
-        url = f"{BASE_URL}/person/{person_id}"
-        response = requests.get(url=url, headers=self.headers)
-        response.raise_for_status()
-        try:
-            data = response.json()
-        except json.JSONDecodeError:
-            raise Exception("Internal server error")
-        return data
+        return self._get(f"/person/{person_id}")
 
     def get_movie_credits(self, film_id: str):
-        url = f"{BASE_URL}/movie/{film_id}/credits"
-        response = requests.get(url=url, headers=self.headers)
-        response.raise_for_status()
-        try:
-            data = response.json()
-        except json.JSONDecodeError:
-            raise Exception("Internal server error")
-        return data
-    
-    
+        return self._get(f"/movie/{film_id}/credits")
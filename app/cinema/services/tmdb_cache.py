@@ -0,0 +1,184 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from django.conf import settings
+
+DAY = 24 * 60 * 60
+
+# Seconds a cached payload is served without asking TMDb again, per endpoint.
+DEFAULT_TTLS = {
+    "popular": DAY // 4,
+    "movie": 7 * DAY,
+    "credits": 7 * DAY,
+    "person": 30 * DAY,
+    "default": DAY,
+}
+
+ENDPOINT_PATTERNS = (
+    ("popular", re.compile(r"^/movie/popular$")),
+    ("credits", re.compile(r"^/movie/\d+/credits$")),
+    ("movie", re.compile(r"^/movie/\d+$")),
+    ("person", re.compile(r"^/person/\d+$")),
+)
+
+
+class CacheMiss(Exception):
+    """
+    Raised in cache-only mode when a payload was never fetched.
+    """
+
+
+def endpoint_of(path: str) -> str:
+    for name, pattern in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return name
+    return "default"
+
+
+def cache_key(path: str, params: dict | None = None) -> str:
+    if not params:
+        return path
+    return f"{path}?{urlencode(sorted(params.items()))}"
+
+
+@dataclass
+class CachedResponse:
+    data: dict
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    @property
+    def validators(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class TmdbCache:
+    """
+    Persistent SQLite store of TMDb payloads keyed by endpoint path and params.
+
+    Entries are fresh for their endpoint TTL, then revalidated with ETag / If-Modified-Since.
+    The store is bounded to `max_bytes`, least recently used entries are evicted first.
+    In `offline` mode nothing is fetched: stale entries are served and unknown keys raise CacheMiss.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tmdb_cache (
+            key TEXT PRIMARY KEY,
+            endpoint TEXT NOT NULL,
+            body TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS tmdb_cache_accessed_at ON tmdb_cache (accessed_at);
+    """
+
+    def __init__(self, path, max_bytes: int = 512 * 1024 * 1024, ttls: dict | None = None, offline: bool = False, clock=time.time):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.offline = offline
+        self.clock = clock
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(self.SCHEMA)
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM tmdb_cache").fetchone()[0]
+
+    @classmethod
+    def from_settings(cls, offline: bool = False):
+        return cls(
+            path=settings.TMDB_CACHE_PATH,
+            max_bytes=int(settings.TMDB_CACHE_MAX_MB * 1024 * 1024),
+            ttls=getattr(settings, "TMDB_CACHE_TTLS", None),
+            offline=offline,
+        )
+
+    def get(self, key: str) -> tuple[CachedResponse | None, bool]:
+        """
+        Return (entry, fresh). Fresh entries can be used without contacting TMDb.
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT endpoint, body, etag, last_modified, fetched_at FROM tmdb_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, False
+            now = self.clock()
+            self.db.execute("UPDATE tmdb_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        endpoint, body, etag, last_modified, fetched_at = row
+        entry = CachedResponse(json.loads(body), etag, last_modified, fetched_at)
+        return entry, now - fetched_at < self.ttls.get(endpoint, self.ttls["default"])
+
+    def put(self, key: str, data: dict, etag: str | None = None, last_modified: str | None = None):
+        body = json.dumps(data, separators=(",", ":"))
+        size = len(body)
+        now = self.clock()
+        with self.lock:
+            previous = self.db.execute("SELECT size FROM tmdb_cache WHERE key = ?", (key,)).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO tmdb_cache (key, endpoint, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint_of(key.split("?")[0]), body, etag, last_modified, now, now, size),
+            )
+            self.total_bytes += size - (previous[0] if previous else 0)
+            self.stats["stored"] += 1
+            self._evict()
+
+    def record(self, outcome: str):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def touch(self, key: str):
+        """
+        Mark an entry fresh again after a 304 Not Modified.
+        """
+        with self.lock:
+            self.db.execute("UPDATE tmdb_cache SET fetched_at = ? WHERE key = ?", (self.clock(), key))
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        rows = self.db.execute("SELECT key, size FROM tmdb_cache ORDER BY accessed_at")
+        evicted = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            evicted.append((key,))
+            self.total_bytes -= size
+        self.db.executemany("DELETE FROM tmdb_cache WHERE key = ?", evicted)
+        self.stats["evicted"] += len(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM tmdb_cache")
+            self.total_bytes = 0
+
+    def summary(self) -> str:
+        hits = self.stats["hit"] + self.stats["revalidated"]
+        lookups = hits + self.stats["miss"] + self.stats["stale"]
+        ratio = hits / lookups if lookups else 0.0
+        return (
+            f"TMDB cache: {self.stats['hit']} hits, {self.stats['revalidated']} revalidated, "
+            f"{self.stats['miss']} misses, {self.stats['stale']} refetched, {self.stats['evicted']} evicted "
+            f"({ratio:.0%} hit ratio)"
+        )
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,80 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from cinema.services.tmdb import TmdbAPI
+
+
+@dataclass
+class FilmBundle:
+    """
+    Everything needed to write one film: details, its director profile, and the error if the fetch failed.
+    """
+    tmdb_id: int
+    details: dict = field(default_factory=dict)
+    director: dict | None = None
+    error: Exception | None = None
+
+
+def find_director(credits: dict):
+    return next(
+        (member for member in credits.get("crew", []) if member.get("job") == "Director"),
+        None,
+    )
+
+
+class FilmBundleFetcher:
+    """
+    Fetch film details, credits and director profiles from TMDb with a bounded thread pool.
+
+    Workers only talk to the API, they never touch the database: bundles are yielded
+    back to the caller thread, which stays the single DB writer.
+    A director shared by several films is only fetched once.
+    """
+
+    def __init__(self, api: TmdbAPI, workers: int = 8, prefetch: int = 4):
+        self.api = api
+        self.workers = max(1, workers)
+        self.max_in_flight = self.workers * max(1, prefetch)
+        self._people: dict[int, Future] = {}
+        self._people_lock = threading.Lock()
+
+    def _get_person(self, person_id: int) -> dict:
+        with self._people_lock:
+            future = self._people.get(person_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._people[person_id] = future
+        if owner:
+            try:
+                future.set_result(self.api.get_people_detail(person_id=str(person_id)))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def fetch_bundle(self, tmdb_id: int) -> FilmBundle:
+        bundle = FilmBundle(tmdb_id=tmdb_id)
+        try:
+            bundle.details = self.api.get_film_details(film_id=str(tmdb_id))
+            credits = self.api.get_movie_credits(film_id=str(tmdb_id))
+            director_info = find_director(credits)
+            if director_info and director_info.get("id"):
+                bundle.director = self._get_person(director_info["id"])
+        except Exception as e:
+            bundle.error = e
+        return bundle
+
+    def iter_bundles(self, tmdb_ids):
+        """
+        Yield a FilmBundle for every id, in input order, keeping at most `max_in_flight` fetches pending.
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tmdb") as pool:
+            for tmdb_id in tmdb_ids:
+                pending.append(pool.submit(self.fetch_bundle, tmdb_id))
+                if len(pending) >= self.max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
@@ -0,0 +1,135 @@
+from django.core.cache import cache
+from django.db.models.functions import Now
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from cinema.authentication import user_cache_key
+from cinema.caching import invalidate
+from cinema.models import Author, Film, FilmRating, Roles, Spectator, User
+from cinema.services import search
+from cinema.services.autocomplete import AUTHOR, FILM, autocomplete
+from cinema.services.leaderboard import refresh_film_ranking, sync_film_ranking_attributes
+from cinema.services.ratings import apply_rating_delta
+
+
+# Film rating aggregates, for ratings saved one by one (admin, plain ORM).
+# services.ratings writes with bulk upserts, which fire no signal, and applies the deltas itself.
+@receiver(pre_save, sender=FilmRating)
+def remember_previous_rating(sender, instance, **kwargs):
+    instance._previous_rating = None
+    if instance.pk is not None:
+        instance._previous_rating = FilmRating.objects.filter(pk=instance.pk).values_list("film_id", "note").first()
+
+
+@receiver(post_save, sender=FilmRating)
+def apply_rating_to_film_aggregates(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_rating", None)
+    if previous is not None and previous[0] != instance.film_id:
+        apply_rating_delta(previous[0], -1, -previous[1])
+        refresh_film_ranking(previous[0])
+        previous = None
+    if previous is None:
+        apply_rating_delta(instance.film_id, 1, instance.note)
+    elif previous[1] != instance.note:
+        apply_rating_delta(instance.film_id, 0, instance.note - previous[1])
+    else:
+        return
+    refresh_film_ranking(instance.film_id)
+
+
+@receiver(post_delete, sender=FilmRating)
+def remove_rating_from_film_aggregates(sender, instance, **kwargs):
+    apply_rating_delta(instance.film_id, -1, -instance.note)
+    refresh_film_ranking(instance.film_id)
+
+
+@receiver(post_save, sender=Film)
+def update_film_ranking(sender, instance, created, **kwargs):
+    if not created:
+        sync_film_ranking_attributes(instance)
+
+
+# Full-text search index
+@receiver(post_save, sender=Film)
+def index_film(sender, instance, **kwargs):
+    search.index_films([instance.pk])
+
+
+@receiver(post_delete, sender=Film)
+def unindex_film(sender, instance, **kwargs):
+    search.remove_films([instance.pk])
+
+
+@receiver(m2m_changed, sender=Film.authors.through)
+def index_film_authors(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        search.index_films([instance.pk])
+    elif pk_set:
+        search.index_films(sorted(pk_set))
+
+
+@receiver(post_save, sender=User)
+def index_author_name(sender, instance, created, **kwargs):
+    if not created and instance.role == Roles.Author:
+        search.index_films(search.author_film_ids(instance))
+
+
+# Autocomplete prefix index
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+def refresh_film_suggestion(sender, instance, **kwargs):
+    autocomplete.schedule_refresh(FILM, [instance.pk])
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def refresh_author_suggestion(sender, instance, **kwargs):
+    autocomplete.schedule_refresh(AUTHOR, [instance.pk])
+
+
+@receiver(post_save, sender=User)
+def refresh_author_name_suggestion(sender, instance, created, **kwargs):
+    if not created and instance.role == Roles.Author:
+        autocomplete.schedule_refresh(AUTHOR, [instance.pk])
+
+
+# Response cache: a write moves the generation of its model forward
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=User)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate(sender)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_responses(sender, update_fields=None, **kwargs):
+    # logins only touch last_login, which no cached response shows
+    if update_fields is None or set(update_fields) != {"last_login"}:
+        invalidate(User)
+
+
+@receiver(m2m_changed, sender=Film.authors.through)
+def invalidate_cached_film_author_responses(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # the author list is part of the film, move its Last-Modified too
+    films = Film.objects.filter(pk=instance.pk) if not reverse else Film.objects.filter(pk__in=pk_set or ())
+    films.update(updated_at=Now())
+    invalidate(Film, Author)
+
+
+# Users cached by StatelessJWTAuthentication
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
+
+
+@receiver(post_save, sender=Spectator)
+@receiver(post_delete, sender=Spectator)
+def forget_cached_spectator_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.user_id))
@@ -0,0 +1,18 @@
+import pytest
+from django.core.cache import cache
+
+from cinema.models import Roles, Spectator, User
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # cached responses and counters must not leak from one test to the next
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def spectator():
+    user = User.objects.create_user(email="s@example.com", username="s", password="x", role=Roles.SPECTATOR)
+    return Spectator.objects.create(user=user)
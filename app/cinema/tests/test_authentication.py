@@ -0,0 +1,87 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from cinema.models import Film, Roles, User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def access(spectator):
+    return APIClient().post(reverse("cinema:login_spectator"), {"email": "s@example.com", "password": "x"}).data["access"]
+
+
+@pytest.fixture
+def client(access):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    return client
+
+
+def user_queries(context) -> int:
+    return sum(User._meta.db_table in query["sql"] for query in context.captured_queries)
+
+
+def test_tokens_carry_the_claims(access, spectator):
+    token = AccessToken(access)
+    assert (token["role"], token["spectator_id"], token["is_staff"]) == (Roles.SPECTATOR, spectator.pk, False)
+
+
+def test_refresh_reissues_the_claims(spectator):
+    refresh = APIClient().post(reverse("cinema:login_spectator"), {"email": "s@example.com", "password": "x"}).data["refresh"]
+    User.objects.filter(pk=spectator.pk).update(role=Roles.Author, is_staff=True)
+    spectator.delete()
+
+    response = APIClient().post(reverse("cinema:jwt-refresh"), {"refresh": refresh})
+    assert response.status_code == 200
+    token = AccessToken(response.data["access"])
+    assert (token["role"], token["spectator_id"], token["is_staff"]) == (Roles.Author, None, True)
+
+
+def test_reads_do_not_load_the_user(client, spectator, django_assert_num_queries):
+    film = Film.objects.create(title="Heat")
+    spectator.favorite_films.add(film)
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse("cinema:my-favorite-films"))
+    assert [film["title"] for film in response.data] == ["Heat"]
+
+    with CaptureQueriesContext(connection) as context:
+        assert client.get(reverse("cinema:my-recommendations")).status_code == 200
+        assert client.get(reverse("cinema:list-movies")).data["results"][0]["is_favorite"] is True
+    assert user_queries(context) == 0
+
+
+def test_writes_load_the_user_once_per_ttl(client, spectator, settings):
+    settings.JWT_USER_CACHE_TTL = 60
+    film = Film.objects.create(title="Heat")
+    url = reverse("cinema:rate-film", args=[film.pk])
+
+    with CaptureQueriesContext(connection) as context:
+        assert client.post(url, {"note": 4}).status_code == 200
+    assert user_queries(context) == 1
+    with CaptureQueriesContext(connection) as context:
+        assert client.post(url, {"note": 5}).status_code == 200
+    assert user_queries(context) == 0
+
+
+def test_deactivated_users_cannot_write(client, spectator):
+    film = Film.objects.create(title="Heat")
+    assert client.post(reverse("cinema:rate-film", args=[film.pk]), {"note": 4}).status_code == 200
+
+    spectator.user.is_active = False
+    spectator.user.save()
+    assert client.post(reverse("cinema:rate-film", args=[film.pk]), {"note": 4}).status_code == 401
+
+
+def test_tokens_without_the_claims_still_work(spectator):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(spectator.user)}")
+
+    with CaptureQueriesContext(connection) as context:
+        assert client.get(reverse("cinema:my-recommendations")).status_code == 200
+    assert user_queries(context) == 1
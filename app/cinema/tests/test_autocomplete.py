@@ -0,0 +1,121 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Author, Film, Roles, User
+from cinema.services.autocomplete import FILM, PrefixIndex, Suggestion, autocomplete, prefix_keys
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(settings):
+    settings.AUTOCOMPLETE_BUILD_IN_BACKGROUND = False
+    autocomplete.reset()
+    yield
+    autocomplete.reset()
+
+
+def make_author(first_name, last_name, popularity):
+    user = User.objects.create_user(
+        email=f"{first_name}@example.com", username=first_name, password="x",
+        first_name=first_name, last_name=last_name, role=Roles.Author,
+    )
+    return Author.objects.create(user=user, popularity=popularity)
+
+
+def suggest(q, **params):
+    response = APIClient().get(reverse("cinema:autocomplete"), {"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_prefix_keys_start_at_every_word():
+    assert prefix_keys("Le Fabuleux Destin d'Amélie") == {
+        "le fabuleux destin d'amelie", "fabuleux destin d'amelie", "destin d'amelie", "d'amelie",
+    }
+
+
+def test_index_returns_the_heaviest_matches():
+    index = PrefixIndex()
+    index.load([
+        Suggestion(FILM, 1, "The Matrix", 10),
+        Suggestion(FILM, 2, "The Matrix Reloaded", 50),
+        Suggestion(FILM, 3, "Matilda", 30),
+        Suggestion(FILM, 4, "Heat", 99),
+    ])
+
+    assert [s.id for s in index.search("MAT", 2)] == [2, 3]
+    assert [s.id for s in index.search("the matrix r", 10)] == [2]
+
+    index.add(Suggestion(FILM, 1, "The Matrix", 100))
+    index.remove(3)
+    assert [s.id for s in index.search("mat", 10)] == [1, 2]
+    assert index.search("", 10) == []
+
+
+def test_cold_start_answers_from_the_database(settings):
+    settings.AUTOCOMPLETE_BUILD_IN_BACKGROUND = True
+    Film.objects.create(title="Alien")
+    Film.objects.create(title="The Alienist")
+    autocomplete.building = True  # a background build is already running
+
+    data = suggest("alien")
+
+    assert sorted(film["title"] for film in data["films"]) == ["Alien", "The Alienist"]
+    assert autocomplete.built_at is None
+
+
+def test_endpoint_serves_films_and_authors_from_the_index():
+    Film.objects.create(title="Alien", rating_count=3)
+    Film.objects.create(title="Aliens", rating_count=8)
+    make_author("Alfred", "Hitchcock", popularity=40.0)
+    make_author("Ridley", "Scott", popularity=20.0)
+
+    data = suggest("al")
+
+    assert autocomplete.built_at is not None
+    assert [film["title"] for film in data["films"]] == ["Aliens", "Alien"]
+    assert [author["name"] for author in data["authors"]] == ["Alfred Hitchcock"]
+    assert suggest("sco")["authors"][0]["name"] == "Ridley Scott"
+    assert len(suggest("al", limit=1)["films"]) == 1
+
+
+def test_index_follows_committed_changes(django_capture_on_commit_callbacks):
+    film = Film.objects.create(title="Solaris")
+    author = make_author("Andrei", "Tarkovsky", popularity=10.0)
+    suggest("s")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        film.title = "Stalker"
+        film.save()
+        author.user.last_name = "Tarkovski"
+        author.user.save()
+        Film.objects.create(title="Solyaris")
+
+    assert [f["title"] for f in suggest("sol")["films"]] == ["Solyaris"]
+    assert [f["title"] for f in suggest("stal")["films"]] == ["Stalker"]
+    assert [a["name"] for a in suggest("tarkovski")["authors"]] == ["Andrei Tarkovski"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        film.delete()
+    assert suggest("stal")["films"] == []
+
+
+def test_common_prefixes_are_answered_from_their_kept_top(monkeypatch):
+    index = PrefixIndex()
+    monkeypatch.setattr(index, "top_size", 3)
+    index.load([Suggestion(FILM, pk, f"The Film {pk}", pk) for pk in range(1, 101)])
+    assert [s.id for s in index.search("the", 3)] == [100, 99, 98]
+
+    scans = []
+    monkeypatch.setattr("cinema.services.autocomplete.bisect_left", lambda *args: scans.append(args) or 0)
+    assert [s.id for s in index.search("the", 2)] == [100, 99]
+    assert not scans
+
+    monkeypatch.undo()
+    monkeypatch.setattr(index, "top_size", 3)
+    index.add(Suggestion(FILM, 200, "The Film 200", 200))
+    index.remove(99)
+    assert [s.id for s in index.search("the f", 3)] == [200, 100, 98]
+    assert [s.id for s in index.search("the", 3)] == [200, 100, 98]
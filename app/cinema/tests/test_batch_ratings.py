@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Film, FilmRanking, FilmRating, Roles, User
+from cinema.services.ratings import drifted_films, rate_film
+
+pytestmark = pytest.mark.django_db
+
+
+def rate_batch(spectator, items):
+    client = APIClient()
+    client.force_authenticate(spectator.user)
+    return client.post(reverse("cinema:rate-films-batch"), items, format="json")
+
+
+def test_batch_creates_and_updates_ratings(spectator):
+    changed, same, new = (Film.objects.create(title=title) for title in ("Changed", "Same", "New"))
+    rate_film(spectator, changed, 2)
+    rate_film(spectator, same, 3)
+
+    response = rate_batch(spectator, [
+        {"film_id": changed.pk, "note": 5},
+        {"film_id": same.pk, "note": 3},
+        {"film_id": new.pk, "note": 1},
+        {"film_id": new.pk, "note": 4},
+    ])
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 1, "updated": 1, "unchanged": 1}
+    assert dict(FilmRating.objects.values_list("film_id", "note")) == {changed.pk: 5, same.pk: 3, new.pk: 4}
+    assert not drifted_films().exists()
+    new.refresh_from_db()
+    assert (new.rating_count, new.rating_sum, new.rating_avg) == (1, 4, 4.0)
+    assert FilmRanking.objects.get(film=changed).rating_avg == 5.0
+    assert FilmRanking.objects.filter(film=new).exists()
+
+
+def test_query_count_does_not_grow_with_the_batch(spectator):
+    films = Film.objects.bulk_create(Film(title=f"Film {i}") for i in range(80))
+
+    def queries(batch):
+        with CaptureQueriesContext(connection) as captured:
+            assert rate_batch(spectator, [{"film_id": film.pk, "note": 3} for film in batch]).status_code == 200
+        return len(captured)
+
+    queries(films[:1])  # warms the cached global mean of the leaderboard
+    assert queries(films[1:3]) == queries(films[3:80])
+    assert FilmRating.objects.count() == 80
+
+
+@pytest.mark.parametrize("items", [
+    [],
+    [{"film_id": 1, "note": 6}],
+    [{"note": 3}],
+    {"film_id": 1, "note": 3},
+])
+def test_invalid_batches_are_rejected(spectator, items):
+    Film.objects.create(pk=1, title="Heat")
+    assert rate_batch(spectator, items).status_code == 400
+    assert not FilmRating.objects.exists()
+
+
+@pytest.mark.parametrize("role", [Roles.Author, Roles.SPECTATOR])
+def test_only_spectators_can_rate(role):
+    # an author, or a spectator-role user without a profile (e.g. a superuser)
+    film = Film.objects.create(title="Heat")
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(email="a@example.com", username="a", password="x", role=role))
+    assert client.post(reverse("cinema:rate-films-batch"), [{"film_id": film.pk, "note": 3}], format="json").status_code == 403
+    assert not FilmRating.objects.exists()
+
+
+def test_unknown_films_reject_the_whole_batch(spectator):
+    film = Film.objects.create(title="Heat")
+
+    response = rate_batch(spectator, [{"film_id": film.pk, "note": 3}, {"film_id": 999, "note": 3}])
+
+    assert response.status_code == 400
+    assert "999" in response.json()["film_id"][0]
+    assert not FilmRating.objects.exists()
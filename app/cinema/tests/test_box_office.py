@@ -0,0 +1,99 @@
+import datetime as dt
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Author, BoxOfficeRollup, Film, FilmStatus, Roles, User
+from cinema.services import box_office
+from cinema.services.importer import FilmImporter
+
+pytestmark = pytest.mark.django_db
+
+
+def film_payload(tmdb_id, year=2020, budget=10, revenue=20):
+    return {
+        "id": tmdb_id, "title": f"Film {tmdb_id}", "overview": "desc",
+        "release_date": f"{year}-05-01", "budget": budget, "revenue": revenue,
+    }
+
+
+def person_payload(tmdb_id):
+    return {"id": tmdb_id, "name": "Kathryn Bigelow", "popularity": 3.5}
+
+
+def rollup(dimension, key):
+    return BoxOfficeRollup.objects.get(dimension=dimension, key=key)
+
+
+def test_percentile_matches_linear_interpolation():
+    assert box_office.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert box_office.percentile([1.0, 2.0, 3.0, 4.0], 90) == pytest.approx(3.7)
+    assert box_office.percentile([5.0], 25) == 5.0
+    assert box_office.percentile([], 50) is None
+
+
+def test_rebuild_aggregates_known_amounts_only():
+    day = dt.date(1995, 1, 1)
+    Film.objects.create(title="Heat", release_date=day, budget=60, revenue=180)
+    Film.objects.create(title="Ronin", release_date=day, budget=50, revenue=50)
+    Film.objects.create(title="Draft", release_date=day, budget=0, revenue=None, statut=FilmStatus.DRAFT)
+    Film.objects.create(title="Undated", budget=10, revenue=40)
+
+    assert box_office.rebuild() == 3
+
+    year = rollup("year", "1995")
+    assert (year.films, year.budget_count, year.budget_sum, year.budget_avg) == (3, 2, 110, 55)
+    assert (year.revenue_count, year.revenue_sum, year.roi_count) == (2, 230, 2)
+    assert (year.roi_p25, year.roi_median, year.roi_p90) == (0.5, 1.0, pytest.approx(1.8))
+    released = rollup("status", "RELEASED")
+    assert (released.label, released.films, released.roi_median) == ("Released", 3, 2.0)
+    assert rollup("status", "DRAFT").roi_median is None
+
+
+def test_imports_refresh_only_the_groups_they_touched():
+    importer = FilmImporter(batch_size=2)
+    importer.import_films([(film_payload(1, year=2001), person_payload(7)), (film_payload(2, year=2002), None)])
+    assert box_office.refresh_stale() == 4  # two years, one status, one director
+    director = Author.objects.get(tmdb_id=7)
+    assert rollup("director", str(director.pk)).label == "Kathryn Bigelow"
+    untouched = rollup("year", "2002").updated_at
+
+    importer.import_films([(film_payload(1, year=2003, budget=10, revenue=50), person_payload(7))])
+    assert BoxOfficeRollup.objects.filter(stale=True).count() == 4
+    assert box_office.refresh_stale() == 4
+
+    assert not BoxOfficeRollup.objects.filter(dimension="year", key="2001").exists()
+    assert rollup("year", "2003").roi_median == 4.0
+    assert rollup("year", "2002").updated_at == untouched
+    assert rollup("status", "RELEASED").films == 2
+    assert box_office.refresh_stale() == 0
+
+
+def test_box_office_endpoint_reads_the_rollups(django_assert_num_queries):
+    for key, films, revenue in (("1999", 3, 300), ("2001", 1, 900), ("2000", 2, 100)):
+        BoxOfficeRollup.objects.create(dimension="year", key=key, label=key, films=films, revenue_sum=revenue)
+    user = User.objects.create_user(email="d@example.com", username="d", password="x", role=Roles.Author)
+    BoxOfficeRollup.objects.create(dimension="director", key=str(Author.objects.create(user=user).pk), films=1)
+    url = reverse("cinema:box-office")
+    client = APIClient()
+
+    with django_assert_num_queries(1):
+        response = client.get(url)
+    assert [row["key"] for row in response.data] == ["1999", "2000", "2001"]
+    assert [row["key"] for row in client.get(url, {"ordering": "-revenue_sum", "limit": 2}).data] == ["2001", "1999"]
+    assert len(client.get(url, {"dimension": "director"}).data) == 1
+    assert client.get(url, {"key": "2000"}).data[0]["films"] == 2
+    assert client.get(url, {"dimension": "genre"}).status_code == 400
+    assert client.get(url, {"ordering": "title"}).status_code == 400
+
+
+def test_box_office_endpoint_hides_uncomputed_groups_and_sorts_missing_roi_last():
+    BoxOfficeRollup.objects.create(dimension="year", key="1999", films=2, roi_median=None)
+    BoxOfficeRollup.objects.create(dimension="year", key="2000", films=1, roi_median=0.5)
+    BoxOfficeRollup.objects.create(dimension="year", key="2001", films=3, roi_median=2.0)
+    box_office.mark_stale({("year", "2002")})
+    client = APIClient()
+
+    response = client.get(reverse("cinema:box-office"), {"ordering": "-roi_median"})
+    assert [row["key"] for row in response.data] == ["2001", "2000", "1999"]
@@ -0,0 +1,129 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from cinema.caching import bump_generation, generations, invalidate
+from cinema.models import Author, Film, Roles, Spectator, User
+from cinema.services.ratings import rate_film
+from cinema.views.films import FilmDetailUpdateView
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin_api():
+    admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+def make_author(username):
+    user = User.objects.create_user(
+        email=f"{username}@example.com", username=username, password="x",
+        first_name=username.title(), last_name="Doe", role=Roles.Author,
+    )
+    return Author.objects.create(user=user)
+
+
+def get(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response
+
+
+def test_film_list_is_served_from_cache_until_a_film_changes():
+    client = APIClient()
+    url = reverse("cinema:list-movies")
+    film = Film.objects.create(title="Heat")
+
+    assert get(client, url)["X-Cache"] == "MISS"
+    assert get(client, url)["X-Cache"] == "HIT"
+
+    film.title = "Heat (1995)"
+    film.save()
+    response = get(client, url)
+    assert response["X-Cache"] == "MISS"
+    assert response.json()["results"][0]["title"] == "Heat (1995)"
+
+
+def test_ratings_invalidate_the_film_list():
+    client = APIClient()
+    url = reverse("cinema:list-movies")
+    film = Film.objects.create(title="Heat")
+    user = User.objects.create_user(email="s@example.com", username="s", password="x", role=Roles.SPECTATOR)
+    get(client, url)
+
+    rate_film(Spectator.objects.create(user=user), film, 4)
+
+    response = get(client, url)
+    assert response["X-Cache"] == "MISS"
+    assert response.json()["results"][0]["rating_count"] == 1
+
+
+def test_author_list_follows_user_edits_but_not_logins():
+    client = APIClient()
+    url = reverse("cinema:list-authors")
+    author = make_author("jane")
+    get(client, url)
+
+    author.user.save(update_fields=["last_login"])
+    assert get(client, url)["X-Cache"] == "HIT"
+
+    author.user.last_name = "Smith"
+    author.user.save()
+    response = get(client, url)
+    assert response["X-Cache"] == "MISS"
+    assert response.json()["results"][0]["user"]["last_name"] == "Smith"
+
+
+def get_detail(film, user=None):
+    # films/<int:pk>/ is shadowed by films/<int:year>/ in the URLconf, call the view directly
+    request = APIRequestFactory().get(f"/api/films/{film.pk}/")
+    if user is not None:
+        force_authenticate(request, user)
+    return FilmDetailUpdateView.as_view()(request, pk=film.pk)
+
+
+def test_film_detail_follows_author_links(admin_api):
+    admin = User.objects.get(username="admin")
+    film = Film.objects.create(title="Heat")
+    assert get_detail(film, admin).data["authors"] == []
+    assert get_detail(film, admin)["X-Cache"] == "HIT"
+
+    film.authors.add(make_author("michael"))
+
+    response = get_detail(film, admin)
+    assert response["X-Cache"] == "MISS"
+    assert len(response.data["authors"]) == 1
+
+
+def test_permissions_are_checked_before_the_cache(admin_api):
+    film = Film.objects.create(title="Heat")
+    get_detail(film, User.objects.get(username="admin"))
+
+    assert get_detail(film).status_code == 401
+
+
+def test_invalidation_bumps_again_on_commit(django_capture_on_commit_callbacks):
+    bump_generation(Film)
+    [before] = generations([Film])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate(Film)
+        assert generations([Film]) == [before + 1]
+
+    assert generations([Film]) == [before + 2]
+
+
+def test_stats_report_the_hit_ratio(admin_api):
+    client = APIClient()
+    Film.objects.create(title="Heat")
+    for _ in range(3):
+        get(client, reverse("cinema:list-movies"))
+
+    stats = get(admin_api, reverse("cinema:cache-stats")).json()
+
+    assert stats["views"]["FilmAPI"] == {"hits": 2, "misses": 1, "hit_ratio": pytest.approx(2 / 3)}
+    assert stats["hits"] == 2
+    assert APIClient().get(reverse("cinema:cache-stats")).status_code == 401
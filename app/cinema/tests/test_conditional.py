@@ -0,0 +1,127 @@
+import datetime as dt
+
+import pytest
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from cinema.models import Author, Film, Roles, Spectator, User
+from cinema.services.ratings import rate_film
+from cinema.views.films import FilmDetailUpdateView
+
+pytestmark = pytest.mark.django_db
+
+
+def make_author(username):
+    user = User.objects.create_user(
+        email=f"{username}@example.com", username=username, password="x",
+        first_name=username.title(), last_name="Doe", role=Roles.Author,
+    )
+    return Author.objects.create(user=user)
+
+
+def test_film_list_answers_304_without_a_query(django_assert_num_queries):
+    client = APIClient()
+    url = reverse("cinema:list-movies")
+    Film.objects.create(title="Heat")
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first["ETag"].startswith('"')
+
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert response.status_code == 304
+    assert response["ETag"] == first["ETag"]
+    assert not response.content
+
+    # nor does a response cache hit
+    with django_assert_num_queries(0):
+        assert client.get(url)["X-Cache"] == "HIT"
+
+
+def test_etag_changes_with_edits_deletions_and_pages():
+    client = APIClient()
+    url = reverse("cinema:list-movies")
+    heat = Film.objects.create(title="Heat")
+    Film.objects.create(title="Ronin")
+    etag = client.get(url)["ETag"]
+
+    assert client.get(url, {"page_size": 1})["ETag"] != etag
+
+    heat.title = "Heat (1995)"
+    heat.save()
+    edited = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert edited.status_code == 200
+
+    heat.delete()
+    assert client.get(url, HTTP_IF_NONE_MATCH=edited["ETag"]).status_code == 200
+
+
+def film_detail(film, **headers):
+    # films/<int:pk>/ is shadowed by films/<int:year>/ in the URLconf, call the view directly
+    admin = User.objects.get_or_create(username="admin", email="admin@example.com", is_staff=True)[0]
+    request = APIRequestFactory().get(f"/api/films/{film.pk}/", **headers)
+    force_authenticate(request, admin)
+    return FilmDetailUpdateView.as_view()(request, pk=film.pk)
+
+
+def test_if_modified_since():
+    film = Film.objects.create(title="Heat")
+    last_modified = film.updated_at.timestamp()
+
+    assert film_detail(film)["Last-Modified"] == http_date(int(last_modified))
+    assert film_detail(film, HTTP_IF_MODIFIED_SINCE=http_date(last_modified + 60)).status_code == 304
+    assert film_detail(film, HTTP_IF_MODIFIED_SINCE=http_date(last_modified - 60)).status_code == 200
+
+
+def test_lists_are_not_validated_by_date_after_a_deletion():
+    client = APIClient()
+    url = reverse("cinema:list-movies")
+    heat = Film.objects.create(title="Heat")
+    Film.objects.create(title="Ronin")
+    assert "Last-Modified" not in client.get(url)
+
+    heat.delete()
+    since = http_date(Film.objects.get().updated_at.timestamp() + 60)
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code == 200
+
+
+def test_ratings_move_the_film_validators():
+    client = APIClient()
+    url = reverse("cinema:list-movies")
+    film = Film.objects.create(title="Heat")
+    Film.objects.filter(pk=film.pk).update(updated_at=film.updated_at - dt.timedelta(days=1))
+    etag = client.get(url)["ETag"]
+    user = User.objects.create_user(email="s@example.com", username="s", password="x", role=Roles.SPECTATOR)
+
+    rate_film(Spectator.objects.create(user=user), film, 5)
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_author_list_follows_author_and_user_edits():
+    client = APIClient()
+    url = reverse("cinema:list-authors")
+    author = make_author("jane")
+    Author.objects.update(updated_at=author.updated_at - dt.timedelta(days=1))
+    User.objects.update(updated_at=author.updated_at - dt.timedelta(days=1))
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    author.refresh_from_db()
+    author.popularity = 12.5
+    author.save()
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_film_detail_follows_author_links():
+    film = Film.objects.create(title="Heat")
+    Film.objects.filter(pk=film.pk).update(updated_at=film.updated_at - dt.timedelta(days=1))
+
+    etag = film_detail(film)["ETag"]
+    assert film_detail(film, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    film.authors.add(make_author("michael"))
+
+    assert film_detail(film, HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Author, Film, Roles, User
+from cinema.serializers.film_serializer import FilmSerializer
+from cinema.services.export import iter_catalog
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog():
+    user = User.objects.create_user(
+        email="jeunet@example.com", username="jeunet", password="x",
+        first_name="Jean-Pierre", last_name="Jeunet", role=Roles.Author,
+    )
+    director = Author.objects.create(user=user, tmdb_id=42)
+    films = [Film.objects.create(title=title, tmdb_id=i) for i, title in enumerate(["Amélie", "Delicatessen", "Alien 4"])]
+    films[0].authors.add(director)
+    films[1].authors.add(director)
+    return films
+
+
+@pytest.fixture
+def admin_api():
+    admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+def test_catalog_is_read_in_chunks(catalog, django_assert_num_queries):
+    with django_assert_num_queries(3):  # the films cursor, then the authors of each chunk of 2
+        chunks = list(iter_catalog(chunk_size=2))
+
+    assert [len(rows) for rows in chunks] == [2, 1]
+    first = chunks[0][0]
+    assert {key: value for key, value in first.items() if key != "authors"} == FilmSerializer(catalog[0]).data
+    assert first["authors"] == [{"id": catalog[0].authors.get().pk, "name": "Jean-Pierre Jeunet", "tmdb_id": 42}]
+    assert chunks[1][0]["authors"] == []
+
+
+def test_command_writes_ndjson(catalog, tmp_path):
+    output = tmp_path / "films.ndjson"
+    call_command("export_catalog", "--output", str(output), "--chunk-size", "2", stdout=io.StringIO())
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["title"] for row in rows] == ["Amélie", "Delicatessen", "Alien 4"]
+
+
+def test_command_writes_csv_to_stdout(catalog):
+    out = io.StringIO()
+    call_command("export_catalog", "--format", "csv", stdout=out)
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row["title"] for row in rows] == ["Amélie", "Delicatessen", "Alien 4"]
+    assert rows[0]["authors"] == "Jean-Pierre Jeunet"
+
+
+def test_endpoint_streams_json(catalog, admin_api):
+    response = admin_api.get(reverse("cinema:export-films", args=["json"]), HTTP_ACCEPT="application/x-ndjson")
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/json"
+    assert len(json.loads(b"".join(response.streaming_content))) == 3
+
+
+def test_empty_catalog_exports(admin_api):
+    response = admin_api.get(reverse("cinema:export-films", args=["json"]))
+    assert json.loads(b"".join(response.streaming_content)) == []
+    response = admin_api.get(reverse("cinema:export-films", args=["csv"]))
+    assert b"".join(response.streaming_content).startswith(b"id,title,")
+
+
+def test_endpoint_is_admin_only_and_checks_the_format(admin_api):
+    assert APIClient().get(reverse("cinema:export-films", args=["ndjson"])).status_code == 401
+    assert admin_api.get(reverse("cinema:export-films", args=["xml"])).status_code == 404
@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Author, Film, Roles, User
+from cinema.services import favorites
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client(spectator):
+    client = APIClient()
+    client.force_authenticate(spectator.user)
+    return client
+
+
+def bulk(client, **data):
+    return client.post(reverse("cinema:bulk-favorites"), data, format="json")
+
+
+def test_bulk_add_and_remove_report_each_id(client, spectator):
+    kept, dropped, new = (Film.objects.create(title=title) for title in ("Kept", "Dropped", "New"))
+    spectator.favorite_films.add(kept, dropped)
+    user = User.objects.create_user(email="a@example.com", username="a", password="x", role=Roles.Author)
+    author = Author.objects.create(user=user)
+
+    response = bulk(
+        client,
+        add_films=[new.pk, kept.pk, 999, new.pk],
+        remove_films=[dropped.pk, 998],
+        add_authors=[author.pk],
+    )
+
+    assert response.status_code == 200
+    assert response.json()["films"] == [
+        {"id": new.pk, "action": "add", "result": "added"},
+        {"id": kept.pk, "action": "add", "result": "already_favorite"},
+        {"id": 999, "action": "add", "result": "not_found"},
+        {"id": dropped.pk, "action": "remove", "result": "removed"},
+        {"id": 998, "action": "remove", "result": "not_found"},
+    ]
+    assert response.json()["authors"] == [{"id": author.pk, "action": "add", "result": "added"}]
+    assert set(spectator.favorite_films.all()) == {kept, new}
+    assert list(spectator.favorite_authors.all()) == [author]
+
+
+def test_removing_a_film_that_is_not_a_favorite(client):
+    film = Film.objects.create(title="Heat")
+    assert bulk(client, remove_films=[film.pk]).json()["films"] == [
+        {"id": film.pk, "action": "remove", "result": "not_favorite"},
+    ]
+
+
+def test_query_count_does_not_grow_with_the_number_of_ids(client, spectator):
+    films = Film.objects.bulk_create(Film(title=f"Film {i}") for i in range(60))
+    spectator.favorite_films.add(*films[:10])
+
+    def queries(add, remove):
+        with CaptureQueriesContext(connection) as captured:
+            assert bulk(client, add_films=add, remove_films=remove).status_code == 200
+        return len(captured)
+
+    few = queries([films[10].pk], [films[0].pk])
+    many = queries([film.pk for film in films[20:60]], [film.pk for film in films[1:10]])
+    assert many == few
+    assert spectator.favorite_films.count() == 41
+
+
+@pytest.mark.parametrize("data", [{}, {"add_films": [1], "remove_films": [1]}, {"add_films": ["x"]}])
+def test_invalid_requests(client, data):
+    assert bulk(client, **data).status_code == 400
+
+
+def test_requires_authentication():
+    assert APIClient().post(reverse("cinema:bulk-favorites"), {}, format="json").status_code == 401
+
+
+def test_requires_a_spectator():
+    client = APIClient()
+    client.force_authenticate(User.objects.create_superuser(email="a@example.com", username="a", password="x"))
+    assert client.post(reverse("cinema:bulk-favorites"), {"add_films": [1]}, format="json").status_code == 403
+
+
+def test_films_and_authors_are_applied_together(client, spectator, monkeypatch):
+    film = Film.objects.create(title="Heat")
+    real = favorites.update_favorites
+
+    def fail_on_authors(spectator, relation, add, remove):
+        if relation == "favorite_authors":
+            raise RuntimeError
+        return real(spectator, relation, add, remove)
+
+    monkeypatch.setattr(favorites, "update_favorites", fail_on_authors)
+    client.raise_request_exception = False
+    assert bulk(client, add_films=[film.pk], add_authors=[1]).status_code == 500
+    assert not spectator.favorite_films.exists()
@@ -0,0 +1,112 @@
+import gzip
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from cinema.models import Author, Film
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def journal_dir(settings, tmp_path):
+    settings.IMPORT_JOURNAL_DIR = tmp_path / "journal"
+
+
+def write_dump(path, records, compress=False):
+    text = "\n".join(r if isinstance(r, str) else json.dumps(r) for r in records) + "\n"
+    if compress:
+        with gzip.open(path, "wt") as f:
+            f.write(text)
+    else:
+        path.write_text(text)
+    return str(path)
+
+
+def run(*args):
+    out = StringIO()
+    call_command("import_dump", *args, stdout=out, stderr=StringIO())
+    return out.getvalue()
+
+
+def test_imports_gzipped_movie_export(tmp_path):
+    records = [
+        {"adult": False, "id": i, "original_title": f"Film {i}", "popularity": 1.0, "video": False}
+        for i in range(1, 8)
+    ]
+    path = write_dump(tmp_path / "movie_ids.json.gz", records + ["{not json"], compress=True)
+
+    output = run(path, "--batch-size", "3")
+
+    assert Film.objects.count() == 7
+    assert Film.objects.get(tmdb_id=4).title == "Film 4"
+    assert "7 movie records" in output
+
+
+def test_sparse_records_do_not_blank_existing_data(tmp_path):
+    Film.objects.create(tmdb_id=1, title="Old", description="Kept", budget=5)
+    path = write_dump(tmp_path / "movies.json", [{"id": 1, "original_title": "New"}])
+
+    run(path)
+
+    film = Film.objects.get(tmdb_id=1)
+    assert (film.title, film.description, film.budget) == ("New", "Kept", 5)
+
+
+def test_enriched_movies_link_their_director(tmp_path):
+    record = {
+        "id": 10,
+        "title": "Pan's Labyrinth",
+        "overview": "desc",
+        "credits": {"crew": [{"job": "Director", "id": 99, "name": "Guillermo del Toro"}]},
+    }
+    path = write_dump(tmp_path / "movies.json", [record])
+
+    run(path)
+
+    assert Film.objects.get(tmdb_id=10).authors.get().tmdb_id == 99
+
+
+def test_imports_people(tmp_path):
+    path = write_dump(tmp_path / "person_ids.json", [{"adult": False, "id": 5, "name": "Agnes Varda", "popularity": 2.0}])
+
+    run(path)
+
+    author = Author.objects.select_related("user").get(tmdb_id=5)
+    assert (author.user.first_name, author.user.last_name, author.popularity) == ("Agnes", "Varda", 2.0)
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    path = write_dump(tmp_path / "movies.json", [{"id": i, "original_title": "x"} for i in range(1, 4)])
+
+    output = run(path, "--dry-run")
+
+    assert Film.objects.count() == 0
+    assert "3 movie records" in output
+
+
+def test_resume_skips_committed_records(tmp_path, monkeypatch):
+    from cinema.services.importer import FilmImporter
+
+    path = write_dump(tmp_path / "movies.json", [{"id": i, "original_title": f"Film {i}"} for i in range(1, 10)])
+    import_batch = FilmImporter.import_batch
+    calls = []
+
+    def flaky_import_batch(self, batch):
+        calls.append(batch)
+        if len(calls) == 3:
+            raise RuntimeError("database went away")
+        return import_batch(self, batch)
+
+    monkeypatch.setattr(FilmImporter, "import_batch", flaky_import_batch)
+    with pytest.raises(RuntimeError):
+        run(path, "--batch-size", "3")
+    assert Film.objects.count() == 6
+
+    calls.clear()
+    run(path, "--batch-size", "3", "--resume")
+
+    assert Film.objects.count() == 9
+    assert [record["id"] for record, _ in calls[0]] == [7, 8, 9]
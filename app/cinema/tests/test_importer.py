@@ -0,0 +1,92 @@
+import datetime as dt
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from cinema.models import Author, Film, FilmRanking, Roles, User
+from cinema.services.leaderboard import refresh_film_ranking
+from cinema.services.importer import FilmImporter
+
+pytestmark = pytest.mark.django_db
+
+
+def film_payload(tmdb_id, **extra):
+    return {
+        "id": tmdb_id,
+        "title": f"Film {tmdb_id}",
+        "overview": "desc",
+        "release_date": "2020-05-01",
+        "budget": 10,
+        "revenue": 20,
+        **extra,
+    }
+
+
+def person_payload(tmdb_id, **extra):
+    return {"id": tmdb_id, "name": "Guillermo del Toro", "popularity": 3.5, "gender": 2, "deathday": "", **extra}
+
+
+def test_import_creates_films_authors_and_links():
+    items = [(film_payload(i), person_payload(1000 + i % 3)) for i in range(10)]
+
+    stats = FilmImporter(batch_size=4).import_films(items)
+
+    assert (stats.films_created, stats.films_updated, stats.batches) == (10, 0, 3)
+    assert Film.objects.count() == 10
+    assert Author.objects.count() == 3
+    author = Author.objects.select_related("user").get(tmdb_id=1000)
+    assert author.user.first_name == "Guillermo"
+    assert author.user.last_name == "del Toro"
+    assert author.user.role == Roles.Author
+    assert author.death_date is None
+    assert Film.objects.get(tmdb_id=3).authors.get() == author
+    assert Film.objects.get(tmdb_id=3).release_date == dt.date(2020, 5, 1)
+
+
+def test_reimport_updates_in_place():
+    FilmImporter().import_films([(film_payload(1), person_payload(7))])
+    User.objects.filter(username="author_7").update(first_name="Edited")
+
+    stats = FilmImporter().import_films([(film_payload(1, title="New title"), person_payload(7, popularity=9.0))])
+
+    assert (stats.films_created, stats.films_updated, stats.authors_updated) == (0, 1, 1)
+    film = Film.objects.get(tmdb_id=1)
+    assert film.title == "New title"
+    assert film.authors.get().popularity == 9.0
+    assert User.objects.get(username="author_7").first_name == "Edited"
+
+
+def test_rejected_rows_are_skipped_and_the_rest_of_the_batch_is_imported():
+    items = [(film_payload(i), person_payload(7)) for i in range(8)]
+    items[5] = (film_payload(5, release_date="not a date"), person_payload(7))
+    items[2] = (film_payload(2, title="x" * 500), person_payload(9, known_for_department="z" * 500))
+    rejected = []
+
+    stats = FilmImporter(batch_size=8).import_films(items, on_failure=lambda item, error: rejected.append(item[0]["id"]))
+
+    assert rejected == [5]
+    assert (stats.films_created, stats.rejected) == (7, 1)
+    assert sorted(Film.objects.values_list("tmdb_id", flat=True)) == [0, 1, 2, 3, 4, 6, 7]
+    assert len(Film.objects.get(tmdb_id=2).title) == 200
+    assert len(Author.objects.get(tmdb_id=9).department) == 200
+
+
+def test_reimport_updates_the_leaderboard_row():
+    film = Film.objects.create(tmdb_id=1, title="Film 1", release_date=dt.date(2020, 5, 1), rating_count=2, rating_sum=8)
+    refresh_film_ranking(film.pk)
+
+    FilmImporter().import_films([(film_payload(1, release_date="1999-03-01"), None)])
+
+    assert FilmRanking.objects.get(film=film).release_year == 1999
+
+
+def test_query_count_grows_with_batches_not_rows():
+    def count_queries(ids):
+        items = [(film_payload(i), person_payload(i)) for i in ids]
+        with CaptureQueriesContext(connection) as ctx:
+            FilmImporter(batch_size=25).import_films(items)
+        return len(ctx)
+
+    one_batch = count_queries(range(25))
+    assert count_queries(range(1000, 1250)) == 10 * one_batch
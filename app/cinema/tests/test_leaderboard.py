@@ -0,0 +1,78 @@
+import datetime as dt
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Film, FilmRanking, FilmRating, FilmStatus, Roles, Spectator, User
+from cinema.services.leaderboard import rebuild_rankings, weighted_rating
+from cinema.services.ratings import rate_film
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.LEADERBOARD_MIN_VOTES = 2
+    cache.clear()
+
+
+@pytest.fixture
+def spectators():
+    spectators = []
+    for i in range(4):
+        user = User.objects.create_user(email=f"s{i}@example.com", username=f"s{i}", password="x", role=Roles.SPECTATOR)
+        spectators.append(Spectator.objects.create(user=user))
+    return spectators
+
+
+def test_weighted_rating_pulls_small_samples_to_the_mean():
+    assert weighted_rating(5.0, 1, 3.0, 2) == pytest.approx(11 / 3)
+    assert weighted_rating(5.0, 1000, 3.0, 2) > weighted_rating(5.0, 1, 3.0, 2)
+
+
+def test_leaderboard_is_updated_when_ratings_change(spectators):
+    popular = Film.objects.create(title="Popular", release_date=dt.date(2001, 1, 1))
+    lucky = Film.objects.create(title="Lucky", release_date=dt.date(2002, 1, 1), statut=FilmStatus.ARCHIVED)
+    bad = Film.objects.create(title="Bad")
+    rate_film(spectators[0], bad, 1)
+    for spectator in spectators:
+        rate_film(spectator, popular, 5)
+    rate_film(spectators[0], lucky, 5)
+
+    response = APIClient().get(reverse("cinema:top-movies"))
+
+    # One perfect note is not enough to beat four of them.
+    assert [row["film"]["title"] for row in response.data] == ["Popular", "Lucky", "Bad"]
+
+    FilmRating.objects.filter(film=popular).delete()
+    assert not FilmRanking.objects.filter(film=popular).exists()
+
+
+def test_filters_by_year_and_status(spectators):
+    first = Film.objects.create(title="2001", release_date=dt.date(2001, 1, 1))
+    second = Film.objects.create(title="2002", release_date=dt.date(2002, 1, 1))
+    rate_film(spectators[0], first, 3)
+    rate_film(spectators[0], second, 3)
+    second.statut = FilmStatus.ARCHIVED
+    second.save()
+
+    client = APIClient()
+    by_year = client.get(reverse("cinema:top-movies"), {"year": 2001}).data
+    by_status = client.get(reverse("cinema:top-movies"), {"statut": "ARCHIVED"}).data
+
+    assert [row["film"]["title"] for row in by_year] == ["2001"]
+    assert [row["film"]["title"] for row in by_status] == ["2002"]
+    assert client.get(reverse("cinema:top-movies"), {"statut": "NOPE"}).status_code == 400
+
+
+def test_rebuild_matches_incremental_updates(spectators):
+    film = Film.objects.create(title="Film")
+    for note, spectator in zip([1, 5, 4], spectators):
+        rate_film(spectator, film, note)
+    cache.clear()
+
+    assert rebuild_rankings() == 1
+    ranking = FilmRanking.objects.get()
+    assert ranking.score == pytest.approx(weighted_rating(10 / 3, 3, 10 / 3, 2))
@@ -0,0 +1,81 @@
+import datetime as dt
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from cinema.models import Author, Film, Roles, User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def films():
+    films = [Film.objects.create(title=f"Film {i}") for i in range(7)]
+    # Ties on created_at must be broken by id.
+    same_time = timezone.now() - dt.timedelta(days=1)
+    Film.objects.filter(pk__in=[films[2].pk, films[3].pk, films[4].pk]).update(created_at=same_time)
+    return films
+
+
+def walk(client, url):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append(response.data)
+        url = response.data["next"]
+    return pages
+
+
+def test_film_list_is_keyset_paginated(client, films):
+    pages = walk(client, reverse("cinema:list-movies") + "?page_size=3")
+
+    titles = [film["title"] for page in pages for film in page["results"]]
+    assert len(pages) == 3
+    assert pages[0]["previous"] is None
+    assert sorted(titles) == sorted(film.title for film in films)
+    assert len(set(titles)) == 7
+
+
+def test_previous_link_goes_back(client, films):
+    first = client.get(reverse("cinema:list-movies") + "?page_size=3").data
+    second = client.get(first["next"]).data
+    back = client.get(second["previous"]).data
+
+    assert back["results"] == first["results"]
+    assert back["previous"] is None
+
+
+def test_page_size_is_capped(client, films, monkeypatch):
+    from cinema.pagination import FilmPagination
+
+    monkeypatch.setattr(FilmPagination, "max_page_size", 2)
+    response = client.get(reverse("cinema:list-movies") + "?page_size=1000")
+
+    assert len(response.data["results"]) == 2
+
+
+def test_invalid_cursor(client, films):
+    response = client.get(reverse("cinema:list-movies") + "?cursor=garbage")
+
+    assert response.status_code == 404
+
+
+def test_authors_are_ordered_by_popularity(client):
+    for i, popularity in enumerate([1.0, 5.0, 5.0, 3.0]):
+        user = User.objects.create_user(
+            email=f"a{i}@example.com", username=f"a{i}", password="x", role=Roles.Author
+        )
+        Author.objects.create(user=user, popularity=popularity, tmdb_id=i)
+
+    pages = walk(client, reverse("cinema:list-authors") + "?page_size=2")
+
+    popularity = [author["popularity"] for page in pages for author in page["results"]]
+    assert popularity == [5.0, 5.0, 3.0, 1.0]
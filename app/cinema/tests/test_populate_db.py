@@ -0,0 +1,89 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from cinema.management.commands import populate_db
+from cinema.models import Film
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeTmdbAPI:
+    fail_on = set()
+    malformed = set()
+
+    def __init__(self, api_key, cache=None):
+        pass
+
+    def get_popular_films(self, page=1):
+        return {"results": [{"id": page * 100 + i} for i in range(20)]}
+
+    def get_film_details(self, film_id):
+        if int(film_id) in self.fail_on:
+            raise RuntimeError("TMDB is down")
+        release_date = "2001-02-30" if int(film_id) in self.malformed else "2001-01-01"
+        return {"id": int(film_id), "title": f"Film {film_id}", "overview": "", "release_date": release_date}
+
+    def get_movie_credits(self, film_id):
+        return {"crew": [{"job": "Director", "id": 7}]}
+
+    def get_people_detail(self, person_id):
+        return {"id": int(person_id), "name": "Jane Doe", "popularity": 1.0}
+
+
+@pytest.fixture(autouse=True)
+def fake_tmdb(settings, tmp_path, monkeypatch):
+    settings.TMDB_API_KEY = "key"
+    settings.IMPORT_JOURNAL_DIR = tmp_path / "journal"
+    FakeTmdbAPI.fail_on = set()
+    FakeTmdbAPI.malformed = set()
+    monkeypatch.setattr(populate_db, "TmdbAPI", FakeTmdbAPI)
+
+
+def run(*args):
+    out, err = StringIO(), StringIO()
+    call_command("populate_db", "--no-cache", *args, stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+def test_imports_several_pages_in_parallel():
+    run("--pages", "3", "--workers", "4", "--batch-size", "7")
+
+    assert Film.objects.count() == 60
+    assert Film.objects.filter(authors__tmdb_id=7).count() == 60
+
+
+def test_failed_films_are_journaled_and_resume_continues(monkeypatch):
+    def broken_checkpoint(self, position, committed=0):
+        original(self, position, committed)
+        if position >= [2, 0]:
+            raise RuntimeError("killed")
+
+    FakeTmdbAPI.fail_on = {103}
+    original = populate_db.ImportJournal.checkpoint
+    monkeypatch.setattr(populate_db.ImportJournal, "checkpoint", broken_checkpoint)
+    _, err = run("--pages", "3", "--batch-size", "10")
+    assert "--resume" in err
+    committed = Film.objects.count()
+    assert 0 < committed < 59
+
+    monkeypatch.setattr(populate_db.ImportJournal, "checkpoint", original)
+    run("--resume", "--batch-size", "10")
+
+    assert Film.objects.count() == 59
+    journal = populate_db.ImportJournal.for_command("populate_db").load()
+    assert journal["finished"]
+    assert [failure["item"] for failure in journal["failures"]] == [103]
+
+
+def test_rejected_films_do_not_stop_the_import():
+    FakeTmdbAPI.malformed = {105}
+
+    _, err = run("--pages", "2", "--batch-size", "10")
+
+    assert Film.objects.count() == 39
+    assert "Rejected movie ID 105" in err
+    journal = populate_db.ImportJournal.for_command("populate_db").load()
+    assert journal["finished"]
+    assert [failure["item"] for failure in journal["failures"]] == [105]
@@ -0,0 +1,124 @@
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Author, AuthorRating, Film, FilmRating, Roles, Spectator, User
+from cinema.services.ratings import drifted_films
+
+pytestmark = pytest.mark.django_db
+
+
+def make_spectator(name):
+    user = User.objects.create_user(email=f"{name}@example.com", username=name, password="x", role=Roles.SPECTATOR)
+    return Spectator.objects.create(user=user)
+
+
+@pytest.fixture
+def film():
+    return Film.objects.create(title="My Film")
+
+
+def rate(spectator, film, note):
+    client = APIClient()
+    client.force_authenticate(spectator.user)
+    return client.post(reverse("cinema:rate-film", args=[film.pk]), {"note": note}, format="json")
+
+
+def test_rating_updates_stored_aggregates(film):
+    alice, bob = make_spectator("alice"), make_spectator("bob")
+
+    assert rate(alice, film, 4).status_code == 200
+    rate(bob, film, 5)
+    rate(alice, film, 2)
+
+    film.refresh_from_db()
+    assert (film.rating_count, film.rating_sum, film.rating_avg) == (2, 7, 3.5)
+
+
+def test_deleting_a_rating_updates_aggregates(film):
+    rate(make_spectator("alice"), film, 4)
+
+    FilmRating.objects.get().delete()
+
+    film.refresh_from_db()
+    assert (film.rating_count, film.rating_sum, film.rating_avg) == (0, 0, None)
+
+
+def test_ratings_saved_through_the_orm_update_aggregates(film):
+    rating = FilmRating.objects.create(spectator=make_spectator("alice"), film=film, note=3)
+    rating.note = 5
+    rating.save()
+    film.refresh_from_db()
+    assert (film.rating_count, film.rating_sum, film.rating_avg) == (1, 5, 5.0)
+
+    rating.delete()
+    film.refresh_from_db()
+    assert (film.rating_count, film.rating_sum, film.rating_avg) == (0, 0, None)
+
+
+def test_reconcile_command_rebuilds_drifted_films(film):
+    # bulk inserts skip the signals, as raw SQL would
+    FilmRating.objects.bulk_create([FilmRating(spectator=make_spectator("alice"), film=film, note=3)])
+    assert drifted_films().count() == 1
+
+    call_command("reconcile_ratings", stdout=StringIO())
+
+    film.refresh_from_db()
+    assert (film.rating_count, film.rating_sum, film.rating_avg) == (1, 3, 3.0)
+    assert drifted_films().count() == 0
+
+
+def test_film_serializer_exposes_stored_rating(film):
+    rate(make_spectator("alice"), film, 4)
+
+    response = APIClient().get(reverse("cinema:list-movies"))
+
+    assert response.data["results"][0]["rating_avg"] == 4.0
+    assert response.data["results"][0]["rating_count"] == 1
+
+
+def test_a_spectator_rates_a_film_once(film):
+    alice = make_spectator("alice")
+    FilmRating.objects.create(spectator=alice, film=film, note=3)
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        FilmRating.objects.create(spectator=alice, film=film, note=4)
+
+
+def test_rating_again_updates_in_place(film):
+    alice = make_spectator("alice")
+    created = rate(alice, film, 4).json()["rating"]
+    assert created == {"id": FilmRating.objects.get().pk, "spectator": alice.pk, "film": film.pk, "note": 4}
+
+    with CaptureQueriesContext(connection) as captured:
+        response = rate(alice, film, 2)
+
+    assert response.status_code == 200
+    assert response.json()["rating"] == {**created, "note": 2}
+    ratings = [q["sql"] for q in captured if '"cinema_filmrating"' in q["sql"]]
+    assert len(ratings) == 2  # the locked read of the previous note, then one UPDATE
+    assert re.match(r'UPDATE "cinema_filmrating"', ratings[1])
+    assert FilmRating.objects.get().note == 2
+    film.refresh_from_db()
+    assert (film.rating_count, film.rating_sum) == (1, 2)
+
+
+def test_rate_author_upserts():
+    alice = make_spectator("alice")
+    user = User.objects.create_user(email="a@example.com", username="a", password="x", role=Roles.Author)
+    author = Author.objects.create(user=user)
+    client = APIClient()
+    client.force_authenticate(alice.user)
+
+    for note in (3, 5):
+        response = client.post(reverse("cinema:rate-author", args=[author.pk]), {"note": note}, format="json")
+        assert response.status_code == 200
+        assert response.json()["rating"]["note"] == note
+
+    assert AuthorRating.objects.get().note == 5
@@ -0,0 +1,99 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Film, FilmRanking, FilmRating, FilmRecommendation, RecommenderRun, Roles, Spectator, User
+
+pytestmark = pytest.mark.django_db
+
+
+def make_spectator(name):
+    return Spectator.objects.create(user=User.objects.create_user(
+        email=f"{name}@example.com", username=name, password="x", role=Roles.SPECTATOR,
+    ))
+
+
+def recommendations(spectator, **params):
+    client = APIClient()
+    client.force_authenticate(spectator.user)
+    return client.get(reverse("cinema:my-recommendations"), params)
+
+
+def test_precomputed_recommendations_are_one_indexed_read(django_assert_num_queries):
+    spectator = make_spectator("s")
+    heat, ronin = Film.objects.create(title="Heat"), Film.objects.create(title="Ronin")
+    FilmRecommendation.objects.bulk_create([
+        FilmRecommendation(spectator=spectator, film=ronin, rank=2, score=0.4),
+        FilmRecommendation(spectator=spectator, film=heat, rank=1, score=0.8),
+    ])
+
+    with django_assert_num_queries(1):
+        response = recommendations(spectator)
+
+    assert response.data["source"] == "personal"
+    assert [(row["film"]["title"], row["score"]) for row in response.data["results"]] == [("Heat", 0.8), ("Ronin", 0.4)]
+    assert len(recommendations(spectator, limit=1).data["results"]) == 1
+
+    # rated after the training run
+    FilmRating.objects.create(spectator=spectator, film=heat, note=4)
+    assert [row["film"]["title"] for row in recommendations(spectator).data["results"]] == ["Ronin"]
+
+
+def test_cold_start_falls_back_to_unrated_popular_films():
+    spectator = make_spectator("s")
+    heat, ronin, alien = (Film.objects.create(title=title) for title in ("Heat", "Ronin", "Alien"))
+    FilmRanking.objects.bulk_create(
+        FilmRanking(film=film, score=score, rating_count=1, rating_avg=score, statut=film.statut)
+        for film, score in ((heat, 4.5), (ronin, 4.0), (alien, 3.0))
+    )
+    FilmRating.objects.create(spectator=spectator, film=heat, note=5)
+
+    response = recommendations(spectator)
+
+    assert response.data["source"] == "popular"
+    assert [row["film"]["title"] for row in response.data["results"]] == ["Ronin", "Alien"]
+
+
+def test_recommendations_are_for_spectators_only():
+    author = User.objects.create_user(email="a@example.com", username="a", password="x", role=Roles.Author)
+    client = APIClient()
+    client.force_authenticate(author)
+
+    assert client.get(reverse("cinema:my-recommendations")).status_code == 403
+    assert APIClient().get(reverse("cinema:my-recommendations")).status_code == 401
+
+
+def test_als_recommends_what_alike_spectators_liked():
+    pytest.importorskip("scipy")
+    from cinema.services.recommendations import train_recommendations
+
+    action = [Film.objects.create(title=f"Action {i}") for i in range(4)]
+    drama = [Film.objects.create(title=f"Drama {i}") for i in range(4)]
+    fans = {"action": [make_spectator(f"a{i}") for i in range(6)], "drama": [make_spectator(f"d{i}") for i in range(6)]}
+    for group, films in (("action", action), ("drama", drama)):
+        for i, spectator in enumerate(fans[group]):
+            # every fan leaves one film of the genre out, the last one has only rated one film
+            seen = films[:1] if i == 5 else [film for j, film in enumerate(films) if j != i % 4]
+            FilmRating.objects.bulk_create(FilmRating(spectator=spectator, film=film, note=5) for film in seen)
+    fans["drama"][0].favorite_films.add(drama[1])
+
+    run = train_recommendations(top_n=3, factors=2, iterations=10)
+
+    newcomer = fans["action"][5]
+    picks = set(newcomer.recommendations.values_list("film__title", flat=True))
+    assert picks == {"Action 1", "Action 2", "Action 3"}
+    first = FilmRecommendation.objects.get(spectator=fans["action"][0], rank=1)
+    assert first.film == action[0]
+    rated = FilmRating.objects.filter(spectator=fans["drama"][2]).values_list("film", flat=True)
+    assert not fans["drama"][2].recommendations.filter(film__in=rated).exists()
+    assert not fans["drama"][0].recommendations.filter(film=drama[1]).exists()
+    assert (run.kind, run.films, run.ratings) == ("implicit_als", 8, 33)
+
+
+def test_command_reports_time_and_memory(capsys):
+    pytest.importorskip("scipy")
+    call_command("train_recommendations")
+
+    assert "peak memory" in capsys.readouterr().out
+    assert RecommenderRun.objects.get().kind == "implicit_als"
@@ -0,0 +1,84 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Author, Film, Roles, User
+from cinema.services.importer import FilmImporter
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def director():
+    user = User.objects.create_user(
+        email="gdt@example.com", username="gdt", first_name="Guillermo", last_name="Toro", password="x", role=Roles.Author
+    )
+    return Author.objects.create(user=user, tmdb_id=1)
+
+
+def search(q, **params):
+    response = APIClient().get(reverse("cinema:search-movies"), {"q": q, **params})
+    assert response.status_code == 200, response.data
+    return [film["title"] for film in response.data["results"]]
+
+
+def test_title_matches_rank_above_description_matches():
+    Film.objects.create(title="Ocean story", description="Nothing about it")
+    Film.objects.create(title="Something else", description="A story near the ocean")
+    Film.objects.create(title="Unrelated", description="Mountains")
+
+    assert search("ocean") == ["Ocean story", "Something else"]
+
+
+def test_index_follows_edits_and_author_changes(director):
+    film = Film.objects.create(title="Pan's Labyrinth")
+    assert search("guillermo") == []
+
+    film.authors.add(director)
+    assert search("guillermo") == ["Pan's Labyrinth"]
+
+    director.user.first_name = "Memo"
+    director.user.save()
+    assert search("guillermo") == []
+    assert search("memo") == ["Pan's Labyrinth"]
+
+    film.title = "Cronos"
+    film.save()
+    assert search("cronos") == ["Cronos"]
+
+    film.delete()
+    assert search("cronos") == []
+
+
+def test_prefix_of_last_word_and_pagination():
+    for i in range(5):
+        Film.objects.create(title=f"Star voyage {i}")
+
+    response = APIClient().get(reverse("cinema:search-movies"), {"q": "star voy", "page_size": 2})
+
+    assert response.data["count"] == 5
+    assert len(response.data["results"]) == 2
+    assert response.data["next"] is not None
+    assert response.data["results"][0]["rank"] > 0
+
+
+def test_bulk_imports_are_indexed():
+    FilmImporter().import_films([({"id": 9, "title": "Imported title"}, {"id": 3, "name": "Agnes Varda"})])
+
+    assert search("varda") == ["Imported title"]
+
+
+def test_query_is_required():
+    assert APIClient().get(reverse("cinema:search-movies")).status_code == 400
+
+
+def test_admin_search_uses_the_index(client):
+    admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="pass")
+    client.force_login(admin)
+    Film.objects.create(title="Solaris")
+    Film.objects.create(title="Stalker")
+
+    response = client.get(reverse("admin:cinema_film_changelist"), {"q": "solaris"})
+
+    assert response.status_code == 200
+    assert [film.title for film in response.context["cl"].result_list] == ["Solaris"]
@@ -0,0 +1,125 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Film, FilmRating, RecommenderRun, Roles, SimilarFilm, Spectator, User
+from cinema.services.ratings import rate_film
+
+pytestmark = pytest.mark.django_db
+
+
+def make_spectators(count):
+    return [
+        Spectator.objects.create(user=User.objects.create_user(
+            email=f"s{i}@example.com", username=f"s{i}", password="x", role=Roles.SPECTATOR,
+        ))
+        for i in range(count)
+    ]
+
+
+def test_similar_films_are_one_indexed_lookup(django_assert_num_queries):
+    heat, ronin, alien, up = (Film.objects.create(title=title) for title in ("Heat", "Ronin", "Alien", "Up"))
+    SimilarFilm.objects.bulk_create([
+        SimilarFilm(film=heat, similar=alien, rank=2, score=0.5),
+        SimilarFilm(film=heat, similar=ronin, rank=1, score=0.9),
+        SimilarFilm(film=up, similar=heat, rank=1, score=0.1),
+    ])
+
+    with django_assert_num_queries(1):
+        response = APIClient().get(reverse("cinema:similar-movies", args=[heat.pk]))
+
+    assert [(row["film"]["title"], row["score"]) for row in response.data] == [("Ronin", 0.9), ("Alien", 0.5)]
+    assert APIClient().get(reverse("cinema:similar-movies", args=[ronin.pk])).data == []
+    assert APIClient().get(reverse("cinema:similar-movies", args=[999])).status_code == 404
+
+
+def test_item_cosine_neighbours():
+    pytest.importorskip("scipy")
+    from cinema.services.similarity import compute_similar_films
+
+    heat, ronin, alien, up = (Film.objects.create(title=title) for title in ("Heat", "Ronin", "Alien", "Up"))
+    a, b, c = make_spectators(3)
+    notes = {
+        a: {heat: 5, ronin: 5, up: 1},
+        b: {heat: 4, ronin: 3},
+        c: {alien: 5, up: 4},
+    }
+    FilmRating.objects.bulk_create(
+        FilmRating(spectator=spectator, film=film, note=note)
+        for spectator, films in notes.items() for film, note in films.items()
+    )
+    SimilarFilm.objects.create(film=alien, similar=heat, rank=1, score=1)
+
+    run = compute_similar_films(top_k=2, chunk_size=3)
+
+    neighbours = {
+        film.title: [(row.similar.title, round(row.score, 3)) for row in film.similar_films.order_by("rank")]
+        for film in (heat, ronin, alien, up)
+    }
+    assert neighbours == {
+        "Heat": [("Ronin", 0.991), ("Up", 0.189)],
+        "Ronin": [("Heat", 0.991), ("Up", 0.208)],
+        "Alien": [("Up", 0.97)],
+        "Up": [("Alien", 0.97), ("Ronin", 0.208)],
+    }
+    assert (run.kind, run.films, run.ratings, run.rows) == ("item_cosine", 4, 7, 7)
+    assert run.duration >= 0 and run.peak_memory > 0
+
+
+def test_command_reports_time_and_memory(capsys):
+    pytest.importorskip("scipy")
+    call_command("compute_similar_films")
+
+    assert "peak memory" in capsys.readouterr().out
+    assert RecommenderRun.objects.count() == 1
+
+
+def test_similar_films_by_content():
+    heat, alien = Film.objects.create(title="Heat"), Film.objects.create(title="Alien")
+    SimilarFilm.objects.bulk_create([
+        SimilarFilm(film=heat, similar=alien, kind="ratings", rank=1, score=0.2),
+        SimilarFilm(film=alien, similar=heat, kind="content", rank=1, score=0.7),
+    ])
+    url = reverse("cinema:similar-movies", args=[alien.pk])
+
+    assert APIClient().get(url).data == []
+    assert [row["film"]["title"] for row in APIClient().get(url, {"by": "content"}).data] == ["Heat"]
+    assert APIClient().get(url, {"by": "genre"}).status_code == 400
+
+
+def test_content_neighbours_are_recomputed_for_changed_films_only():
+    pytest.importorskip("scipy")
+    from cinema.services.content_similarity import compute_content_similarities
+
+    films = {
+        title: Film.objects.create(title=title, description=description)
+        for title, description in (
+            ("Alien", "The crew of a space freighter is hunted by a creature."),
+            ("Aliens", "Space marines face the creature again on a colony."),
+            ("Heat", "A master thief and the detective chasing him in Los Angeles."),
+            ("Ronin", "Mercenaries hired to steal a case: the thief job goes wrong."),
+            ("Up", "An old man floats his house with balloons."),
+        )
+    }
+
+    def neighbours(title):
+        return [row.similar.title for row in films[title].similar_films.filter(kind="content").order_by("rank")]
+
+    first = compute_content_similarities(top_k=2, max_document_frequency=0.7)
+    assert neighbours("Alien")[0] == "Aliens" and neighbours("Heat") == ["Ronin"] and neighbours("Up") == []
+    assert first.films == 5 and not SimilarFilm.objects.filter(kind="ratings").exists()
+    heat_rows = list(films["Heat"].similar_films.values_list("pk", flat=True))
+
+    # ratings move Film.updated_at but not the content
+    rate_film(make_spectators(1)[0], films["Heat"], 5)
+    assert compute_content_similarities(top_k=2, max_document_frequency=0.7).films == 0
+
+    films["Up"].description = "A creature from space lands in an old house."
+    films["Up"].save()
+    second = compute_content_similarities(top_k=2, max_document_frequency=0.7)
+
+    assert second.films == 1
+    assert set(neighbours("Up")) == {"Alien", "Aliens"}
+    assert list(films["Heat"].similar_films.values_list("pk", flat=True)) == heat_rows
+    assert compute_content_similarities(top_k=2, max_document_frequency=0.7, full=True).films == 5
@@ -0,0 +1,51 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cinema.models import Film, FilmRating, Roles, Spectator, User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def films(spectator):
+    heat, ronin, alien = (Film.objects.create(title=title) for title in ("Heat", "Ronin", "Alien"))
+    spectator.favorite_films.add(heat)
+    FilmRating.objects.create(spectator=spectator, film=ronin, note=4)
+    other = User.objects.create_user(email="o@example.com", username="o", password="x", role=Roles.SPECTATOR)
+    FilmRating.objects.create(spectator=Spectator.objects.create(user=other), film=alien, note=1)
+    return heat, ronin, alien
+
+
+def fields(response):
+    return {film["title"]: (film["is_favorite"], film["my_rating"]) for film in response.data["results"]}
+
+
+def test_spectator_fields_come_with_the_films_query(spectator, films, django_assert_num_queries):
+    client = APIClient()
+    client.force_authenticate(spectator.user)
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse("cinema:list-movies"))
+
+    assert fields(response) == {"Heat": (True, None), "Ronin": (False, 4), "Alien": (False, None)}
+    assert "ETag" not in response and "X-Cache" not in response
+
+
+def test_fast_path_renders_the_same_fields(spectator, films, settings):
+    client = APIClient()
+    client.force_authenticate(spectator.user)
+    expected = client.get(reverse("cinema:list-movies")).data
+
+    settings.FAST_LIST_SERIALIZATION = True
+    assert client.get(reverse("cinema:list-movies")).data == expected
+
+
+def test_personalized_responses_do_not_leak_into_the_shared_cache(spectator, films):
+    client = APIClient()
+    client.force_authenticate(spectator.user)
+    client.get(reverse("cinema:list-movies"))
+
+    anonymous = APIClient().get(reverse("cinema:list-movies"))
+    assert anonymous["X-Cache"] == "MISS"
+    assert "is_favorite" not in anonymous.data["results"][0]
@@ -0,0 +1,95 @@
+import pytest
+
+from cinema.services.tmdb import TmdbAPI
+from cinema.services.tmdb_cache import CacheMiss, TmdbCache, endpoint_of
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None, headers=None):
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeTransport:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None, params=None):
+        self.calls.append((url, headers, params))
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, {"url": url, "params": params}, {"ETag": '"v1"'})
+
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+
+@pytest.fixture
+def make_api(tmp_path, clock):
+    def factory(offline=False, **kwargs):
+        cache = TmdbCache(tmp_path / "cache.sqlite3", clock=lambda: clock[0], offline=offline, **kwargs)
+        return TmdbAPI(api_key="key", transport=FakeTransport(), base_url="http://tmdb", cache=cache)
+    return factory
+
+
+def test_endpoint_of():
+    assert endpoint_of("/movie/popular") == "popular"
+    assert endpoint_of("/movie/12/credits") == "credits"
+    assert endpoint_of("/movie/12") == "movie"
+    assert endpoint_of("/person/3") == "person"
+
+
+def test_fresh_entries_are_served_from_disk(make_api):
+    api = make_api()
+    first = api.get_film_details(film_id="1")
+    assert api.get_film_details(film_id="1") == first
+    assert len(api.transport.calls) == 1
+
+    # A new process re-reads the same store.
+    replay = make_api()
+    assert replay.get_film_details(film_id="1") == first
+    assert replay.transport.calls == []
+    assert replay.cache.stats["hit"] == 1
+
+
+def test_stale_entries_are_revalidated_with_etag(make_api, clock):
+    api = make_api(ttls={"movie": 60})
+    api.get_film_details(film_id="1")
+    clock[0] += 61
+
+    api.get_film_details(film_id="1")
+
+    assert api.transport.calls[-1][1]["If-None-Match"] == '"v1"'
+    assert api.cache.stats["revalidated"] == 1
+
+
+def test_cache_only_mode(make_api, clock):
+    make_api().get_people_detail(person_id="5")
+    clock[0] += 365 * 24 * 3600
+    offline = make_api(offline=True)
+
+    assert offline.get_people_detail(person_id="5")["url"] == "http://tmdb/person/5"
+    with pytest.raises(CacheMiss):
+        offline.get_people_detail(person_id="6")
+    assert offline.transport.calls == []
+
+
+def test_lru_eviction_keeps_store_bounded(make_api, clock):
+    api = make_api(max_bytes=200)
+    for film_id in range(10):
+        clock[0] += 1
+        api.get_film_details(film_id=str(film_id))
+
+    assert api.cache.total_bytes <= 200
+    assert api.cache.stats["evicted"] > 0
+    assert api.cache.get("/movie/9")[0] is not None
+    assert api.cache.get("/movie/0")[0] is None
@@ -0,0 +1,45 @@
+import threading
+
+from cinema.services.tmdb_fetcher import FilmBundleFetcher
+
+
+class FakeTmdbAPI:
+    def __init__(self):
+        self.people_calls = []
+        self.lock = threading.Lock()
+
+    def get_film_details(self, film_id):
+        if film_id == "13":
+            raise ValueError("boom")
+        return {"id": int(film_id), "title": f"Film {film_id}"}
+
+    def get_movie_credits(self, film_id):
+        director_id = 100 if int(film_id) % 2 else 200
+        return {"crew": [{"job": "Writer", "id": 1}, {"job": "Director", "id": director_id}]}
+
+    def get_people_detail(self, person_id):
+        with self.lock:
+            self.people_calls.append(person_id)
+        return {"id": int(person_id), "name": "Jane Doe"}
+
+
+def test_bundles_keep_input_order_and_share_directors():
+    api = FakeTmdbAPI()
+    fetcher = FilmBundleFetcher(api, workers=4, prefetch=1)
+
+    bundles = list(fetcher.iter_bundles(range(1, 21)))
+
+    assert [b.tmdb_id for b in bundles] == list(range(1, 21))
+    assert bundles[0].details["title"] == "Film 1"
+    assert bundles[0].director["id"] == 100
+    assert bundles[1].director["id"] == 200
+    assert sorted(api.people_calls) == ["100", "200"]
+
+
+def test_failed_fetch_is_reported_on_the_bundle():
+    fetcher = FilmBundleFetcher(FakeTmdbAPI(), workers=2)
+
+    bundle = fetcher.fetch_bundle(13)
+
+    assert isinstance(bundle.error, ValueError)
+    assert bundle.director is None
@@ -0,0 +1,100 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from cinema.services.tmdb import TmdbAPI
+from cinema.services.transport import RateLimiter, TmdbTransport, parse_retry_after
+
+
+class StubTmdbHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # path -> list of (status, headers) answered before the 200
+    failures = {}
+    hits = []
+
+    def do_GET(self):
+        self.hits.append((self.path, self.client_address[1]))
+        queue = self.failures.get(self.path.split("?")[0], [])
+        status, headers = queue.pop(0) if queue else (200, {})
+        body = json.dumps({"path": self.path}).encode() if status == 200 else b"{}"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubTmdbHandler.failures = {}
+    StubTmdbHandler.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTmdbHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_api(base_url, sleeps, **kwargs):
+    transport = TmdbTransport(rate_limit=0, sleep=sleeps.append, **kwargs)
+    return TmdbAPI(api_key="key", transport=transport, base_url=base_url)
+
+
+def test_retries_429_respecting_retry_after(stub_server):
+    StubTmdbHandler.failures["/movie/1"] = [(429, {"Retry-After": "2"}), (503, {})]
+    sleeps = []
+
+    data = make_api(stub_server, sleeps).get_film_details(film_id="1")
+
+    assert data == {"path": "/movie/1"}
+    assert len(StubTmdbHandler.hits) == 3
+    assert sleeps[0] >= 2
+
+
+def test_gives_up_after_max_retries(stub_server):
+    StubTmdbHandler.failures["/movie/2"] = [(500, {})] * 5
+    sleeps = []
+
+    with pytest.raises(requests.HTTPError):
+        make_api(stub_server, sleeps, max_retries=2).get_film_details(film_id="2")
+    assert len(StubTmdbHandler.hits) == 3
+
+
+def test_connections_are_kept_alive(stub_server):
+    api = make_api(stub_server, [])
+
+    for film_id in range(5):
+        api.get_film_details(film_id=str(film_id))
+
+    client_ports = {port for _, port in StubTmdbHandler.hits}
+    assert len(client_ports) == 1
+
+
+def test_rate_limiter_waits_for_tokens():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+
+    assert now[0] == pytest.approx(1.0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
@@ -0,0 +1,71 @@
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from cinema.models import Author, Film, FilmStatus, Gender, Roles, User
+from cinema.serializers.author_serializer import AuthorSerializer
+from cinema.serializers.film_serializer import FilmDetailSerializer, FilmSerializer
+from cinema.serializers.values_serializer import ValuesSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog():
+    Film.objects.create(title="Amélie", description="Paris, 1997 ✨", release_date=dt.date(2001, 4, 25), tmdb_id=194, budget=10_000_000)
+    Film.objects.create(title="Untitled", statut=FilmStatus.DRAFT, revenue=None)
+    Film.objects.filter(title="Amélie").update(rating_count=3, rating_sum=13, rating_avg=13 / 3)
+    for i, death_date in enumerate([None, dt.date(1980, 4, 29)]):
+        user = User.objects.create_user(
+            email=f"a{i}@example.com", username=f"a{i}", password="x",
+            first_name="Jean-Pierre", last_name=f"Jeunet {i}", role=Roles.Author,
+        )
+        Author.objects.create(
+            user=user, popularity=1.5 * i, tmdb_id=i or None, website="https://example.com" if i else None,
+            death_date=death_date, gender=Gender.MALE, department="Directing",
+        )
+
+
+@pytest.mark.parametrize("serializer_class, model", [(FilmSerializer, Film), (AuthorSerializer, Author)])
+def test_output_is_byte_identical_to_the_serializer(catalog, serializer_class, model):
+    queryset = model.objects.order_by("pk")
+    expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+    fast = ValuesSerializer(serializer_class)
+    assert JSONRenderer().render(fast.serialize(fast.values(queryset))) == expected
+
+
+@pytest.mark.parametrize("url", ["cinema:list-movies", "cinema:list-authors"])
+def test_list_endpoints_render_the_same_bytes(catalog, settings, url):
+    settings.FAST_LIST_SERIALIZATION = False
+    expected = APIClient().get(reverse(url), {"page_size": 1}, HTTP_ACCEPT="application/json")
+    settings.FAST_LIST_SERIALIZATION = True
+    cache.clear()
+    fast = APIClient().get(reverse(url), {"page_size": 1}, HTTP_ACCEPT="application/json")
+
+    assert fast["X-Cache"] == "MISS"
+    assert fast.content == expected.content
+
+    next_page = APIClient().get(fast.json()["next"])
+    assert len(next_page.json()["results"]) == 1
+    assert next_page.json()["results"] != fast.json()["results"]
+
+
+def test_nested_lists_are_rejected():
+    with pytest.raises(ImproperlyConfigured):
+        ValuesSerializer(FilmDetailSerializer).plan
+
+
+def test_benchmark_command_checks_parity_and_rolls_back():
+    out = StringIO()
+    call_command("benchmark_serializers", rows=50, repeat=1, stdout=out)
+
+    assert "Identical output" in out.getvalue()
+    assert not Film.objects.exists()
@@ -1,7 +1,6 @@
 from django.urls import path
 
-from cinema.views import auth, authors, films, ratings_favorites_spectator
-from rest_framework_simplejwt.views import TokenRefreshView
+from cinema.views import analytics, async_views, auth, authors, autocomplete, cache, export, films, ratings_favorites_spectator
 
 
 app_name = "cinema"
@@ -11,18 +10,37 @@ urlpatterns = [
     path("register/", auth.register, name="register_spectator"),
     path("login/", auth.TokenObtainPairView.as_view(), name="login_spectator"),
     path("logout/", auth.logout, name="logout_spectator"),
-    path("refresh/", TokenRefreshView.as_view(), name="jwt-refresh"),
+    path("refresh/", auth.TokenRefreshView.as_view(), name="jwt-refresh"),
     path("favorites/films/", ratings_favorites_spectator.list_favorite_films, name="my-favorite-films"),
     path("favorites/films/<int:film_id>/add/", ratings_favorites_spectator.add_film_to_favorites, name="add-favorite-film"),
     path("favorites/films/<int:film_id>/remove/", ratings_favorites_spectator.remove_film_from_favorites, name="remove-favorite-film"),
+    path("favorites/bulk/", ratings_favorites_spectator.bulk_update_favorites, name="bulk-favorites"),
+    path("films/rate/", ratings_favorites_spectator.rate_films_batch, name="rate-films-batch"),
     path("films/<int:film_id>/rate/", ratings_favorites_spectator.rate_film, name="rate-film"),
     path("authors/<int:author_id>/rate/", ratings_favorites_spectator.rate_author, name="rate-author"),
+    path("me/recommendations/", ratings_favorites_spectator.my_recommendations, name="my-recommendations"),
     
     #Authors
     path("authors/", authors.AuthorListAPIView.as_view(), name="list-authors"),
     path("authors/<int:pk>/", authors.AuthorRetrieveUpdateDestroyAPIView.as_view(), name="author-detail"),
     #Film
     path("films/",films.FilmAPI.as_view(), name="list-movies"),
+    path("films/top/", films.TopFilmsAPI.as_view(), name="top-movies"),
+    path("films/search/", films.FilmSearchAPI.as_view(), name="search-movies"),
     path('films/<int:year>/', films.FilterFilmByYearAPI.as_view(), name='films-by-year'),
     path("films/<int:pk>/", films.FilmDetailUpdateView.as_view(), name="movie-update-retrieve"),
+    path("films/<int:film_id>/similar/", films.SimilarFilmsAPI.as_view(), name="similar-movies"),
+    #Autocomplete
+    path("autocomplete/", autocomplete.autocomplete_view, name="autocomplete"),
+    #Export
+    path("export/films.<str:fmt>", export.FilmExportAPI.as_view(), name="export-films"),
+    #Async reads (ASGI)
+    path("async/films/", async_views.film_list, name="async-list-movies"),
+    path("async/films/<int:pk>/", async_views.film_detail, name="async-movie-detail"),
+    path("async/authors/", async_views.author_list, name="async-list-authors"),
+    path("async/favorites/films/", async_views.favorite_film_list, name="async-my-favorite-films"),
+    #Analytics
+    path("analytics/box-office/", analytics.BoxOfficeAPI.as_view(), name="box-office"),
+    #Cache
+    path("cache/stats/", cache.cache_stats_view, name="cache-stats"),
 ]
@@ -0,0 +1,41 @@
+from django.db.models import F
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+
+from cinema.models import BoxOfficeRollup, RollupDimension
+from cinema.serializers.box_office_serializer import BoxOfficeRollupSerializer
+
+
+# Budget, revenue and ROI per year, status or director, read from the rollup tables only
+class BoxOfficeAPI(generics.ListAPIView):
+    serializer_class = BoxOfficeRollupSerializer
+    orderings = ("key", "-films", "-budget_sum", "-revenue_sum", "-roi_median")
+    default_orderings = {
+        RollupDimension.YEAR: "key",
+        RollupDimension.STATUS: "key",
+        RollupDimension.DIRECTOR: "-revenue_sum",
+    }
+    default_limit = 100
+    max_limit = 1000
+
+    def get_queryset(self):
+        params = self.request.query_params
+        dimension = params.get("dimension", RollupDimension.YEAR)
+        if dimension not in RollupDimension.values:
+            raise ValidationError({"dimension": f"must be one of {', '.join(RollupDimension.values)}"})
+        ordering = params.get("ordering", self.default_orderings[dimension])
+        if ordering not in self.orderings:
+            raise ValidationError({"ordering": f"must be one of {', '.join(self.orderings)}"})
+        try:
+            limit = min(int(params.get("limit", self.default_limit)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "must be an integer"})
+
+        # films=0: a group flagged by an import that has not been computed yet
+        queryset = BoxOfficeRollup.objects.filter(dimension=dimension, films__gt=0)
+        if "key" in params:
+            queryset = queryset.filter(key=params["key"])
+        # groups without a ROI last in both directions (PostgreSQL puts NULLs first in DESC order)
+        field = F(ordering.lstrip("-"))
+        order = field.desc(nulls_last=True) if ordering.startswith("-") else field.asc(nulls_last=True)
+        return queryset.order_by(order, "key")[:max(limit, 1)]
@@ -0,0 +1,88 @@
+from functools import wraps
+
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotAuthenticated, NotFound, PermissionDenied
+from rest_framework.request import Request
+
+from cinema.authentication import AsyncJWTAuthentication
+from cinema.models import Author, Film
+from cinema.pagination import AuthorPagination, FilmPagination
+from cinema.serializers.author_serializer import AuthorSerializer
+from cinema.serializers.film_serializer import FilmSerializer
+from cinema.serializers.values_serializer import ValuesSerializer
+
+film_values = ValuesSerializer(FilmSerializer)
+author_values = ValuesSerializer(AuthorSerializer)
+authentication = AsyncJWTAuthentication()
+
+
+def async_api_view(view):
+    """
+    Plain Django async view returning the same JSON as its DRF counterpart: GET only,
+    DRF exceptions turned into their usual {"detail": ...} responses.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            if request.method not in ("GET", "HEAD"):
+                raise MethodNotAllowed(request.method)
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            data = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+            return JsonResponse(data, status=exc.status_code)
+    return wrapper
+
+
+def json(data) -> JsonResponse:
+    return JsonResponse(data, safe=False, json_dumps_params={"ensure_ascii": False})
+
+
+async def authenticated_user(request):
+    authenticated = await authentication.aauthenticate(request)
+    if authenticated is None:
+        raise NotAuthenticated()
+    return authenticated[0]
+
+
+async def paginated(request, paginator, queryset, values_serializer):
+    ordering = [field.lstrip("-") for field in paginator.ordering]
+    rows = await paginator.apaginate_queryset(values_serializer.values(queryset, *ordering), Request(request))
+    return json({
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+        "results": values_serializer.serialize(rows),
+    })
+
+
+# GET /async/films/, as GET /films/
+@async_api_view
+async def film_list(request):
+    return await paginated(request, FilmPagination(), Film.objects.all(), film_values)
+
+
+# GET /async/films/<id>/ (admin), as GET /films/<id>/
+@async_api_view
+async def film_detail(request, pk: int):
+    user = await authenticated_user(request)
+    if not user.is_staff:
+        raise PermissionDenied()
+    try:
+        film = await Film.objects.aget(pk=pk)
+    except Film.DoesNotExist:
+        raise NotFound()
+    authors = [author async for author in Author.objects.filter(authors_films=film).select_related("user")]
+    return json({**FilmSerializer(film).data, "authors": AuthorSerializer(authors, many=True).data})
+
+
+# GET /async/authors/, as GET /authors/
+@async_api_view
+async def author_list(request):
+    return await paginated(request, AuthorPagination(), Author.objects.all(), author_values)
+
+
+# GET /async/favorites/films/, as GET /favorites/films/
+@async_api_view
+async def favorite_film_list(request):
+    user = await authenticated_user(request)
+    films = film_values.values(Film.objects.filter(favorite_films=user.pk))
+    return json(film_values.serialize([film async for film in films]))
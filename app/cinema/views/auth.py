@@ -8,7 +8,7 @@ from cinema.models import Roles
 from cinema.permissions import IsSpectator
 
 
-from cinema.serializers.auth_serializer import SpectatorRegistrationSerializer, CustomTokenSerializer
+from cinema.serializers.auth_serializer import SpectatorRegistrationSerializer, CustomTokenSerializer, CustomTokenRefreshSerializer
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
@@ -40,6 +40,14 @@ class TokenObtainPairView(TokenViewBase):
     """
 
     serializer_class = CustomTokenSerializer
+
+
+class TokenRefreshView(TokenViewBase):
+    """
+    Return a new access token, with the user's current role and spectator claims, for a refresh token.
+    """
+
+    serializer_class = CustomTokenRefreshSerializer
     
 
 @api_view(["POST"])
@@ -6,21 +6,37 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 
 
-from cinema.models import Author
+from cinema.caching import CachedResponseMixin, ConditionalGetMixin
+from cinema.models import Author, User
+from cinema.pagination import AuthorPagination
 from cinema.serializers.author_serializer import AuthorSerializer
+from cinema.serializers.values_serializer import ValuesListMixin, ValuesSerializer
 
 
-class AuthorListAPIView(generics.ListAPIView):
+class AuthorListAPIView(ConditionalGetMixin, CachedResponseMixin, ValuesListMixin, generics.ListAPIView):
+    cache_models = (Author, User)
+    values_serializer = ValuesSerializer(AuthorSerializer)
+    last_modified_fields = ("updated_at", "user__updated_at")
     serializer_class = AuthorSerializer
+    pagination_class = AuthorPagination
+
+    def get_validator_queryset(self):
+        # without the films_count annotation, which would turn the aggregate into a grouped subquery
+        return Author.objects.all()
+
     def get_queryset(self):
         return (
             Author.objects.select_related("user")
             .annotate(films_count=Count("authors_films"))
         )
 
-class AuthorRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class AuthorRetrieveUpdateDestroyAPIView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    last_modified_fields = ("updated_at", "user__updated_at")
+
+    def get_validator_queryset(self):
+        return Author.objects.filter(pk=self.kwargs["pk"])
 
     def get_queryset(self):
         return Author.objects.select_related("user").annotate(
@@ -0,0 +1,23 @@
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from cinema.services.autocomplete import AUTHOR, FILM, autocomplete
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+
+# Typeahead on film titles and author names, most popular first
+@api_view(["GET"])
+def autocomplete_view(request):
+    query = request.query_params.get("q", "")
+    try:
+        limit = min(max(int(request.query_params.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        raise ValidationError({"limit": "must be an integer"})
+    suggestions = autocomplete.suggest(query, limit)
+    return Response({
+        "films": [{"id": film.id, "title": film.label} for film in suggestions[FILM]],
+        "authors": [{"id": author.id, "name": author.label} for author in suggestions[AUTHOR]],
+    })
@@ -0,0 +1,29 @@
+from django.http import Http404, StreamingHttpResponse
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from cinema.services.export import CONTENT_TYPES, export_catalog
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    # the export is streamed as is, whatever the client accepts
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+# Whole catalog (films and their authors) as JSON, NDJSON or CSV, streamed
+class FilmExportAPI(APIView):
+    permission_classes = [IsAdminUser]
+    content_negotiation_class = IgnoreClientContentNegotiation
+    chunk_size = 2000
+
+    def get(self, request, fmt):
+        if fmt not in CONTENT_TYPES:
+            raise Http404
+        response = StreamingHttpResponse(export_catalog(fmt, self.chunk_size), content_type=CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'attachment; filename="films.{fmt}"'
+        return response
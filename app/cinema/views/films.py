@@ -1,20 +1,77 @@
 
 
+from django.db.models import Exists, OuterRef, Subquery
 from rest_framework import generics
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
-from cinema.serializers.film_serializer import FilmSerializer, FilmDetailSerializer
-from cinema.models import Film
+from cinema.caching import CachedResponseMixin, ConditionalGetMixin
+from cinema.pagination import FilmPagination, SearchPagination
+from cinema.serializers.film_serializer import (
+    FilmSerializer,
+    FilmDetailSerializer,
+    FilmSearchResultSerializer,
+    SimilarFilmSerializer,
+    SpectatorFilmSerializer,
+    TopFilmSerializer,
+)
+from cinema.serializers.values_serializer import ValuesListMixin, ValuesSerializer
+from cinema.services.search import search_films
+from cinema.models import Author, Film, FilmRanking, FilmRating, FilmStatus, Roles, SimilarFilm, SimilarityKind, Spectator, User
+
+
+class SpectatorFieldsMixin:
+    """
+    For an authenticated spectator (staff excluded), films are annotated with `is_favorite`
+    and `my_rating` (Exists / Subquery on the spectator's favorites and ratings) and rendered
+    with the `spectator_*` serializers, in the same query as the films. Those responses are per user,
+    so they bypass the shared response cache and the ETag validators.
+    """
+
+    spectator_serializer_class = None
+    spectator_values_serializer = None
+
+    def is_personalized(self) -> bool:
+        user = self.request.user
+        return user.is_authenticated and user.role == Roles.SPECTATOR and not user.is_staff
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.is_personalized():
+            return queryset
+        spectator_id = self.request.user.pk
+        favorites = Spectator.favorite_films.through.objects.filter(spectator_id=spectator_id, film_id=OuterRef("pk"))
+        rating = FilmRating.objects.filter(spectator_id=spectator_id, film_id=OuterRef("pk")).values("note")[:1]
+        return queryset.annotate(is_favorite=Exists(favorites), my_rating=Subquery(rating))
+
+    def get_serializer_class(self):
+        if self.is_personalized():
+            return self.spectator_serializer_class
+        return super().get_serializer_class()
+
+    def get_values_serializer(self):
+        if self.is_personalized():
+            return self.spectator_values_serializer
+        return super().get_values_serializer()
+
 
 # List Movies
-class FilmAPI(generics.ListAPIView):
+class FilmAPI(SpectatorFieldsMixin, ConditionalGetMixin, CachedResponseMixin, ValuesListMixin, generics.ListAPIView):
+    cache_models = (Film,)
+    values_serializer = ValuesSerializer(FilmSerializer)
+    spectator_values_serializer = ValuesSerializer(SpectatorFilmSerializer)
     queryset = Film.objects.all()
     serializer_class = FilmSerializer
+    spectator_serializer_class = SpectatorFilmSerializer
+    pagination_class = FilmPagination
+
     
-    
-class FilterFilmByYearAPI(generics.ListAPIView):
+class FilterFilmByYearAPI(ConditionalGetMixin, CachedResponseMixin, ValuesListMixin, generics.ListAPIView):
+    cache_models = (Film,)
+    values_serializer = ValuesSerializer(FilmSerializer)
     permission_classes = [IsAdminUser]
     serializer_class = FilmSerializer
+    pagination_class = FilmPagination
 
     def get_queryset(self):
         year = int(self.kwargs['year'])
@@ -22,10 +79,67 @@ class FilterFilmByYearAPI(generics.ListAPIView):
 
     
 
-class FilmDetailUpdateView(generics.RetrieveUpdateAPIView):
+class FilmDetailUpdateView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveUpdateAPIView):
+    cache_models = (Film, Author, User)
+    last_modified_fields = ("updated_at", "authors__updated_at", "authors__user__updated_at")
     permission_classes = [IsAuthenticated, IsAdminUser]
     queryset = Film.objects.all()
     serializer_class = FilmDetailSerializer
 
     def get_queryset(self):
-        return Film.objects.prefetch_related('authors__user').all()
\ No newline at end of file
+        return Film.objects.prefetch_related('authors__user').all()
+
+
+# Top rated films, read from the precomputed leaderboard
+class TopFilmsAPI(generics.ListAPIView):
+    serializer_class = TopFilmSerializer
+    default_limit = 20
+    max_limit = 100
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = FilmRanking.objects.select_related("film").order_by("-score", "film_id")
+        try:
+            if "year" in params:
+                queryset = queryset.filter(release_year=int(params["year"]))
+            limit = min(int(params.get("limit", self.default_limit)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"detail": "year and limit must be integers"})
+        if "statut" in params:
+            if params["statut"] not in FilmStatus.values:
+                raise ValidationError({"statut": f"must be one of {', '.join(FilmStatus.values)}"})
+            queryset = queryset.filter(statut=params["statut"])
+        return queryset[:max(limit, 1)]
+
+
+# Nearest films by ratings (default) or by content (?by=content), precomputed by the compute_similar_films command
+class SimilarFilmsAPI(generics.ListAPIView):
+    serializer_class = SimilarFilmSerializer
+
+    def get_queryset(self):
+        kind = self.request.query_params.get("by", SimilarityKind.RATINGS)
+        if kind not in SimilarityKind.values:
+            raise ValidationError({"by": f"must be one of {', '.join(SimilarityKind.values)}"})
+        return (
+            SimilarFilm.objects.filter(film_id=self.kwargs["film_id"], kind=kind)
+            .select_related("similar")
+            .order_by("rank")
+        )
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if not response.data and not Film.objects.filter(pk=self.kwargs["film_id"]).exists():
+            raise NotFound()
+        return response
+
+
+# Full-text search on title, description and author names, best matches first
+class FilmSearchAPI(generics.ListAPIView):
+    serializer_class = FilmSearchResultSerializer
+    pagination_class = SearchPagination
+
+    def get_queryset(self):
+        query = self.request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+        return search_films(query)
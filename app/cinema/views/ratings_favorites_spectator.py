@@ -2,16 +2,26 @@ from rest_framework.decorators import (
     api_view,
     permission_classes,
 )
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 
 
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
-from cinema.models import FilmRating, Film, Author, AuthorRating
-from cinema.serializers.rating_serializer import RatingSerializer, FilmRatingSerializer, AuthorRatingSerializer
-from cinema.serializers.film_serializer import FilmSerializer
+from cinema.models import Film, Author, FilmRanking, FilmRating, FilmRecommendation
+from cinema.permissions import IsSpectator
+from cinema.services import favorites, ratings
+from cinema.serializers.favorite_serializer import BulkFavoritesSerializer
+from cinema.serializers.rating_serializer import (
+    RatingSerializer,
+    FilmRatingBatchItemSerializer,
+    FilmRatingSerializer,
+    AuthorRatingSerializer,
+)
+from cinema.serializers.film_serializer import FilmSerializer, RecommendationSerializer
 
 
 # # List favorite movies
@@ -42,6 +52,24 @@ def remove_film_from_favorites(request, film_id):
     spectator.favorite_films.remove(film)
     return Response({"detail": "Film removed from favorites."}, status=status.HTTP_200_OK)
 
+# Add and remove many favorite films and authors at once
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsSpectator])
+def bulk_update_favorites(request):
+    spectator = request.user.spectator
+    serializer = BulkFavoritesSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+    # the existence checks and both halves are applied together or not at all
+    with transaction.atomic():
+        outcomes = {
+            "films": favorites.update_favorites(spectator, "favorite_films", data["add_films"], data["remove_films"]),
+            "authors": favorites.update_favorites(spectator, "favorite_authors", data["add_authors"], data["remove_authors"]),
+        }
+    return Response(outcomes, status=status.HTTP_200_OK)
+
 # # Rate a movie
 
 @api_view(["POST"])
@@ -54,11 +82,7 @@ def rate_film(request, film_id: int):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     note = serializer.validated_data["note"]
-    rating, _ = FilmRating.objects.update_or_create(
-        spectator=spectator,
-        film=film,
-        defaults={"note": note},
-    )
+    rating = ratings.rate_film(spectator, film, note)
     serializer = FilmRatingSerializer(rating)
     return Response(
         {"rating": serializer.data},
@@ -66,6 +90,29 @@ def rate_film(request, film_id: int):
     )
 
 
+# Rate many films at once: [{"film_id": 1, "note": 4}, ...]
+MAX_BATCH_RATINGS = 5000
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsSpectator])
+def rate_films_batch(request):
+    spectator = request.user.spectator
+    serializer = FilmRatingBatchItemSerializer(
+        data=request.data, many=True, allow_empty=False, max_length=MAX_BATCH_RATINGS
+    )
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # the last note given to a film wins
+    notes = {item["film_id"]: item["note"] for item in serializer.validated_data}
+    missing = set(notes) - set(Film.objects.filter(pk__in=notes).values_list("pk", flat=True))
+    if missing:
+        return Response({"film_id": [f"Unknown films: {sorted(missing)}"]}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(ratings.rate_films(spectator, notes), status=status.HTTP_200_OK)
+
+
 ## rATE an author 
 
 @api_view(["POST"])
@@ -79,11 +126,36 @@ def rate_author(request, author_id: int):
 
     note = serializer.validated_data["note"]
 
-    rating, _ = AuthorRating.objects.update_or_create(
-        spectateur=spectator,
-        auteur=author,
-        defaults={"note": note},
-    )
-
+    rating = ratings.rate_author(spectator, author, note)
     serializer = AuthorRatingSerializer(rating)
-    return Response({"rating": serializer.data}, status=status.HTTP_200_OK)
\ No newline at end of file
+    return Response({"rating": serializer.data}, status=status.HTTP_200_OK)
+
+# Films picked for the spectator by the last train_recommendations run,
+# the best ranked films they have not rated yet until they are part of one
+DEFAULT_RECOMMENDATIONS = 20
+MAX_RECOMMENDATIONS = 100
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsSpectator])
+def my_recommendations(request):
+    try:
+        limit = min(max(int(request.query_params.get("limit", DEFAULT_RECOMMENDATIONS)), 1), MAX_RECOMMENDATIONS)
+    except ValueError:
+        raise ValidationError({"limit": "must be an integer"})
+
+    source = "personal"
+    # films rated since the last training run are left out
+    rated = FilmRating.objects.filter(spectator_id=request.user.pk).values("film_id")
+    picks = list(
+        FilmRecommendation.objects.filter(spectator_id=request.user.pk)
+        .exclude(film_id__in=rated)
+        .select_related("film")
+        .order_by("rank")[:limit]
+    )
+    if not picks:
+        source = "popular"
+        picks = list(
+            FilmRanking.objects.exclude(film_id__in=rated).select_related("film").order_by("-score", "film_id")[:limit]
+        )
+    return Response({"source": source, "results": RecommendationSerializer(picks, many=True).data})
@@ -30,6 +30,13 @@ DEBUG = True
 ALLOWED_HOSTS = []
 
 TMDB_API_KEY = os.getenv("TMDB_API_KEY", "")
+TMDB_RATE_LIMIT = float(os.getenv("TMDB_RATE_LIMIT", 40))  # requests per second
+TMDB_TIMEOUT = float(os.getenv("TMDB_TIMEOUT", 10))
+TMDB_MAX_RETRIES = int(os.getenv("TMDB_MAX_RETRIES", 5))
+TMDB_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", 32))
+TMDB_CACHE_PATH = os.getenv("TMDB_CACHE_PATH", BASE_DIR / ".tmdb_cache.sqlite3")
+TMDB_CACHE_MAX_MB = float(os.getenv("TMDB_CACHE_MAX_MB", 512))
+IMPORT_JOURNAL_DIR = os.getenv("IMPORT_JOURNAL_DIR", BASE_DIR / ".import_journal")
 
 # Application definition
 
@@ -82,13 +89,30 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'cinema.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
 AUTH_USER_MODEL = "cinema.User"
 
+# JWT: reads trust the token claims, writes load the user, cached this many seconds (0 = no cache)
+JWT_USER_CACHE_TTL = int(os.getenv("JWT_USER_CACHE_TTL", 30))
+
+# Top films leaderboard: weighted rating = v/(v+m) * R + m/(v+m) * C
+LEADERBOARD_MIN_VOTES = int(os.getenv("LEADERBOARD_MIN_VOTES", 10))  # m
+LEADERBOARD_PRIOR_TTL = 10 * 60  # seconds the global mean C is cached between rebuilds
+
+# Full-text search: PostgreSQL text search configuration (the SQLite FTS5 fallback ignores it)
+SEARCH_CONFIG = os.getenv("SEARCH_CONFIG", "english")
+
+# Render the film and author lists from .values() rows instead of DRF serializers (same output)
+FAST_LIST_SERIALIZATION = os.getenv("FAST_LIST_SERIALIZATION", "0") == "1"
+
+# Autocomplete: in-process prefix index, rebuilt in the background when older than this (seconds)
+AUTOCOMPLETE_MAX_AGE = int(os.getenv("AUTOCOMPLETE_MAX_AGE", 300))
+AUTOCOMPLETE_BUILD_IN_BACKGROUND = True
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
@@ -113,6 +137,23 @@ else:
         }
     }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Local memory by default. Several processes must share one cache for the write-driven invalidation
+# to reach all of them, e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# and CACHE_LOCATION=redis://redis:6379/1
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "cinema"),
+    }
+}
+if CACHES["default"]["BACKEND"].endswith(("LocMemCache", "FileBasedCache")):
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 10000))}
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300))  # seconds
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 